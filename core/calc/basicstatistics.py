@@ -1,7 +1,122 @@
 from .clustering import baseoperationclass
+import numpy as np
 import pandas as pd
 
 DESCRIPTION = ['Count', 'Min', 'Max', 'Mean', 'Std', '25%', '50%', '75%', 'Sum', 'Skew', 'Median']
+QUANTILES = [25, 50, 75]
+
+
+def get_statistics(values):
+    """
+    Calculate basic statistics of numeric features at once (moments are
+    accumulated over centered values, quantiles are taken by one call).
+    Results are the same as the corresponding pandas reductions give.
+
+    :param values: Numeric matrix (objects x features, NaN - missing values).
+    :type values: numpy.ndarray
+    :return: Statistics per feature (rows are in order of DESCRIPTION).
+    :rtype: numpy.ndarray
+    """
+    values = np.asarray(values, dtype=np.float64)
+    num_features = values.shape[1]
+
+    is_missing = np.isnan(values)
+    has_missing = is_missing.any()
+    count = values.shape[0] - is_missing.sum(axis=0)
+
+    output = np.full((len(DESCRIPTION), num_features), np.nan)
+    output[0] = count
+    output[8] = np.where(is_missing, 0., values).sum(axis=0) if has_missing else values.sum(axis=0)
+
+    is_valid = count > 0
+    if not is_valid.any():
+        output[8] = 0.
+        return output
+
+    values = values[:, is_valid]
+    count = count[is_valid]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        output[1, is_valid] = np.nanmin(values, axis=0) if has_missing else values.min(axis=0)
+        output[2, is_valid] = np.nanmax(values, axis=0) if has_missing else values.max(axis=0)
+        mean = output[8, is_valid] / count
+        output[3, is_valid] = mean
+
+        centered = values - mean
+        if has_missing:
+            centered[np.isnan(centered)] = 0.
+        squared = centered * centered
+        m2 = squared.sum(axis=0)
+        m3 = (squared * centered).sum(axis=0)
+
+        output[4, is_valid] = np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan)
+        # adjusted Fisher-Pearson coefficient (as pandas.DataFrame.skew)
+        skew = (count * np.sqrt(count - 1) / (count - 2)) * (m3 / np.power(m2, 1.5))
+        skew[m2 == 0] = 0.
+        skew[count < 3] = np.nan
+        output[9, is_valid] = skew
+
+        quantiles = (np.nanpercentile(values, QUANTILES, axis=0) if has_missing
+                     else np.percentile(values, QUANTILES, axis=0))
+    output[5:8, is_valid] = quantiles
+    output[10] = output[6]
+    return output
+
+
+def get_correlation(dataset):
+    """
+    Calculate Pearson correlation matrix by one product of the centered
+    matrix (BLAS-backed); datasets with missing values are processed by
+    pandas (pairwise complete observations).
+
+    :param dataset: Numeric dataset.
+    :type dataset: pandas.DataFrame
+    :return: Correlation matrix (NaN for features with zero variance).
+    :rtype: pandas.DataFrame
+    """
+    values = np.asarray(dataset.values, dtype=np.float64)
+    if np.isnan(values).any():
+        return dataset.corr()
+
+    centered = values - values.mean(axis=0)
+    comoments = np.dot(centered.T, centered)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        deviations = np.sqrt(np.diag(comoments))
+        output = comoments / np.outer(deviations, deviations)
+    output[:, deviations == 0] = np.nan
+    output[deviations == 0, :] = np.nan
+    np.clip(output, -1., 1., out=output)
+    return pd.DataFrame(output, index=dataset.columns, columns=dataset.columns)
+
+
+def get_top_correlations(correlation, k):
+    """
+    Get the strongest correlated pairs of features (by absolute value).
+
+    :param correlation: Correlation matrix.
+    :type correlation: pandas.DataFrame
+    :param k: Number of pairs.
+    :type k: int
+    :return: Pairs [feature, feature, coefficient] (strongest first).
+    :rtype: list
+    """
+    values = correlation.values
+    rows, columns = np.triu_indices(len(values), k=1)
+    coefficients = values[rows, columns]
+    is_valid = ~np.isnan(coefficients)
+    rows, columns = rows[is_valid], columns[is_valid]
+    coefficients = coefficients[is_valid]
+
+    k = min(k, len(coefficients))
+    if k < len(coefficients):
+        selected = np.argpartition(-np.abs(coefficients), k - 1)[:k]
+    else:
+        selected = np.arange(len(coefficients))
+    selected = selected[np.argsort(-np.abs(coefficients[selected]),
+                                   kind='mergesort')]
+
+    names = correlation.columns.tolist()
+    return [[names[rows[i]], names[columns[i]], float(coefficients[i])]
+            for i in selected]
 
 
 class BasicStatistics(baseoperationclass.BaseOperationClass):
@@ -13,36 +128,32 @@ class BasicStatistics(baseoperationclass.BaseOperationClass):
         self.results = None
 
     def process_data(self, dataset):
-        self.results = [dataset.count(), dataset.min(), dataset.max(), dataset.mean(), dataset.std(),
-                        dataset.quantile(0.25),
-                        dataset.quantile(0.5), dataset.quantile(0.75), dataset.sum(), dataset.skew(),
-                        dataset.median()]
+        # same features as in DataFrame._get_numeric_data (bool included)
+        numeric_dataset = dataset.select_dtypes(include=['number', 'bool'])
+        table = get_statistics(numeric_dataset.values.astype(np.float64))
+        self.results = [pd.Series(table[i], index=numeric_dataset.columns) for i in range(len(DESCRIPTION))]
         return self.results
 
     def save_results(self):
-        results_dict = {}
-        for i in range(len(self.results)):
-            results_dict[i] = self.results[i].to_json()
-        return {'results': results_dict}
+        # all metrics are stored as one table (rows are in order of DESCRIPTION)
+        table = np.array([x.values for x in self.results], dtype=np.float64)
+        return {'results': {'columns': self.results[0].index.tolist(),
+                            'data': [[None if np.isnan(x) else x for x in row] for row in table.tolist()]}}
 
     def load_results(self, results_dict):
         if 'results' in results_dict and results_dict['results'] is not None:
-            try:
-                self.results = [pd.read_json(results_dict['results'][0], typ='series'),
-                                pd.read_json(results_dict['results'][1], typ='series'),
-                                pd.read_json(results_dict['results'][2], typ='series'),
-                                pd.read_json(results_dict['results'][3], typ='series'),
-                                pd.read_json(results_dict['results'][4], typ='series'),
-                                pd.read_json(results_dict['results'][5], typ='series'),
-                                pd.read_json(results_dict['results'][6], typ='series')]
-            except Exception:
-                self.results = [pd.read_json(results_dict['results']['0'], typ='series'),
-                                pd.read_json(results_dict['results']['1'], typ='series'),
-                                pd.read_json(results_dict['results']['2'], typ='series'),
-                                pd.read_json(results_dict['results']['3'], typ='series'),
-                                pd.read_json(results_dict['results']['4'], typ='series'),
-                                pd.read_json(results_dict['results']['5'], typ='series'),
-                                pd.read_json(results_dict['results']['6'], typ='series')]
+            results = results_dict['results']
+            if 'columns' in results:
+                table = np.array(results['data'], dtype=np.float64)
+                self.results = [pd.Series(row, index=results['columns']) for row in table]
+            else:
+                # legacy format (each metric is stored as a separate Series)
+                self.results = []
+                for i in range(len(DESCRIPTION)):
+                    value = results.get(i, results.get(str(i)))
+                    if value is None:
+                        break
+                    self.results.append(pd.read_json(value, typ='series'))
         return True
 
 
@@ -1,10 +1,16 @@
+import glob
+import os.path
 import time
 from datetime import timedelta
 from importlib import import_module
+import numpy as np
 import pprofile
 import pandas as pd
 import re
 
+from ..lod_generator import NUM_GROUPS_DEFAULT, NUMERIC_DTYPES, aggregate_groups
+from ...providers.profiling import QUANTILE_NAMES, DatasetProfiler, get_features_description
+
 
 parameters = {
     "KMeansClustering": (5, []),
@@ -75,3 +81,148 @@ def profile_algorithm(algorithm_name, filename):
             for line in prof_file:
                 line = re.sub(r'^.*\|.*0\.00%\|.*$\n', r'', line)
                 stripped_file.write(line)
+
+
+def _legacy_group_mean(data):
+    # per-group aggregation used by LoDGenerator before the single-pass one
+    columns_dict = {}
+    for i in data.columns:
+        if data[i].dtype.name in NUMERIC_DTYPES:
+            columns_dict[i] = data[i].mean()
+        else:
+            columns_dict[i] = ', '.join(data[i].unique())
+    return pd.Series(dict(columns_dict))
+
+
+def _time_runs(func, n_runs):
+    elapsed_time = []
+    for i in range(0, n_runs):
+        start_time = time.monotonic()
+        result = func()
+        elapsed_time.append((time.monotonic() - start_time) * 1000)
+    return result, sum(elapsed_time) / n_runs
+
+
+def run_groups_aggregation_benchmarks(n_runs, filenames=None, num_groups=NUM_GROUPS_DEFAULT):
+    grouping_key = '_cluster_id'
+    for filename in filenames or sorted(glob.glob("./datasets/job_records_*.csv")):
+        dataset = pd.read_csv(filename, index_col=0)
+        dataset.dropna(axis=1, how='all', inplace=True)
+        dataset.dropna(axis=0, how='any', inplace=True)
+        dataset[grouping_key] = np.random.RandomState(0).randint(0, num_groups, dataset.shape[0])
+
+        legacy_result, legacy_time = _time_runs(
+            lambda: dataset.groupby(grouping_key).apply(_legacy_group_mean).drop(grouping_key, axis=1), n_runs)
+        result, elapsed_time = _time_runs(
+            lambda: aggregate_groups(dataset, grouping_key, exclude=[grouping_key]), n_runs)
+
+        assert np.allclose(legacy_result.select_dtypes(include=NUMERIC_DTYPES).values,
+                           result.select_dtypes(include=NUMERIC_DTYPES).values)
+        print(f"{os.path.basename(filename)} ({dataset.shape[0]} rows, {dataset.shape[1]} columns): "
+              f"groupby.apply - {legacy_time:.2f} ms, single-pass - {elapsed_time:.2f} ms "
+              f"(x{legacy_time / elapsed_time:.1f})")
+
+
+def _get_profiling_errors(dataset, exact, approximate):
+    # max relative error of distinct counts and max rank error of quantiles
+    count_errors, quantile_errors = [0.], [0.]
+    for e, a in zip(exact, approximate):
+        if e.get('unique_number') and a.get('unique_number'):
+            count_errors.append(abs(a['unique_number'] - e['unique_number']) / e['unique_number'])
+        if e['measure_type'] == 'continuous' == a['measure_type']:
+            values = dataset[e['feature_name']].dropna().values
+            quantile_errors.extend(abs((values <= a[q]).mean() - (values <= e[q]).mean())
+                                   for q in QUANTILE_NAMES)
+    return max(count_errors), max(quantile_errors)
+
+
+def run_profiling_benchmarks(n_runs, filenames=None, num_copies=100, chunksize=100000, error=None):
+    for filename in filenames or sorted(glob.glob("./datasets/job_records_*.csv")):
+        dataset = pd.read_csv(filename, index_col=0)
+        dataset = pd.concat([dataset] * num_copies)
+        # make values of continuous features differ across copies
+        numeric_columns = dataset.select_dtypes(include=('float64', 'float32')).columns
+        dataset[numeric_columns] *= np.random.RandomState(0).uniform(.9, 1.1, (dataset.shape[0], 1))
+
+        exact, exact_time = _time_runs(
+            lambda: get_features_description(dataset), n_runs)
+        approximate, approximate_time = _time_runs(
+            lambda: get_features_description(dataset, approximate_min_records=0, error=error), n_runs)
+        # unique values are counted exactly in memory (only quantiles are approximate)
+        _, quantile_error = _get_profiling_errors(dataset, exact, approximate)
+        print(f"{os.path.basename(filename)} ({dataset.shape[0]} rows, {dataset.shape[1]} columns): "
+              f"in-memory: exact - {exact_time:.2f} ms, approximate - {approximate_time:.2f} ms; "
+              f"max error: quantiles - {quantile_error:.4f}")
+
+        def _profile_chunks(approximate_min_records):
+            profiler = DatasetProfiler(approximate_min_records=approximate_min_records, error=error)
+            for start in range(0, dataset.shape[0], chunksize):
+                profiler.update(dataset.iloc[start:start + chunksize])
+            return profiler.get_features_description()
+
+        exact, exact_time = _time_runs(lambda: _profile_chunks(None), n_runs)
+        approximate, approximate_time = _time_runs(lambda: _profile_chunks(0), n_runs)
+        count_error, quantile_error = _get_profiling_errors(dataset, exact, approximate)
+        print(f"{os.path.basename(filename)} by chunks of {chunksize} rows: "
+              f"exact - {exact_time:.2f} ms, approximate - {approximate_time:.2f} ms; "
+              f"max error: distinct count - {count_error:.4f}, quantiles - {quantile_error:.4f}")
+
+
+def run_kprototypes_benchmarks(n_runs, filename="./datasets/job_records_13743294.csv", n_jobs=-1):
+    from ..clustering.KPrototypesClustering import KPrototypesClustering, PLATEAU_RESTARTS
+
+    dataset = pd.read_csv(filename, index_col=0)
+    dataset.dropna(axis=1, how='all', inplace=True)
+    dataset.dropna(axis=0, how='any', inplace=True)
+
+    # all restarts one after another vs parallel restarts with early stop
+    modes = (("sequential", 1, None), ("parallel", n_jobs, PLATEAU_RESTARTS))
+    elapsed_times = {}
+    for mode, mode_n_jobs, plateau_restarts in modes:
+        costs = []
+
+        def process():
+            algorithm_instance = KPrototypesClustering()
+            algorithm_instance.set_parameters(5, n_jobs=mode_n_jobs)
+            algorithm_instance.plateau_restarts = plateau_restarts
+            algorithm_instance.process_data(dataset.copy())
+            costs.append(algorithm_instance.model.cost_)
+
+        _, elapsed_times[mode] = _time_runs(process, n_runs)
+        print(f"{os.path.basename(filename)} ({dataset.shape[0]} rows, {dataset.shape[1]} columns): "
+              f"{mode} - {elapsed_times[mode]:.2f} ms, mean cost {sum(costs) / n_runs:.4f}")
+    print(f"K-Prototypes restarts: x{elapsed_times['sequential'] / elapsed_times['parallel']:.1f}")
+
+
+def run_dissimilarity_benchmarks(n_runs, n_points=100000, n_centers=20, n_features=30):
+    from functools import partial
+    from scipy.spatial.distance import pdist
+    from ..util import dissimilarity_python
+
+    random_state = np.random.RandomState(0)
+    points = random_state.rand(n_points, n_features)
+    points[:, ::3] = random_state.randint(0, 5, (n_points, points[:, ::3].shape[1]))
+    centers = points[random_state.choice(n_points, n_centers, replace=False)]
+    categorical_indices = np.arange(0, n_features, 3, dtype=np.int32)
+    pairwise_points = points[:2000]
+
+    benchmarks = (
+        ("euclidean", n_points * n_centers,
+         lambda: np.stack([dissimilarity_python.euclidean(points, center) for center in centers], axis=1),
+         lambda: dissimilarity_python.euclidean_batch(points, centers)),
+        ("matching", n_points * n_centers,
+         lambda: np.stack([dissimilarity_python.matching(points, center) for center in centers], axis=1),
+         lambda: dissimilarity_python.matching_batch(points, centers)),
+        ("mixed_metric (pairwise)", pairwise_points.shape[0] * (pairwise_points.shape[0] - 1) // 2,
+         lambda: pdist(pairwise_points, metric=partial(dissimilarity_python.mixed_metric,
+                                                       categorical_indices=categorical_indices,
+                                                       categorical_weight=.5)),
+         lambda: dissimilarity_python.mixed_metric_pdist(pairwise_points, categorical_indices, .5)))
+    for name, num_distances, single, batch in benchmarks:
+        # the first calls compile kernels
+        assert np.allclose(single(), batch())
+
+        _, single_time = _time_runs(single, n_runs)
+        _, batch_time = _time_runs(batch, n_runs)
+        print(f"{name}: single - {num_distances / single_time / 1000:.1f} M/s, "
+              f"batch - {num_distances / batch_time / 1000:.1f} M/s (x{single_time / batch_time:.1f})")
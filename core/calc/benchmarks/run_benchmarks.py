@@ -5,3 +5,7 @@ filename = "./datasets/job_records_13332803.csv"
 benchmark.run_benchmarks(n_runs=5, filename=filename)
 # benchmark.dendrogram(filename)
 # benchmark.profile_algorithm("KPrototypesClustering", filename=filename)
+# benchmark.run_groups_aggregation_benchmarks(n_runs=5)
+# benchmark.run_profiling_benchmarks(n_runs=3)
+# benchmark.run_kprototypes_benchmarks(n_runs=3)
+# benchmark.run_dissimilarity_benchmarks(n_runs=5)
@@ -14,6 +14,7 @@ class DBScanClustering(baseoperationclass.BaseOperationClass):
     _operation_name = 'DBSCAN Clustering'
     _operation_code_name = 'DBSCAN'
     _type_of_operation = 'cluster'
+    _is_cpu_bound = True
 
     def __init__(self):
         super().__init__()
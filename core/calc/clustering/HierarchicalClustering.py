@@ -1,5 +1,4 @@
 import numpy as np
-from functools import partial
 
 from scipy.cluster.hierarchy import dendrogram, fcluster, linkage
 
@@ -16,6 +15,7 @@ class HierarchicalClustering(baseoperationclass.BaseOperationClass):
     _operation_name = 'Hierarchical Clustering'
     _operation_code_name = 'Hierarchical'
     _type_of_operation = 'cluster'
+    _is_cpu_bound = True
 
     def __init__(self):
         super().__init__()
@@ -45,7 +45,6 @@ class HierarchicalClustering(baseoperationclass.BaseOperationClass):
                 'features_Hierarchical': self.selected_features}
 
     def _find_linkage(self, dataset):
-        distance_metric = 'euclidean'
         categorical_indices = get_categorical_indices(dataset)
         numerical_indices = [x for x in range(dataset.shape[1]) if x not in categorical_indices]
         if categorical_indices:
@@ -53,12 +52,14 @@ class HierarchicalClustering(baseoperationclass.BaseOperationClass):
             dataset = encode_nominal_parameters(dataset, categorical_indices)
             if self.categorical_weight is None or self.categorical_weight < 0:
                 self.categorical_weight = 0.5 * dataset.take(numerical_indices, axis=1).values.std()
-            from ..util.dissimilarity_python import mixed_metric
-            distance_metric = partial(mixed_metric,
-                                      categorical_indices=np.array(categorical_indices, dtype=np.int32),
-                                      categorical_weight=self.categorical_weight)
-        dataset = dataset.values
-        self.linkage = linkage(dataset, method='single', metric=distance_metric, optimal_ordering=False)
+            from ..util.dissimilarity_python import mixed_metric_pdist
+            # pairwise distances (condensed form) are computed in parallel
+            distances = mixed_metric_pdist(np.ascontiguousarray(dataset.values, dtype=np.float64),
+                                           np.array(categorical_indices, dtype=np.int32),
+                                           float(self.categorical_weight))
+            self.linkage = linkage(distances, method='single', optimal_ordering=False)
+        else:
+            self.linkage = linkage(dataset.values, method='single', metric='euclidean', optimal_ordering=False)
         return True
 
     def _dendrogram(self):
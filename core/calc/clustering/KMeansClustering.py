@@ -11,6 +11,7 @@ class KMeansClustering(baseoperationclass.BaseOperationClass):
     _operation_name = 'K-Means Clustering'
     _operation_code_name = 'KMeans'
     _type_of_operation = 'cluster'
+    _is_cpu_bound = True
 
     def __init__(self):
         super().__init__()
@@ -1,10 +1,11 @@
 import numpy as np
 import pickle
 
-from random import randint
-
+try:
+    from joblib import Parallel, cpu_count, delayed
+except ImportError:
+    from sklearn.externals.joblib import Parallel, cpu_count, delayed
 from kmodes.kprototypes import KPrototypes
-from kmodes.util.dissim import matching_dissim
 from . import baseoperationclass
 from ..util import dissimilarity_python
 from ..util import get_categorical_indices, encode_nominal_parameters, normalized_dataset
@@ -12,6 +13,72 @@ from ..util import get_categorical_indices, encode_nominal_parameters, normalize
 
 CLUSTER_NUMBER = 5
 CATEGORICAL_WEIGHT = -1
+MAX_ITER = 1000
+N_INIT = 10  # maximum number of restarts with different initial centers
+N_JOBS = 1  # number of processes for restarts (-1: all cores)
+# restarts are stopped once the best cost was not improved (by more than
+# the relative tolerance) by the set number of consecutive restarts
+PLATEAU_RESTARTS = 3
+PLATEAU_TOLERANCE = 1e-3
+
+
+def _get_n_jobs(n_jobs):
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(cpu_count() + 1 + n_jobs, 1)
+    return max(n_jobs, 1)
+
+
+def _get_distances(dataset_num, dataset_cat, center_num, center_cat, categorical_weight):
+    distances = dissimilarity_python.euclidean(dataset_num, center_num)
+    if dataset_cat.shape[1]:
+        distances += categorical_weight * dissimilarity_python.matching(dataset_cat, center_cat)
+    return distances
+
+
+# k-means++ seeding: the next center is chosen with probability proportional to the distance to the nearest
+# chosen center, the distances are updated with the new center only (O(k*n) in total)
+def _get_initial_centers(dataset_num, dataset_cat, cluster_number, categorical_weight, random_state=None):
+    if not isinstance(random_state, np.random.RandomState):
+        random_state = np.random.RandomState(random_state)
+
+    num_points = dataset_num.shape[0]
+    initial_centroids_num = np.zeros((cluster_number, dataset_num.shape[1]))
+    initial_centroids_cat = np.zeros((cluster_number, dataset_cat.shape[1]))
+    chosen_point = random_state.randint(0, num_points)
+    initial_centroids_num[0], initial_centroids_cat[0] = dataset_num[chosen_point], dataset_cat[chosen_point]
+
+    min_distances = _get_distances(dataset_num, dataset_cat, initial_centroids_num[0], initial_centroids_cat[0],
+                                   categorical_weight)
+    for i in range(1, cluster_number):
+        cumulative_distances = np.cumsum(min_distances)
+        if cumulative_distances[-1] > 0:
+            chosen_point = min(np.searchsorted(cumulative_distances,
+                                               random_state.random_sample() * cumulative_distances[-1],
+                                               side='right'), num_points - 1)
+        else:
+            # all points coincide with the chosen centers
+            chosen_point = random_state.randint(0, num_points)
+        initial_centroids_num[i] = dataset_num[chosen_point]
+        initial_centroids_cat[i] = dataset_cat[chosen_point]
+        if i < cluster_number - 1:
+            np.minimum(min_distances, _get_distances(dataset_num, dataset_cat, initial_centroids_num[i],
+                                                     initial_centroids_cat[i], categorical_weight),
+                       out=min_distances)
+
+    initial_centroids = [initial_centroids_num, initial_centroids_cat]
+    return initial_centroids
+
+
+# One restart of the algorithm (run in worker processes, arrays are shared
+# by all restarts - joblib memory-maps large arrays instead of copying them)
+def _fit_restart(values, dataset_num, dataset_cat, categorical_indices, cluster_number, categorical_weight, seed):
+    initial_centers = _get_initial_centers(dataset_num, dataset_cat, cluster_number, categorical_weight, seed)
+    model = KPrototypes(n_clusters=cluster_number, max_iter=MAX_ITER, init=initial_centers, n_init=1,
+                        gamma=categorical_weight, num_dissim=dissimilarity_python.euclidean, n_jobs=1)
+    model.fit(values, categorical=categorical_indices)
+    return model
 
 
 class KPrototypesClustering(baseoperationclass.BaseOperationClass):
@@ -19,12 +86,18 @@ class KPrototypesClustering(baseoperationclass.BaseOperationClass):
     _operation_name = 'K-Prototypes Clustering'
     _operation_code_name = 'KPrototypes'
     _type_of_operation = 'cluster'
+    _is_cpu_bound = True
 
     def __init__(self):
         super().__init__()
         self.cluster_number = CLUSTER_NUMBER
         self.categorical_weight = CATEGORICAL_WEIGHT
         self.selected_features = []
+        self.n_init = N_INIT
+        self.n_jobs = N_JOBS
+        self.plateau_restarts = PLATEAU_RESTARTS
+        self.random_state = None
+        self.num_restarts = 0
         self.model = None
         self.labels = None
         self.centers = None
@@ -33,13 +106,18 @@ class KPrototypesClustering(baseoperationclass.BaseOperationClass):
         return data if not self.selected_features \
             else data.loc[:, self.selected_features]
 
-    def set_parameters(self, cluster_number, categorical_weight=None, features=None):
+    def set_parameters(self, cluster_number, categorical_weight=None, features=None, n_jobs=None,
+                       random_state=None):
         if cluster_number is not None:
             self.cluster_number = cluster_number
         if categorical_weight is not None:
             self.categorical_weight = categorical_weight
         if features is not None and isinstance(features, (list, tuple)):
             self.selected_features = list(features)
+        if n_jobs is not None:
+            self.n_jobs = n_jobs
+        if random_state is not None:
+            self.random_state = random_state
         return True
 
     def get_parameters(self):
@@ -47,32 +125,42 @@ class KPrototypesClustering(baseoperationclass.BaseOperationClass):
                 'categorical_data_weight_KPrototypes': self.categorical_weight,
                 'features_KPrototypes': self.selected_features}
 
-    def _get_initial_centers(self, dataset, categorical_indices):
-        dataset_cat = dataset.take(categorical_indices, axis=1).values
-        categorical_labels = [column for index, column in enumerate(dataset.columns) if index in categorical_indices]
-        dataset_num = dataset.drop(categorical_labels, axis=1).values
-
+    def _get_categorical_weight(self, dataset_num):
         categorical_weight = self.categorical_weight
         if categorical_weight is None or categorical_weight < 0:
             categorical_weight = 0.5 * dataset_num.std()
-        initial_centroids_num = np.zeros((self.cluster_number, dataset_num.shape[1]))
-        initial_centroids_cat = np.zeros((self.cluster_number, dataset_cat.shape[1]))
-        rand_index = randint(0, dataset.shape[0] - 1)
-        initial_centroids_num[0], initial_centroids_cat[0] = dataset_num[rand_index], dataset_cat[rand_index]
-
-        for i in range(1, self.cluster_number):
-            distances_num_cat = [np.zeros((i, dataset.shape[0]), dtype=np.float64), np.zeros((i, dataset.shape[0]))]
-            for j in range(0, i):
-                distances_num_cat[0][j] = dissimilarity_python.euclidean(dataset_num, initial_centroids_num[j])
-                distances_num_cat[1][j] = matching_dissim(dataset_cat, initial_centroids_cat[j])
-            distances = np.amin(distances_num_cat[0] + categorical_weight * distances_num_cat[1], axis=0)
-            probabilities = distances / np.sum(distances)
-            chosen_point = np.random.choice(range(0, dataset.shape[0]), p=probabilities)
-            initial_centroids_num[i] = dataset_num[chosen_point]
-            initial_centroids_cat[i] = dataset_cat[chosen_point]
-
-        initial_centroids = [initial_centroids_num, initial_centroids_cat]
-        return initial_centroids
+        return categorical_weight
+
+    # Restarts are run in batches (one restart per process), the model with the lowest cost is kept.
+    # Encoded and normalized dataset is prepared once and is shared by all restarts
+    def _fit(self, dataset, categorical_indices):
+        values = dataset.values
+        numerical_indices = [index for index in range(values.shape[1]) if index not in categorical_indices]
+        dataset_num = values[:, numerical_indices]
+        dataset_cat = values[:, categorical_indices]
+        categorical_weight = self._get_categorical_weight(dataset_num)
+
+        seeds = np.random.RandomState(self.random_state).randint(np.iinfo(np.int32).max, size=self.n_init)
+        n_jobs = min(_get_n_jobs(self.n_jobs), self.n_init)
+
+        best_model, num_stale_restarts = None, 0
+        self.num_restarts = 0
+        with Parallel(n_jobs=n_jobs) as parallel:
+            for batch_start in range(0, self.n_init, n_jobs):
+                models = parallel(delayed(_fit_restart)(
+                    values, dataset_num, dataset_cat, categorical_indices, self.cluster_number, categorical_weight,
+                    seed) for seed in seeds[batch_start:batch_start + n_jobs])
+                self.num_restarts += len(models)
+                for model in models:
+                    if best_model is None or model.cost_ < best_model.cost_ * (1. - PLATEAU_TOLERANCE):
+                        num_stale_restarts = 0
+                    else:
+                        num_stale_restarts += 1
+                    if best_model is None or model.cost_ < best_model.cost_:
+                        best_model = model
+                if self.plateau_restarts and num_stale_restarts >= self.plateau_restarts:
+                    break
+        return best_model
 
     # Used if there's no categorical properties in the dataset
     def _fallback_algorithm(self, dataset):
@@ -84,7 +172,7 @@ class KPrototypesClustering(baseoperationclass.BaseOperationClass):
         return self.labels
 
     # By default, K-Prototypes uses euclidean distance for numerical data and Hamming distance for categorical data
-    # n_init is the number of time the k-modes algorithm will be run with different centroid seeds
+    # n_init is the maximum number of times the k-prototypes algorithm will be run with different centroid seeds
     # gamma is the weight to balance numerical data against categorical.
     # If None, it defaults to half of standard deviation for numerical data
     def get_labels(self, data, reprocess=False):
@@ -99,12 +187,9 @@ class KPrototypesClustering(baseoperationclass.BaseOperationClass):
             data = encode_nominal_parameters(data)
             data = normalized_dataset(data, categorical_indices)
 
-            initial_centers = self._get_initial_centers(data, categorical_indices)
-            self.model = KPrototypes(n_clusters=self.cluster_number, max_iter=1000, init=initial_centers, n_init=10,
-                                     gamma=self.categorical_weight, num_dissim=dissimilarity_python.euclidean, n_jobs=1)
-            data = data.values
-            self.model.fit(data, categorical=categorical_indices)
-            self.labels = self.model.predict(data, categorical=categorical_indices)
+            self.model = self._fit(data, categorical_indices)
+            # labels of the fitted model are the final assignment to the centers (same as predict)
+            self.labels = self.model.labels_
             self.centers = self.model.cluster_centroids_
             centers = self.centers[0]
             for index, cat_index in enumerate(categorical_indices):
@@ -23,6 +23,7 @@ class MiniBatchKMeansClustering(baseoperationclass.BaseOperationClass):
     _operation_name = 'MiniBatch K-Means Clustering'
     _operation_code_name = 'MiniBatchKMeans'
     _type_of_operation = 'cluster'
+    _is_cpu_bound = True
 
     def __init__(self):
         super().__init__()
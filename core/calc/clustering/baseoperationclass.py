@@ -4,6 +4,8 @@ class BaseOperationClass:
     _operation_name = 'Operation basis'
     _operation_code_name = 'OpBasic'
     # "operation_code_name" should correspond to html parameter "algorithm"
+    _is_cpu_bound = False
+    # "is_cpu_bound" operations are run in separate processes (calc.executor)
 
     def _get_name(self):
         return self._operation_name
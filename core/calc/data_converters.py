@@ -1,7 +1,12 @@
+import base64
 import json
 
+import numpy as np
 import pandas as pd
 
+NUMERIC_KINDS = 'biuf'  # numpy kinds of values encoded as typed arrays
+STREAM_CHUNK_SIZE = 1000  # number of rows per chunk of JavaScript-like array
+
 
 def pandas_to_js_list(dataset):
     """
@@ -19,6 +24,111 @@ def pandas_to_js_list(dataset):
         return results
 
 
+class JSListStream(object):
+
+    """
+    Dataset that is converted to JavaScript-like array (see
+    "pandas_to_js_list") on demand by chunks of rows, thus the text of the
+    array is not kept in memory when it is sent by a streaming response.
+    """
+
+    def __init__(self, dataset, chunk_size=None):
+        """
+        Initialization.
+
+        :param dataset: Dataset.
+        :type dataset: pandas.DataFrame/None
+        :param chunk_size: Number of rows per chunk.
+        :type chunk_size: int/None
+        """
+        self.dataset = dataset
+        self.chunk_size = chunk_size or STREAM_CHUNK_SIZE
+
+    def __bool__(self):
+        return self.dataset is not None and len(self.dataset.index) > 0
+
+    def __iter__(self):
+        """
+        Get text of the array by chunks.
+
+        :return: Iterator over text chunks (joined chunks are the same as
+            the string representation of "pandas_to_js_list" output).
+        :rtype: iterator
+        """
+        yield '['
+        num_rows = len(self.dataset.index) if self else 0
+        for start in range(0, num_rows, self.chunk_size):
+            index = self.dataset.index[start:start + self.chunk_size]
+            values = self.dataset.values[start:start + self.chunk_size]
+            yield '{}{}'.format(', ' if start else '', ', '.join(
+                str([[str(i)], [v]]) for i, v in zip(index, values.tolist())))
+        yield ']'
+
+    def __str__(self):
+        return ''.join(self)
+
+
+def _encode_values(values, lossless=True):
+    """
+    Encode values of the column for the column-oriented payload
+    (numeric values as base64 of little-endian Float32 [or Float64 if
+    Float32 loses precision and lossless flag is set], others as a list).
+
+    :param values: Column values.
+    :type values: numpy.ndarray
+    :param lossless: Flag to keep the precision of values.
+    :type lossless: bool
+    :return: Data type and encoded values.
+    :rtype: dict
+    """
+    if values.dtype.kind in NUMERIC_KINDS:
+        values = values.astype(np.float64)
+        dtype = '<f4'
+        if lossless:
+            values_f4 = values.astype(np.float32)
+            if not np.array_equal(values_f4 == values, ~np.isnan(values)):
+                dtype = '<f8'
+        return {'dtype': 'float32' if dtype == '<f4' else 'float64',
+                'values': base64.b64encode(
+                    values.astype(dtype).tobytes()).decode('ascii')}
+
+    return {'dtype': 'object',
+            'values': [None if pd.isnull(x) else x for x in values.tolist()]}
+
+
+def pandas_to_column_payload(dataset, lossless=True):
+    """
+    Convert pandas DataFrame to the column-oriented payload (without index,
+    see "index_to_column_payload").
+
+    :param dataset: Dataset.
+    :type dataset: pandas.DataFrame/None
+    :param lossless: Flag to keep the precision of numeric values.
+    :type lossless: bool
+    :return: Column names and encoded values per column.
+    :rtype: dict
+    """
+    if dataset is None:
+        return {'columns': [], 'data': []}
+
+    return {'columns': [str(x) for x in dataset.columns],
+            'data': [_encode_values(dataset.iloc[:, i].values,
+                                    lossless=lossless)
+                     for i in range(len(dataset.columns))]}
+
+
+def index_to_column_payload(index):
+    """
+    Convert pandas Index to the encoded column (shared by datasets).
+
+    :param index: Dataset index.
+    :type index: pandas.Index
+    :return: Data type and encoded values.
+    :rtype: dict
+    """
+    return _encode_values(index.values)
+
+
 def table_to_df(data):
     """
     Convert JSON data to pandas DataFrame.
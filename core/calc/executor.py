@@ -0,0 +1,267 @@
+"""
+Class OperationExecutor runs CPU-bound operations (process_data) in separate
+processes: the number of concurrently running processes is bounded, every
+run is limited by the timeout and can be cancelled (the process is
+terminated), thus a long operation does not block other requests.
+
+The executor is disabled by default (see OPERATIONS_MAX_PROCESSES). With the
+default "spawn" start method every process starts a new interpreter, thus
+under an embedded WSGI server the interpreter should be set explicitly
+(OPERATIONS_PYTHON_EXECUTABLE, since sys.executable is the server binary).
+
+Numeric datasets are transferred as memory-mapped `.npy` matrices (matrices
+of the binary history store are used as is, other numeric datasets are
+written into a temporary file), other datasets are pickled.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+
+import numpy as np
+import pandas as pd
+
+from django.conf import settings
+
+START_METHOD_DEFAULT = 'spawn'  # safe with threads and OpenMP runtimes
+POLL_INTERVAL = .5  # seconds between checks of cancellation and timeout
+NUMERIC_KINDS = 'biuf'
+
+_operation_executor = None
+_operation_executor_lock = threading.Lock()
+
+
+class OperationTimeoutError(Exception):
+    pass
+
+
+class OperationCancelledError(Exception):
+    pass
+
+
+def _get_npy_matrix(values):
+    """
+    Get memory-mapped `.npy` matrix that the values are taken from as is.
+
+    :param values: Dataset values.
+    :type values: numpy.ndarray
+    :return: Memory-mapped matrix (None if values are not such matrix).
+    :rtype: numpy.memmap/None
+    """
+    base = values
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    if (base is None or not str(base.filename or '').endswith('.npy') or
+            not base.flags['C_CONTIGUOUS']):
+        return None
+
+    # values are the whole matrix (not a slice or a copy of it)
+    if (values.shape != base.shape or values.dtype != base.dtype or
+            values.strides != base.strides or
+            values.__array_interface__['data'][0] !=
+            base.__array_interface__['data'][0]):
+        return None
+    return base
+
+
+def _save_dataset(dataset, dir_name):
+    """
+    Form the description of the dataset to transfer it into the process.
+
+    :param dataset: Dataset.
+    :type dataset: pandas.DataFrame
+    :param dir_name: Directory for temporary files.
+    :type dir_name: str
+    :return: Dataset description (see _load_dataset).
+    :rtype: dict
+    """
+    if not all(dtype.kind in NUMERIC_KINDS for dtype in dataset.dtypes):
+        return {'dataset': dataset}
+
+    output = {'index': dataset.index,
+              'columns': dataset.columns,
+              'dtypes': [dtype.name for dtype in dataset.dtypes]}
+
+    values = dataset.values
+    matrix = _get_npy_matrix(values)
+    if matrix is not None:
+        output['file'] = matrix.filename
+    else:
+        output['file'] = os.path.join(dir_name, 'dataset.npy')
+        np.save(output['file'], np.ascontiguousarray(values))
+    return output
+
+
+def _load_dataset(description):
+    """
+    Load the dataset in the process (numeric matrix is memory-mapped).
+
+    :param description: Dataset description (see _save_dataset).
+    :type description: dict
+    :return: Dataset.
+    :rtype: pandas.DataFrame
+    """
+    if 'dataset' in description:
+        return description['dataset']
+
+    output = pd.DataFrame(np.load(description['file'], mmap_mode='r'),
+                          index=description['index'],
+                          columns=description['columns'], copy=False)
+    dtypes = {c: t for c, t in zip(output.columns, description['dtypes'])
+              if output[c].dtype.name != t}
+    if dtypes:
+        output = output.astype(dtypes)
+    return output
+
+
+def _run_operation(connection, operation, description):
+    """
+    Run the operation (in the separate process) and send back its output
+    and the operation itself (with results).
+
+    :param connection: Connection to the parent process.
+    :type connection: multiprocessing.connection.Connection
+    :param operation: Operation with set parameters.
+    :type operation: baseoperationclass.BaseOperationClass
+    :param description: Dataset description (see _save_dataset).
+    :type description: dict
+    """
+    try:
+        output = operation.process_data(_load_dataset(description))
+        connection.send((True, output, operation))
+    except Exception:
+        connection.send((False, traceback.format_exc(), None))
+    finally:
+        connection.close()
+
+
+class OperationExecutor:
+
+    def __init__(self, max_processes, timeout=None, start_method=None,
+                 executable=None):
+        """
+        Initialization.
+
+        :param max_processes: Maximum number of concurrent processes.
+        :type max_processes: int
+        :param timeout: Default time limit of the operation (in seconds).
+        :type timeout: float/None
+        :param start_method: Start method of processes (default: spawn).
+        :type start_method: str/None
+        :param executable: Python interpreter of processes (is used by
+            the spawn and forkserver start methods; default: sys.executable).
+        :type executable: str/None
+        """
+        self.max_processes = max_processes
+        self.timeout = timeout
+        self._context = multiprocessing.get_context(
+            start_method or START_METHOD_DEFAULT)
+        if executable:
+            self._context.set_executable(executable)
+        self._slots = threading.BoundedSemaphore(max_processes)
+
+    def _acquire_slot(self, is_cancelled=None):
+        while not self._slots.acquire(timeout=POLL_INTERVAL):
+            if is_cancelled is not None and is_cancelled():
+                raise OperationCancelledError('Operation was cancelled')
+
+    def run(self, operation, dataset, timeout=None, is_cancelled=None):
+        """
+        Run the operation (process_data) in a separate process, the provided
+        operation object is updated with results.
+
+        :param operation: Operation with set parameters.
+        :type operation: baseoperationclass.BaseOperationClass
+        :param dataset: Dataset to process.
+        :type dataset: pandas.DataFrame
+        :param timeout: Time limit (in seconds, default is set at init).
+        :type timeout: float/None
+        :param is_cancelled: Function that checks whether the run is
+            cancelled.
+        :type is_cancelled: callable/None
+        :return: Output of the operation process_data method.
+        """
+        timeout = timeout or self.timeout
+
+        self._acquire_slot(is_cancelled=is_cancelled)
+        dir_name = tempfile.mkdtemp(prefix='operation')
+        try:
+            parent_connection, child_connection = self._context.Pipe(
+                duplex=False)
+            process = self._context.Process(
+                target=_run_operation,
+                args=(child_connection, operation,
+                      _save_dataset(dataset, dir_name)))
+            process.start()
+            child_connection.close()
+
+            try:
+                result = self._wait(process, parent_connection, timeout,
+                                    is_cancelled)
+            finally:
+                parent_connection.close()
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+        finally:
+            shutil.rmtree(dir_name, ignore_errors=True)
+            self._slots.release()
+
+        is_done, output, processed_operation = result
+        if not is_done:
+            raise RuntimeError('Operation failed in the process: {}'.format(
+                output))
+
+        operation.__dict__.update(processed_operation.__dict__)
+        return output
+
+    @staticmethod
+    def _wait(process, connection, timeout=None, is_cancelled=None):
+        """
+        Wait for the result of the process.
+
+        :return: Flag of success, output (or error) and processed operation.
+        :rtype: tuple
+        """
+        start_time = time.time()
+        while not connection.poll(POLL_INTERVAL):
+            if not process.is_alive() and not connection.poll():
+                raise RuntimeError('Operation process terminated '
+                                   '(exit code: {})'.format(process.exitcode))
+            if is_cancelled is not None and is_cancelled():
+                raise OperationCancelledError('Operation was cancelled')
+            if timeout and time.time() - start_time > timeout:
+                raise OperationTimeoutError(
+                    'Operation exceeded the time limit ({}s)'.format(timeout))
+        return connection.recv()
+
+
+def get_operation_executor():
+    """
+    Get executor of CPU-bound operations of the current process (number of
+    processes and time limit are defined by settings).
+
+    :return: Operation executor (None if it is disabled).
+    :rtype: OperationExecutor/None
+    """
+    global _operation_executor
+
+    max_processes = getattr(settings, 'OPERATIONS_MAX_PROCESSES', None)
+    if not max_processes:
+        return None
+
+    if _operation_executor is None:
+        with _operation_executor_lock:
+            if _operation_executor is None:
+                _operation_executor = OperationExecutor(
+                    max_processes=max_processes,
+                    timeout=getattr(settings, 'OPERATIONS_TIMEOUT', None),
+                    start_method=getattr(
+                        settings, 'OPERATIONS_START_METHOD', None),
+                    executable=getattr(
+                        settings, 'OPERATIONS_PYTHON_EXECUTABLE', None))
+    return _operation_executor
@@ -0,0 +1,271 @@
+"""
+Class GroupStatistics keeps mergeable statistics of numeric features per group
+of objects (count, sum, min, max, central moments and co-moments), thus basic
+statistics and correlation of any group or union of groups are assembled
+without processing of grouped objects.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+# percentiles kept per group to estimate quantiles of merged groups
+# (rank error of estimated quantiles does not exceed the step)
+PERCENTILES = np.linspace(0., 100., 101)
+
+
+class GroupStatistics:
+
+    def __init__(self, columns, count, mean, m2, m3, min_values, max_values,
+                 comoments, percentiles):
+        """
+        Initialization (see "from_groups" to calculate statistics).
+
+        :param columns: Feature names.
+        :type columns: list
+        :param count: Number of objects per group.
+        :type count: numpy.ndarray
+        :param mean: Mean values per group (groups x features).
+        :type mean: numpy.ndarray
+        :param m2: Sums of squared deviations per group (groups x features).
+        :type m2: numpy.ndarray
+        :param m3: Sums of cubed deviations per group (groups x features).
+        :type m3: numpy.ndarray
+        :param min_values: Min values per group (groups x features).
+        :type min_values: numpy.ndarray
+        :param max_values: Max values per group (groups x features).
+        :type max_values: numpy.ndarray
+        :param comoments: Sums of deviation products per group
+            (groups x features x features).
+        :type comoments: numpy.ndarray
+        :param percentiles: Percentiles per group (groups x PERCENTILES x
+            features).
+        :type percentiles: numpy.ndarray
+        """
+        self.columns = list(columns)
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.m3 = m3
+        self.min_values = min_values
+        self.max_values = max_values
+        self.comoments = comoments
+        self.percentiles = percentiles
+
+    @classmethod
+    def from_groups(cls, dataset, group_labels, num_groups):
+        """
+        Calculate statistics per group (objects are expected to have no
+        missing values, see BaseReader.drop_na).
+
+        :param dataset: Numeric features of grouped objects.
+        :type dataset: pandas.DataFrame
+        :param group_labels: Group number per object (-1 if not grouped).
+        :type group_labels: numpy.ndarray
+        :param num_groups: Number of groups.
+        :type num_groups: int
+        :return: Group statistics.
+        :rtype: GroupStatistics
+        """
+        values = dataset.values.astype(np.float64)
+        group_labels = np.asarray(group_labels)
+        num_features = values.shape[1]
+
+        order = np.argsort(group_labels, kind='mergesort')
+        bounds = np.searchsorted(group_labels[order],
+                                 np.arange(num_groups + 1))
+
+        shape = (num_groups, num_features)
+        count = np.diff(bounds)
+        mean, m2, m3 = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+        min_values, max_values = np.full(shape, np.nan), np.full(shape, np.nan)
+        comoments = np.zeros((num_groups, num_features, num_features))
+        percentiles = np.full((num_groups, len(PERCENTILES), num_features),
+                              np.nan)
+
+        for i in np.flatnonzero(count):
+            group_values = values[order[bounds[i]:bounds[i + 1]]]
+            mean[i] = group_values.mean(axis=0)
+            deviations = group_values - mean[i]
+            squared = deviations * deviations
+            m2[i] = squared.sum(axis=0)
+            m3[i] = (squared * deviations).sum(axis=0)
+            comoments[i] = np.dot(deviations.T, deviations)
+            min_values[i] = group_values.min(axis=0)
+            max_values[i] = group_values.max(axis=0)
+            percentiles[i] = np.percentile(group_values, PERCENTILES, axis=0)
+
+        return cls(columns=dataset.columns.tolist(), count=count, mean=mean,
+                   m2=m2, m3=m3, min_values=min_values, max_values=max_values,
+                   comoments=comoments, percentiles=percentiles)
+
+    def save(self, file_name):
+        """
+        Save statistics into the file (numpy npz-format).
+
+        :param file_name: Full file name.
+        :type file_name: str
+        """
+        with open(file_name, 'wb') as f:
+            np.savez(f, columns=np.array(json.dumps(self.columns)),
+                     count=self.count, mean=self.mean, m2=self.m2, m3=self.m3,
+                     min_values=self.min_values, max_values=self.max_values,
+                     comoments=self.comoments, percentiles=self.percentiles)
+
+    @classmethod
+    def load(cls, file_name):
+        """
+        Load statistics from the file.
+
+        :param file_name: Full file name.
+        :type file_name: str
+        :return: Group statistics.
+        :rtype: GroupStatistics
+        """
+        with np.load(file_name) as data:
+            kwargs = {k: data[k] for k in data.files if k != 'columns'}
+            kwargs['columns'] = json.loads(str(data['columns']))
+        return cls(**kwargs)
+
+    def _get_column_ids(self, columns=None):
+        if columns is None:
+            return np.arange(len(self.columns))
+        return np.array([self.columns.index(x) for x in columns],
+                        dtype=np.int64)
+
+    def get_count(self, group_ids):
+        """
+        Get the number of objects in groups.
+
+        :param group_ids: Group numbers.
+        :type group_ids: list
+        :return: Number of objects.
+        :rtype: int
+        """
+        return int(self.count[np.asarray(group_ids, dtype=np.int64)].sum())
+
+    def merge(self, group_ids, columns=None):
+        """
+        Merge statistics of groups (moments are combined by shifting
+        of group deviations to the common mean).
+
+        :param group_ids: Group numbers.
+        :type group_ids: list
+        :param columns: Feature names (default: all features).
+        :type columns: list/None
+        :return: Number of objects, mean, m2, m3, min and max values and
+            co-moments for the union of groups.
+        :rtype: dict
+        """
+        group_ids = np.asarray(group_ids, dtype=np.int64)
+        group_ids = group_ids[self.count[group_ids] > 0]
+        ids = self._get_column_ids(columns)
+
+        count = self.count[group_ids].astype(np.float64)
+        mean = self.mean[np.ix_(group_ids, ids)]
+        m2 = self.m2[np.ix_(group_ids, ids)]
+
+        num_objects = count.sum()
+        total_mean = np.dot(count, mean) / num_objects
+        delta = mean - total_mean
+        weighted_delta = delta * count[:, None]
+
+        return {
+            'count': int(num_objects),
+            'mean': total_mean,
+            'm2': (m2 + weighted_delta * delta).sum(axis=0),
+            'm3': (self.m3[np.ix_(group_ids, ids)] + 3. * delta * m2 +
+                   weighted_delta * delta * delta).sum(axis=0),
+            'min': self.min_values[np.ix_(group_ids, ids)].min(axis=0),
+            'max': self.max_values[np.ix_(group_ids, ids)].max(axis=0),
+            'comoments': (self.comoments[np.ix_(group_ids, ids, ids)].sum(
+                axis=0) + np.dot(weighted_delta.T, delta))}
+
+    def get_quantiles(self, group_ids, q, columns=None):
+        """
+        Estimate quantiles for the union of groups (by the mixture of
+        distributions that are given by stored percentiles per group).
+
+        :param group_ids: Group numbers.
+        :type group_ids: list
+        :param q: Quantiles (values between 0 and 1).
+        :type q: list
+        :param columns: Feature names (default: all features).
+        :type columns: list/None
+        :return: Quantile values (quantiles x features).
+        :rtype: numpy.ndarray
+        """
+        group_ids = np.asarray(group_ids, dtype=np.int64)
+        group_ids = group_ids[self.count[group_ids] > 0]
+        ids = self._get_column_ids(columns)
+
+        weights = self.count[group_ids] / float(self.count[group_ids].sum())
+        ranks = PERCENTILES / 100.
+
+        output = np.empty((len(q), len(ids)))
+        for j, column_id in enumerate(ids):
+            percentiles = self.percentiles[group_ids, :, column_id]
+            points = np.unique(percentiles)
+            cdf = np.zeros(len(points))
+            for weight, group_percentiles in zip(weights, percentiles):
+                cdf += weight * np.interp(points, group_percentiles, ranks)
+            output[:, j] = np.interp(q, cdf, points)
+        return output
+
+    def get_basic_statistics(self, group_ids, columns=None):
+        """
+        Get basic statistics for the union of groups (in the same form as
+        BasicStatistics results, i.e., in order of its DESCRIPTION;
+        quantiles are estimated).
+
+        :param group_ids: Group numbers.
+        :type group_ids: list
+        :param columns: Feature names (default: all features).
+        :type columns: list/None
+        :return: Statistics per feature (in order of DESCRIPTION).
+        :rtype: list
+        """
+        merged = self.merge(group_ids=group_ids, columns=columns)
+        count, m2 = merged['count'], merged['m2']
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = (np.sqrt(m2 / (count - 1)) if count > 1
+                   else np.full(len(m2), np.nan))
+            skew = ((count * np.sqrt(count - 1) / (count - 2)) *
+                    (merged['m3'] / np.power(m2, 1.5)))
+        skew[m2 == 0] = 0.
+        if count < 3:
+            skew[:] = np.nan
+
+        quantiles = self.get_quantiles(group_ids=group_ids, q=[.25, .5, .75],
+                                       columns=columns)
+        table = [np.full(len(m2), float(count)), merged['min'], merged['max'],
+                 merged['mean'], std, quantiles[0], quantiles[1],
+                 quantiles[2], merged['mean'] * count, skew, quantiles[1]]
+
+        index = self.columns if columns is None else list(columns)
+        return [pd.Series(x, index=index) for x in table]
+
+    def get_correlation(self, group_ids, columns=None):
+        """
+        Get correlation matrix for the union of groups.
+
+        :param group_ids: Group numbers.
+        :type group_ids: list
+        :param columns: Feature names (default: all features).
+        :type columns: list/None
+        :return: Pearson correlation coefficients.
+        :rtype: pandas.DataFrame
+        """
+        comoments = self.merge(group_ids=group_ids,
+                               columns=columns)['comoments']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            deviations = np.sqrt(np.diag(comoments))
+            corr = comoments / np.outer(deviations, deviations)
+        corr[:, deviations == 0] = np.nan
+        corr[deviations == 0, :] = np.nan
+        np.clip(corr, -1., 1., out=corr)
+
+        index = self.columns if columns is None else list(columns)
+        return pd.DataFrame(corr, index=index, columns=index)
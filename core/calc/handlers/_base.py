@@ -49,3 +49,19 @@ class BaseDataHandler:
                     '({}): {}'.format(file_name, e))
                 # re-raise exception if a different error occurred
                 raise
+
+    @staticmethod
+    def _get_file_fingerprint(file_name):
+        """
+        Get file fingerprint to check whether the file was changed.
+
+        :param file_name: Full file name/path.
+        :type file_name: str
+        :return: Modification time (in ns) and size (None if no file).
+        :rtype: tuple/None
+        """
+        try:
+            stat = os.stat(file_name)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -3,24 +3,27 @@ Class DatasetHandler provides methods to store, examine and transform
 the original dataset, and to process it according to the required view.
 """
 
-import json
 import logging
 import os
 
+import numpy as np
 import pandas as pd
 
+from django.conf import settings
+
 from ...providers import LocalReader
+from ...providers.local import STORED_FILE_FORMAT
 
-from .. import data_converters
-from ..basicstatistics import BasicStatistics
+from ..basicstatistics import BasicStatistics, get_correlation
 from ..lod_generator import LoDGenerator
 from ..operationshistory import OperationHistory
 
 from ._base import BaseDataHandler
 from .groupeddata import GroupedDataHandler
+from .historycache import get_history_cache
+from .historystore import get_history_store
 
 FILE_EXTENSION_DEFAULT = 'csv'
-HISTORY_FILE_EXTENSION = 'history'
 
 local_reader = LocalReader()
 logger = logging.getLogger(__name__)
@@ -49,7 +52,9 @@ class DatasetHandler(BaseDataHandler):
         self._group_ids = group_ids  # possible values: None, empty list, list
         self._origin = None
         self._modifications = {}
+        self._matrices = {}  # memory-mapped values of numeric datasets
         self._property_set = {}
+        self._history_fingerprint = None  # fingerprint of loaded history data
         self._use_normalized_dataset = use_normalized_dataset
 
         if (isinstance(kwargs.get('dataset'), pd.DataFrame) and \
@@ -82,27 +87,17 @@ class DatasetHandler(BaseDataHandler):
         elif kwargs.get('load_history_data', False):
             self._load_history_data()
 
-    def _get_full_file_name(self, is_history_file=False):
+    def _get_full_file_name(self, file_format=None):
         """
-        Form full file name with initial dataset or with history information.
+        Form full file name with initial dataset.
 
-        :param is_history_file: Flag to get file name with history data.
-        :type is_history_file: bool
+        :param file_format: Format of the dataset file (default: csv).
+        :type file_format: str/None
         :return: Full file name.
         :rtype: str
         """
-        if is_history_file:
-            group_ids = self._group_ids or []
-            file_name = '{}{}.{}'.format(
-                self._did,
-                ''.join(['.group{}'.format(i) for i in group_ids]),
-                HISTORY_FILE_EXTENSION)
-        else:
-            file_name = '{}.{}'.format(
-                self._did,
-                FILE_EXTENSION_DEFAULT)
-
-        return os.path.join(self._get_full_dir_name(), file_name)
+        return os.path.join(self._get_full_dir_name(), '{}.{}'.format(
+            self._did, file_format or FILE_EXTENSION_DEFAULT))
 
     def _get_initial_dataset(self, **kwargs):
         """
@@ -114,21 +109,41 @@ class DatasetHandler(BaseDataHandler):
         :rtype: pandas.DataFrame/None
         """
         if self._group_ids is None:
-            full_file_name = self._get_full_file_name(is_history_file=False)
-            if kwargs.get('usecols'):
-                kwargs['usecols'].insert(0, local_reader.read_df(
+            full_file_name = self._get_full_file_name(
+                file_format=STORED_FILE_FORMAT)
+            if os.path.isfile(full_file_name):
+                output = local_reader.read_df(
+                    file_path=full_file_name,
+                    file_format=STORED_FILE_FORMAT,
+                    **{'usecols': kwargs.get('usecols')})
+            else:
+                # dataset sample that was not ingested (stored as csv-file)
+                full_file_name = self._get_full_file_name()
+                if kwargs.get('usecols'):
+                    kwargs['usecols'].insert(0, local_reader.read_df(
+                        file_path=full_file_name,
+                        file_format='csv',
+                        **{'nrows': 0}).columns.tolist()[0])
+                output = local_reader.read_df(
                     file_path=full_file_name,
                     file_format='csv',
-                    **{'nrows': 1}).columns.tolist()[0])
-            output = local_reader.read_df(file_path=full_file_name,
-                                          file_format='csv',
-                                          **{'index_col': 0,
-                                             'header': 0,
-                                             'usecols': kwargs.get('usecols')})
+                    **{'index_col': 0,
+                       'header': 0,
+                       'usecols': kwargs.get('usecols')})
         elif self._group_ids:
-            output = GroupedDataHandler(did=self._did,
-                                        group_ids=self._group_ids[:-1]).\
-                get_group(group_id=int(self._group_ids[-1]))
+            grouped_data_hdlr = GroupedDataHandler(
+                did=self._did, group_ids=self._group_ids[:-1])
+
+            # groups stored in the lazy mode are sliced from the parent dataset
+            parent_dataset = None
+            members = grouped_data_hdlr.get_members()
+            if members is not None:
+                parent_dataset = DatasetHandler(
+                    did=self._did, group_ids=self._group_ids[:-1] or None).\
+                    _get_initial_dataset(usecols=list(members['features']))
+
+            output = grouped_data_hdlr.get_group(
+                group_id=int(self._group_ids[-1]), dataset=parent_dataset)
         else:
             output = None
             logger.error('[DatasetHandler._get_initial_dataset] '
@@ -136,6 +151,29 @@ class DatasetHandler(BaseDataHandler):
                          format(self._did, self._group_ids))
         return output
 
+    def load_initial_dataset(self):
+        """
+        Load initial dataset sample (if it was not loaded yet).
+        """
+        if self._origin is None:
+            self._origin = self._get_initial_dataset()
+
+    def get_initial_dataset_fingerprint(self):
+        """
+        Get fingerprint of the initial dataset sample file.
+
+        :return: Fingerprint (None for dataset groups or if there is no file).
+        :rtype: tuple/None
+        """
+        if self._group_ids is not None:
+            return None
+
+        full_file_name = self._get_full_file_name(
+            file_format=STORED_FILE_FORMAT)
+        if not os.path.isfile(full_file_name):
+            full_file_name = self._get_full_file_name()
+        return self._get_file_fingerprint(full_file_name)
+
     @property
     def _normalized(self):
         return self._modifications.get('normalized')
@@ -144,6 +182,23 @@ class DatasetHandler(BaseDataHandler):
     def _auxiliary(self):
         return self._modifications.get('auxiliary')
 
+    def _get_matrix_view(self, name, dataset):
+        """
+        Get numeric dataset as a view over the [memory-mapped] matrix.
+
+        :param name: Dataset name (origin, normalized).
+        :type name: str
+        :param dataset: Numeric dataset that corresponds to the matrix.
+        :type dataset: pandas.DataFrame
+        :return: Dataset with float64 values (without copying data).
+        :rtype: pandas.DataFrame
+        """
+        matrix = self._matrices.get(name)
+        if matrix is None:
+            return dataset
+        return pd.DataFrame(matrix, index=dataset.index,
+                            columns=dataset.columns, copy=False)
+
     @property
     def clustering_dataset(self):
         if not self._modifications:
@@ -151,6 +206,7 @@ class DatasetHandler(BaseDataHandler):
                          'Dataset for clustering is not prepared')
             raise
 
+        _name = 'normalized' if self._use_normalized_dataset else 'origin'
         _dataset = self._normalized if self._use_normalized_dataset else self._origin
 
         if (self._mode == 'numeric'):
@@ -159,6 +215,8 @@ class DatasetHandler(BaseDataHandler):
             # TODO: Re-check that feature selection is needed here
             #  (it was processed at _form_dataset_modifications for _origin dataset)
             #  (Note: for LoD _origin dataset it might behave differently)
+            if _features == _dataset.columns.tolist():
+                return self._get_matrix_view(name=_name, dataset=_dataset)
             return _dataset.loc[:, _features]
         elif (self._mode == 'all'):
             return pd.concat([_dataset, self._auxiliary], axis=1, sort=False)
@@ -195,7 +253,11 @@ class DatasetHandler(BaseDataHandler):
                 set_groups(
                     dataset=dataset.loc[:, self._property_set['features']],
                     groups_metadata=self._property_set['lod']['groups'],
-                    save_to_file=True)
+                    group_labels=lod.group_labels,
+                    group_statistics=lod.group_statistics,
+                    save_to_file=True,
+                    storage_mode=getattr(settings, 'GROUPS_STORAGE_MODE',
+                                         None))
         else:
             self._origin = local_reader.get_numeric_data(dataset)
             _set = set(self._origin.columns.tolist())
@@ -207,76 +269,281 @@ class DatasetHandler(BaseDataHandler):
         self._modifications['normalized'] = local_reader.scaler(self._origin)
 
         basic_statistics = BasicStatistics()
-        basic_statistics.process_data(self._normalized)
+        normalized_stats = self._get_normalized_statistics()
+        if normalized_stats is None:
+            basic_statistics.process_data(self._normalized)
+        else:
+            basic_statistics.results = normalized_stats
         operation_history = OperationHistory()
         operation_history.append(self._normalized, basic_statistics)
         self.operation_history = operation_history
 
-    def _save_history_data(self):
+    def _get_parent_group_statistics(self):
         """
-        Save modifications of the in initial dataset and corresponding data.
+        Get statistics of the parent groups if the dataset is a single
+        group (drill-down without grouping) and its numeric features are
+        covered by stored statistics.
 
-        1st line - origin (numeric) dataset
-        2nd line - normalized dataset
-        3rd line - auxiliary data (not numeric values)
-        4th line - selected features
-        5th line - Level-of-Detail Generator metadata
-        6th line - operations history (list of clustering operations)
+        :return: Parent group statistics (or None).
+        :rtype: groupstatistics.GroupStatistics/None
         """
-        file_name = self._get_full_file_name(is_history_file=True)
-        self._remove_file(file_name=file_name)
+        if (not self._group_ids or self._origin is None or
+                (self._property_set.get('lod') or {}).get('value')):
+            return None
 
         try:
-            with open(file_name, 'w') as f:
-                f.write('{}\n'.format(self._origin.to_json(orient='table')))
-                f.write('{}\n'.format(self._normalized.to_json(orient='table')))
-                f.write('{}\n'.format(self._auxiliary.to_json(orient='table')))
+            group_statistics = GroupedDataHandler(
+                did=self._did, group_ids=self._group_ids[:-1]).\
+                get_group_statistics()
+        except Exception as e:
+            logger.error('[DatasetHandler._get_parent_group_statistics] '
+                         'Failed to load group statistics: {}'.format(e))
+            return None
+
+        if (group_statistics is None or
+                not set(self._origin.columns).issubset(
+                    group_statistics.columns) or
+                len(self._origin.index) != group_statistics.get_count(
+                    [int(self._group_ids[-1])])):
+            return None
+        return group_statistics
+
+    def get_basic_statistics(self):
+        """
+        Get basic statistics of the origin (numeric) dataset (assembled from
+        stored group statistics if possible, quantiles are estimated then).
+
+        :return: Statistics per feature (in order of BasicStatistics
+            DESCRIPTION).
+        :rtype: list
+        """
+        group_statistics = self._get_parent_group_statistics()
+        if group_statistics is None:
+            return BasicStatistics().process_data(self._origin)
+
+        return group_statistics.get_basic_statistics(
+            group_ids=[int(self._group_ids[-1])],
+            columns=self._origin.columns.tolist())
+
+    def get_correlation(self):
+        """
+        Get correlation matrix of the origin (numeric) dataset (cached next
+        to the history data if the dataset was loaded from it; assembled
+        from stored group statistics if possible).
+
+        :return: Pearson correlation coefficients.
+        :rtype: pandas.DataFrame
+        """
+        history_store = None
+        if self._history_fingerprint is not None:
+            history_store = self._get_history_store()
+            try:
+                output = history_store.load_correlation(
+                    fingerprint=self._history_fingerprint)
+            except Exception as e:
+                output = None
+                logger.error('[DatasetHandler.get_correlation] '
+                             'Failed to load correlation matrix ({}): {}'.
+                             format(history_store.location, e))
+            if (output is not None and
+                    output.columns.tolist() == self._origin.columns.tolist()):
+                return output
+
+        group_statistics = self._get_parent_group_statistics()
+        if group_statistics is None:
+            output = get_correlation(self._origin)
+        else:
+            output = group_statistics.get_correlation(
+                group_ids=[int(self._group_ids[-1])],
+                columns=self._origin.columns.tolist())
+
+        if history_store is not None:
+            try:
+                history_store.save_correlation(
+                    correlation=output, fingerprint=self._history_fingerprint)
+            except Exception as e:
+                logger.error('[DatasetHandler.get_correlation] '
+                             'Failed to save correlation matrix ({}): {}'.
+                             format(history_store.location, e))
+        return output
+
+    def _get_normalized_statistics(self):
+        """
+        Get basic statistics of the normalized dataset from statistics of
+        the origin dataset (min-max scaling is a linear transformation).
 
-                f.write('{}\n'.format(
-                    json.dumps(self._property_set['features'])))
-                f.write('{}\n'.format(json.dumps(self._property_set['lod'])))
+        :return: Statistics per feature (or None if group statistics
+            are not available).
+        :rtype: list/None
+        """
+        group_statistics = self._get_parent_group_statistics()
+        if group_statistics is None:
+            return None
+
+        (count, min_values, max_values, mean, std, q25, q50, q75, sum_values,
+         skew, median) = group_statistics.get_basic_statistics(
+            group_ids=[int(self._group_ids[-1])],
+            columns=self._origin.columns.tolist())
+        data_range = (max_values - min_values).replace(0., 1.)
+        scale = 100. / data_range
+
+        def transform(x):
+            return (x - min_values) * scale
+
+        output = [count, transform(min_values), transform(max_values),
+                  transform(mean), std * scale, transform(q25),
+                  transform(q50), transform(q75),
+                  (sum_values - count * min_values) * scale, skew,
+                  transform(median)]
+        return [pd.Series(np.asarray(x, dtype=np.float64),
+                          index=self._normalized.columns) for x in output]
+
+    def _get_history_store(self):
+        """
+        Get history store (format is defined by settings).
+
+        :return: History store object.
+        :rtype: historystore.BaseHistoryStore
+        """
+        group_ids = self._group_ids or []
+        return get_history_store(
+            base_name=os.path.join(
+                self._get_full_dir_name(),
+                '{}{}'.format(self._did, ''.join(
+                    ['.group{}'.format(i) for i in group_ids]))),
+            storage_format=getattr(settings, 'HISTORY_STORAGE_FORMAT', None))
+
+    def _get_history_cache_key(self):
+        return self._did, tuple(self._group_ids or [])
 
-                f.write('{}'.format(self.operation_history.save_to_json()))
+    def _save_history_data(self):
+        """
+        Save modifications of the in initial dataset and corresponding data:
+        origin (numeric) dataset, normalized dataset, auxiliary data
+        (not numeric values), selected features, Level-of-Detail Generator
+        metadata and operations history (list of clustering operations).
+        """
+        history_store = self._get_history_store()
+        get_history_cache().invalidate(key=self._get_history_cache_key())
+        try:
+            history_store.save({
+                'origin': self._origin,
+                'normalized': self._normalized,
+                'auxiliary': self._auxiliary,
+                'features': self._property_set['features'],
+                'lod': self._property_set['lod'],
+                'op_history': self.operation_history.save_to_json()})
         except Exception as e:
             logger.error('[DatasetHandler._save_history_data] '
-                         'Failed to save data ({}): {}'.format(file_name, e))
+                         'Failed to save data ({}): {}'.format(
+                             history_store.location, e))
             raise
 
     def _load_history_data(self):
         """
-        Load dataset modifications and corresponding data from history file.
-
-        1st line - origin (numeric) dataset
-        2nd line - normalized dataset
-        3rd line - auxiliary data (not numeric values)
-        4th line - selected features
-        5th line - Level-of-Detail Generator metadata
-        6th line - operations history (list of clustering operations)
+        Load dataset modifications and corresponding data from history store
+        (dataset payload is taken from the history cache if it was not
+        changed, operations history is loaded separately).
         """
         err_msg_subj = '[DatasetHandler._load_history_data]'
 
-        file_name = self._get_full_file_name(is_history_file=True)
-        if not os.path.isfile(file_name):
-            logger.error('{} Failed to find the file ({})'
-                         .format(err_msg_subj, file_name))
+        history_store = self._get_history_store()
+        if not history_store.exists():
+            logger.error('{} Failed to find the history data ({})'
+                         .format(err_msg_subj, history_store.location))
+
+        history_cache = get_history_cache()
+        cache_key = self._get_history_cache_key()
+        fingerprint = history_store.fingerprint()
 
         try:
-            with open(file_name, 'r') as f:
-                self._origin = data_converters.table_to_df(f.readline())
-                self._modifications.update({
-                    'normalized': data_converters.table_to_df(f.readline()),
-                    'auxiliary': data_converters.table_to_df(f.readline())})
-
-                self._property_set.update({
-                    'features': json.loads(f.readline()),
-                    'lod': json.loads(f.readline())})
-
-                operation_history = OperationHistory()
-                operation_history.load_from_json(f.readline())
-                self._property_set['op_history'] = operation_history
+            data = history_cache.get(key=cache_key, fingerprint=fingerprint)
+            if data is None:
+                data = history_store.load_payload()
+                history_cache.put(key=cache_key, fingerprint=fingerprint,
+                                  data=data)
+
+            self._origin = data['origin']
+            self._modifications.update({
+                'normalized': data['normalized'],
+                'auxiliary': data['auxiliary']})
+            self._matrices = data.get('matrices') or {}
+
+            self._property_set.update({
+                'features': list(data['features']),
+                'lod': dict(data['lod'] or {})})
+
+            self._set_operation_history(history_store)
+            self._history_fingerprint = fingerprint
         except Exception as e:
             logger.error('{} Failed to load data ({}): {}'.
-                         format(err_msg_subj, file_name, e))
+                         format(err_msg_subj, history_store.location, e))
+            raise
+
+    def _set_operation_history(self, history_store):
+        """
+        Set operations history from the history store.
+
+        :param history_store: History store object.
+        :type history_store: historystore.BaseHistoryStore
+        """
+        operation_history = OperationHistory()
+        operation_history.load_from_json(history_store.load_operations())
+        self._property_set['op_history'] = operation_history
+
+    def load_operation_history(self):
+        """
+        Load operations history only (without dataset payload).
+        """
+        history_store = self._get_history_store()
+        try:
+            self._set_operation_history(history_store)
+        except Exception as e:
+            logger.error('[DatasetHandler.load_operation_history] '
+                         'Failed to load operations ({}): {}'.
+                         format(history_store.location, e))
+            raise
+
+    def get_history_fingerprint(self, with_operations=False):
+        """
+        Get fingerprint of the stored history data (to check whether the
+        data was changed, e.g., for HTTP caching).
+
+        :param with_operations: Flag to include operations history.
+        :type with_operations: bool
+        :return: Fingerprint of dataset payload [and operations history]
+            (None if there is no stored data).
+        :rtype: tuple/None
+        """
+        history_store = self._get_history_store()
+        output = history_store.fingerprint()
+        if output is not None and with_operations:
+            output += history_store.operations_fingerprint() or ()
+        return output
+
+    def append_operation(self, operation, dataset=None, camera=None):
+        """
+        Append operation to the operations history and save it (only the new
+        operation is written into the history store).
+
+        :param operation: Applied operation (with results).
+        :type operation: baseoperationclass.BaseOperationClass
+        :param dataset: Dataset that was used by the operation.
+        :type dataset: pandas.DataFrame/None
+        :param camera: Camera parameters.
+        :type camera: str/None
+        """
+        operation_history = self.operation_history
+        operation_history.append(dataset, operation, camera)
+
+        history_store = self._get_history_store()
+        try:
+            history_store.append_operation(
+                operation_history.operation_to_json())
+        except Exception as e:
+            logger.error('[DatasetHandler.append_operation] '
+                         'Failed to save operation ({}): {}'.format(
+                             history_store.location, e))
             raise
 
     def save(self):
@@ -4,14 +4,25 @@ Class GroupedDataHandler provides methods to deal with grouped data.
 
 import linecache
 import os
+import pickle
 
+import numpy as np
 import pandas as pd
 
 from .. import data_converters
+from ..groupstatistics import GroupStatistics
 
 from ._base import BaseDataHandler
 
 FILE_EXTENSION_DEFAULT = 'groups'
+LABELS_FILE_EXTENSION = 'labels.npy'
+OFFSETS_FILE_EXTENSION = 'offsets.npy'
+MEMBERS_FILE_EXTENSION = 'members.pkl'
+STATS_FILE_EXTENSION = 'stats.npz'
+
+STORAGE_MODE_EAGER = 'eager'  # all groups are stored into the groups file
+STORAGE_MODE_LAZY = 'lazy'  # groups are sliced from the dataset on demand
+STORAGE_MODE_DEFAULT = STORAGE_MODE_EAGER
 
 
 class GroupedDataHandler(BaseDataHandler):
@@ -56,7 +67,9 @@ class GroupedDataHandler(BaseDataHandler):
         """
         self._file_name = self._get_full_file_name(group_ids=group_ids)
 
-    def set_groups(self, dataset, groups_metadata, save_to_file=False):
+    def set_groups(self, dataset, groups_metadata, group_labels,
+                   save_to_file=False, storage_mode=None,
+                   group_statistics=None):
         """
         Create groups according to the initial dataset and groups metadata.
 
@@ -64,34 +77,221 @@ class GroupedDataHandler(BaseDataHandler):
         :type dataset: pandas.DataFrame
         :param groups_metadata: List of dicts per group.
         :type groups_metadata: list
+        :param group_labels: Group number per object of the dataset.
+        :type group_labels: numpy.ndarray
         :param save_to_file: Flag to store data groups into the file.
         :type save_to_file: bool
+        :param storage_mode: Groups storage mode (eager, lazy).
+        :type storage_mode: str/None
+        :param group_statistics: Statistics per group (stored with groups).
+        :type group_statistics: GroupStatistics/None
         """
+        storage_mode = storage_mode or STORAGE_MODE_DEFAULT
+        if storage_mode not in (STORAGE_MODE_EAGER, STORAGE_MODE_LAZY):
+            raise ValueError('Groups storage mode is unknown: {}'.format(
+                storage_mode))
+
         del self._groups[:]
-        for item in groups_metadata:
-            self._groups.append(pd.DataFrame(
-                dataset[dataset.index.isin(item['group_indexes'])]))
+        if storage_mode == STORAGE_MODE_EAGER or not save_to_file:
+            self._groups.extend(self.split_groups(
+                dataset=dataset,
+                group_labels=group_labels,
+                num_groups=len(groups_metadata)))
 
         if save_to_file:
+            offsets_file_name = self._get_offsets_file_name()
+            members_file_name = self._get_members_file_name()
+            # offsets are removed first, thus the index never refers
+            # to the outdated groups file
+            self._remove_file(file_name=offsets_file_name)
+            self._remove_file(file_name=members_file_name)
             self._remove_file(file_name=self._file_name)
-            with open(self._file_name, 'w') as f:
-                for group in self._groups:
-                    f.write('{}\n'.format(group.to_json(orient='table')))
+
+            if storage_mode == STORAGE_MODE_EAGER:
+                offsets = [0]
+                with open(self._file_name, 'wb') as f:
+                    for group in self._groups:
+                        f.write('{}\n'.format(
+                            group.to_json(orient='table')).encode('utf-8'))
+                        offsets.append(f.tell())
+                np.save(offsets_file_name, np.array(offsets, dtype=np.int64))
+
+            else:
+                with open(members_file_name, 'wb') as f:
+                    pickle.dump({'index': dataset.index,
+                                 'features': dataset.columns.tolist()}, f,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+
+            labels_file_name = self._get_labels_file_name()
+            self._remove_file(file_name=labels_file_name)
+            np.save(labels_file_name, group_labels)
+
+            stats_file_name = self._get_stats_file_name()
+            self._remove_file(file_name=stats_file_name)
+            if group_statistics is not None:
+                group_statistics.save(stats_file_name)
+
+    @staticmethod
+    def split_groups(dataset, group_labels, num_groups):
+        """
+        Split the dataset into groups by a single sort of group labels
+        (objects keep their original order within the group).
+
+        :param dataset: Initial dataset sample.
+        :type dataset: pandas.DataFrame
+        :param group_labels: Group number per object (-1 if not grouped).
+        :type group_labels: numpy.ndarray
+        :param num_groups: Number of groups.
+        :type num_groups: int
+        :return: List of groups.
+        :rtype: list
+        """
+        group_labels = np.asarray(group_labels)
+        order = np.argsort(group_labels, kind='mergesort')
+        bounds = np.searchsorted(group_labels[order],
+                                 np.arange(num_groups + 1))
+        return [dataset.iloc[order[bounds[i]:bounds[i + 1]]]
+                for i in range(num_groups)]
+
+    def _get_members_file_name(self):
+        """
+        Form full file name for the description of grouped objects
+        (index and features of the dataset) stored in the lazy mode.
+
+        :return: Full file name.
+        :rtype: str
+        """
+        return '{}.{}'.format(self._file_name, MEMBERS_FILE_EXTENSION)
+
+    def get_members(self):
+        """
+        Get the description of grouped objects if groups are stored
+        in the lazy mode.
+
+        :return: Index and features of the grouped dataset (or None).
+        :rtype: dict/None
+        """
+        members_file_name = self._get_members_file_name()
+        if not os.path.isfile(members_file_name):
+            return None
+
+        with open(members_file_name, 'rb') as f:
+            return pickle.load(f)
+
+    def _get_offsets_file_name(self):
+        """
+        Form full file name for byte offsets of groups in the groups file.
+
+        :return: Full file name.
+        :rtype: str
+        """
+        return '{}.{}'.format(self._file_name, OFFSETS_FILE_EXTENSION)
+
+    def _get_labels_file_name(self):
+        """
+        Form full file name for group labels (group number per object).
+
+        :return: Full file name.
+        :rtype: str
+        """
+        return '{}.{}'.format(self._file_name, LABELS_FILE_EXTENSION)
+
+    def get_group_labels(self):
+        """
+        Get group number per object of the initial dataset (-1 if the object
+        is not grouped).
+
+        :return: Group labels.
+        :rtype: numpy.ndarray
+        """
+        return np.load(self._get_labels_file_name(), mmap_mode='r')
+
+    def _get_stats_file_name(self):
+        """
+        Form full file name for statistics per group.
+
+        :return: Full file name.
+        :rtype: str
+        """
+        return '{}.{}'.format(self._file_name, STATS_FILE_EXTENSION)
+
+    def get_group_statistics(self):
+        """
+        Get statistics of numeric features per group (if they were stored).
+
+        :return: Group statistics (or None).
+        :rtype: GroupStatistics/None
+        """
+        stats_file_name = self._get_stats_file_name()
+        if not os.path.isfile(stats_file_name):
+            return None
+        return GroupStatistics.load(stats_file_name)
+
+    @staticmethod
+    def get_member_positions(dataset, index):
+        """
+        Get positions of grouped objects in the dataset (the dataset is the
+        grouped one or contains it, e.g., before rows with NaN were dropped).
+
+        :param dataset: Dataset the groups were formed from.
+        :type dataset: pandas.DataFrame
+        :param index: Index of grouped objects.
+        :type index: pandas.Index
+        :return: Position per grouped object.
+        :rtype: numpy.ndarray
+        """
+        if dataset.index.equals(index):
+            return np.arange(len(index))
+
+        if not dataset.index.is_unique:
+            raise ValueError('Grouped objects can not be located in the '
+                             'dataset with duplicated index values')
+        output = dataset.index.get_indexer(index)
+        if (output < 0).any():
+            raise ValueError('Grouped objects are missing in the dataset')
+        return output
 
     # TODO: Check the correctness of group_id and corresponding extracted data.
-    def get_group(self, group_id):
+    def get_group(self, group_id, dataset=None):
         """
         Get the group according to the provided id.
 
         :param group_id: Group id (order number or line number in file).
         :type group_id: int
+        :param dataset: Dataset the groups were formed from
+            (required if groups are stored in the lazy mode).
+        :type dataset: pandas.DataFrame/None
         :return: Group of data objects from the original dataset sample.
         :rtype: pandas.DataFrame
         """
         if self._groups:
             output = self._groups[group_id]
+        elif os.path.isfile(self._get_offsets_file_name()):
+            offsets = np.load(self._get_offsets_file_name(), mmap_mode='r')
+            start, end = int(offsets[group_id]), int(offsets[group_id + 1])
+            with open(self._file_name, 'rb') as f:
+                f.seek(start)
+                output = data_converters.table_to_df(
+                    f.read(end - start).decode('utf-8'))
         else:
-            output = data_converters.table_to_df(
-                linecache.getline(self._file_name, group_id + 1))
+            members = self.get_members()
+            if members is not None:
+                if dataset is None:
+                    raise ValueError('Dataset is required to get the group '
+                                     '(groups are stored in the lazy mode)')
+                positions = self.get_member_positions(
+                    dataset=dataset, index=members['index'])
+                feature_positions = dataset.columns.get_indexer(
+                    members['features'])
+                if (feature_positions < 0).any():
+                    raise ValueError('Grouped features are missing in the '
+                                     'dataset')
+                output = dataset.iloc[
+                    positions[self.get_group_labels() == group_id],
+                    feature_positions]
+            else:
+                # groups file without the index (stored by previous versions)
+                output = data_converters.table_to_df(
+                    linecache.getline(self._file_name, group_id + 1))
 
         return output
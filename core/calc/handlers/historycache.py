@@ -0,0 +1,203 @@
+"""
+Class HistoryCache provides per-process LRU cache of loaded history data
+(bounded by the estimated size of cached data in bytes).
+
+Cached data is shared by requests: every request gets shallow copies of
+cached DataFrames (thus dropped rows, added or removed columns do not affect
+the cache), but values are not copied and must not be modified in place
+(memory-mapped values are read-only).
+"""
+
+import logging
+import sys
+import threading
+
+from collections import OrderedDict
+
+import pandas as pd
+
+from django.conf import settings
+
+CACHE_MAX_BYTES_DEFAULT = 256 * 1024 * 1024
+
+_history_cache = None
+_history_cache_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def get_data_size(data):
+    """
+    Estimate the size of history data in memory.
+
+    :param data: History data (see historystore.BaseHistoryStore.load).
+    :type data: dict
+    :return: Size in bytes.
+    :rtype: int
+    """
+    output = 0
+    for value in data.values():
+        if isinstance(value, pd.DataFrame):
+            output += int(value.memory_usage(index=True, deep=True).sum())
+        elif isinstance(value, str):
+            output += sys.getsizeof(value)
+    return output
+
+
+def get_data_copy(data):
+    """
+    Get shallow copy of history data (DataFrames and dicts are new objects,
+    values of DataFrames are shared).
+
+    :param data: History data (see historystore.BaseHistoryStore.load).
+    :type data: dict
+    :return: Copy of history data.
+    :rtype: dict
+    """
+    output = {}
+    for key, value in data.items():
+        if isinstance(value, pd.DataFrame):
+            value = value.copy(deep=False)
+        elif isinstance(value, dict):
+            value = get_data_copy(value)
+        output[key] = value
+    return output
+
+
+class HistoryCache:
+
+    def __init__(self, max_bytes=None):
+        """
+        Initialization.
+
+        :param max_bytes: Maximum size of cached data in bytes (0 - disabled).
+        :type max_bytes: int/None
+        """
+        self.max_bytes = (CACHE_MAX_BYTES_DEFAULT if max_bytes is None
+                          else max_bytes)
+
+        self._items = OrderedDict()  # key: (fingerprint, data, size)
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, fingerprint):
+        """
+        Get cached data if it corresponds to the provided fingerprint.
+
+        :param key: Cache key (dataset sample id, group ids).
+        :type key: tuple
+        :param fingerprint: Fingerprint of stored data (e.g., mtime and size).
+        :type fingerprint: tuple/None
+        :return: Copy of cached data (see get_data_copy) or None.
+        :rtype: dict/None
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] != fingerprint:
+                self._pop(key)
+                item = None
+
+            if item is None:
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            data = item[1]
+        return get_data_copy(data)
+
+    def put(self, key, fingerprint, data):
+        """
+        Add data to the cache (least recently used items are evicted).
+
+        :param key: Cache key (dataset sample id, group ids).
+        :type key: tuple
+        :param fingerprint: Fingerprint of stored data (e.g., mtime and size).
+        :type fingerprint: tuple/None
+        :param data: History data (it is copied, see get_data_copy).
+        :type data: dict
+        """
+        if fingerprint is None:
+            return
+
+        data = get_data_copy(data)
+
+        size = get_data_size(data)
+        num_evicted = 0
+        with self._lock:
+            self._pop(key)
+            is_cached = size <= self.max_bytes
+            if is_cached:
+                while self._items and self._size + size > self.max_bytes:
+                    self._pop(next(iter(self._items)))
+                    self.evictions += 1
+                    num_evicted += 1
+
+                self._items[key] = (fingerprint, data, size)
+                self._size += size
+
+        if not is_cached or num_evicted:
+            logger.debug('[HistoryCache.put] {} ({} bytes), stats: {}'.format(
+                'Data is not cached' if not is_cached
+                else '{} item(s) evicted'.format(num_evicted),
+                size, self.get_stats()))
+
+    def invalidate(self, key):
+        """
+        Remove cached data by the key.
+
+        :param key: Cache key (dataset sample id, group ids).
+        :type key: tuple
+        """
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        """
+        Remove all cached data (counters are not reset).
+        """
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def _pop(self, key):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._size -= item[2]
+
+    def get_stats(self):
+        """
+        Get cache counters.
+
+        :return: Number of hits, misses, evictions, entries and cached bytes.
+        :rtype: dict
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'entries': len(self._items),
+                    'size': self._size,
+                    'max_size': self.max_bytes}
+
+
+def get_history_cache():
+    """
+    Get history cache of the current process (size is defined by settings).
+
+    :return: History cache object.
+    :rtype: HistoryCache
+    """
+    global _history_cache
+
+    if _history_cache is None:
+        with _history_cache_lock:
+            if _history_cache is None:
+                _history_cache = HistoryCache(
+                    max_bytes=getattr(settings, 'HISTORY_CACHE_MAX_BYTES',
+                                      None))
+    return _history_cache
@@ -0,0 +1,563 @@
+"""
+History stores keep the processed dataset sample (origin, normalized and
+auxiliary data) together with selected features, Level-of-Detail metadata
+and the operations history (the correlation matrix of the origin dataset is
+cached next to the history data).
+
+Available storage formats:
+- json - legacy six-line `.history` file (DataFrames in "table" JSON format);
+- binary - directory with numeric matrices in `.npy` format (float64,
+  loaded as memory-mapped arrays, thus processes that serve the same
+  dataset sample share one page-cached copy; numeric datasets that can not
+  be represented as float64 without losing precision, e.g., int64 values
+  above 2**53, are kept in pickle format), auxiliary data and index
+  in pickle format, a small JSON manifest, and the append-only log of
+  operations (thus a new operation is saved without rewriting the dataset).
+"""
+
+import json
+import logging
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .. import data_converters
+
+from ._base import BaseDataHandler
+
+STORAGE_FORMAT_JSON = 'json'
+STORAGE_FORMAT_BINARY = 'binary'
+STORAGE_FORMAT_DEFAULT = STORAGE_FORMAT_BINARY
+
+HISTORY_FILE_EXTENSION = 'history'
+HISTORY_DIR_EXTENSION = 'historydata'
+
+MANIFEST_FILE_NAME = 'manifest.json'
+INDEX_FILE_NAME = 'index.pkl'
+AUXILIARY_FILE_NAME = 'auxiliary.pkl'
+OPERATIONS_FILE_NAME = 'operations.log'
+CORRELATION_FILE_EXTENSION = 'corr.npz'
+CORRELATION_FILE_NAME = 'correlation.npz'
+NUMERIC_FRAMES = ('origin', 'normalized')
+BINARY_FORMAT_VERSION = 3
+
+logger = logging.getLogger(__name__)
+
+
+class BaseHistoryStore:
+
+    storage_format = None
+
+    def __init__(self, base_name):
+        """
+        Initialization.
+
+        :param base_name: Full file name/path without extension.
+        :type base_name: str
+        """
+        self._base_name = base_name
+
+    @property
+    def location(self):
+        """
+        Full name/path of the storage (file or directory).
+
+        :return: Full name/path.
+        :rtype: str
+        """
+        raise NotImplementedError
+
+    def exists(self):
+        """
+        Check whether the history data was saved.
+
+        :return: Flag that the storage exists.
+        :rtype: bool
+        """
+        raise NotImplementedError
+
+    def fingerprint(self):
+        """
+        Get fingerprint of stored dataset payload (changed with every save).
+
+        :return: Modification time (ns) and size of the data file or None.
+        :rtype: tuple/None
+        """
+        raise NotImplementedError
+
+    def operations_fingerprint(self):
+        """
+        Get fingerprint of stored operations history (changed with every
+        save and every appended operation).
+
+        :return: Modification time (ns) and size of the operations file or None.
+        :rtype: tuple/None
+        """
+        return self.fingerprint()
+
+    _get_file_fingerprint = staticmethod(
+        BaseDataHandler._get_file_fingerprint)
+
+    def save(self, data):
+        """
+        Save history data.
+
+        :param data: History data (origin, normalized, auxiliary, features,
+            lod, op_history - operations history in JSON format).
+        :type data: dict
+        """
+        raise NotImplementedError
+
+    def load_payload(self):
+        """
+        Load dataset payload (history data without operations history).
+
+        :return: History data (keys are the same as for the save method
+            except op_history, and optional "matrices" - numeric matrices
+            of origin and normalized datasets).
+        :rtype: dict
+        """
+        raise NotImplementedError
+
+    def load_operations(self):
+        """
+        Load operations history.
+
+        :return: Operations history in JSON format.
+        :rtype: str
+        """
+        raise NotImplementedError
+
+    def load(self):
+        """
+        Load history data.
+
+        :return: History data (see save and load_payload methods).
+        :rtype: dict
+        """
+        output = self.load_payload()
+        output['op_history'] = self.load_operations()
+        return output
+
+    def append_operation(self, operation_data):
+        """
+        Append a new operation to the operations history.
+
+        :param operation_data: Operation description in JSON format
+            (see operationshistory.OperationHistory.operation_to_json).
+        :type operation_data: str
+        """
+        data = self.load()
+        list_of_operations = json.loads(data['op_history'])
+        list_of_operations.append(json.loads(operation_data))
+        data['op_history'] = json.dumps(list_of_operations)
+        self.save(data)
+
+    @property
+    def _correlation_file_name(self):
+        return '{}.{}'.format(self._base_name, CORRELATION_FILE_EXTENSION)
+
+    def save_correlation(self, correlation, fingerprint):
+        """
+        Save correlation matrix of the origin dataset (cached data).
+
+        :param correlation: Correlation matrix.
+        :type correlation: pandas.DataFrame
+        :param fingerprint: Fingerprint of the dataset payload that the
+            matrix was calculated for.
+        :type fingerprint: tuple
+        """
+        tmp_file_name = '{}.tmp'.format(self._correlation_file_name)
+        with open(tmp_file_name, 'wb') as f:
+            np.savez(f,
+                     values=np.asarray(correlation.values, dtype=np.float64),
+                     columns=np.array(json.dumps(
+                         correlation.columns.tolist())),
+                     fingerprint=np.array(fingerprint, dtype=np.int64))
+        os.replace(tmp_file_name, self._correlation_file_name)
+
+    def load_correlation(self, fingerprint):
+        """
+        Load cached correlation matrix of the origin dataset.
+
+        :param fingerprint: Fingerprint of the current dataset payload.
+        :type fingerprint: tuple
+        :return: Correlation matrix (None if it was not saved or was
+            calculated for another dataset payload).
+        :rtype: pandas.DataFrame/None
+        """
+        if (fingerprint is None or
+                not os.path.isfile(self._correlation_file_name)):
+            return None
+
+        with np.load(self._correlation_file_name) as data:
+            if tuple(data['fingerprint'].tolist()) != tuple(fingerprint):
+                return None
+            columns = json.loads(str(data['columns']))
+            return pd.DataFrame(data['values'], index=columns,
+                                columns=columns)
+
+    def remove(self):
+        """
+        Remove stored history data.
+        """
+        raise NotImplementedError
+
+
+class JSONHistoryStore(BaseHistoryStore):
+
+    """
+    Legacy history file format.
+
+    1st line - origin (numeric) dataset
+    2nd line - normalized dataset
+    3rd line - auxiliary data (not numeric values)
+    4th line - selected features
+    5th line - Level-of-Detail Generator metadata
+    6th line - operations history (list of clustering operations)
+    """
+
+    storage_format = STORAGE_FORMAT_JSON
+
+    @property
+    def location(self):
+        return '{}.{}'.format(self._base_name, HISTORY_FILE_EXTENSION)
+
+    def exists(self):
+        return os.path.isfile(self.location)
+
+    def fingerprint(self):
+        return self._get_file_fingerprint(self.location)
+
+    def save(self, data):
+        self.remove()
+        with open(self.location, 'w') as f:
+            f.write('{}\n'.format(data['origin'].to_json(orient='table')))
+            f.write('{}\n'.format(data['normalized'].to_json(orient='table')))
+            f.write('{}\n'.format(data['auxiliary'].to_json(orient='table')))
+            f.write('{}\n'.format(json.dumps(data['features'])))
+            f.write('{}\n'.format(json.dumps(data['lod'])))
+            f.write('{}'.format(data['op_history']))
+
+    def load_payload(self):
+        with open(self.location, 'r') as f:
+            return {
+                'origin': data_converters.table_to_df(f.readline()),
+                'normalized': data_converters.table_to_df(f.readline()),
+                'auxiliary': data_converters.table_to_df(f.readline()),
+                'features': json.loads(f.readline()),
+                'lod': json.loads(f.readline())}
+
+    def load_operations(self):
+        with open(self.location, 'r') as f:
+            for _ in range(5):
+                f.readline()
+            return f.readline()
+
+    def remove(self):
+        BaseDataHandler._remove_file(file_name=self.location)
+        BaseDataHandler._remove_file(file_name=self._correlation_file_name)
+
+
+class BinaryHistoryStore(BaseHistoryStore):
+
+    """
+    Binary history format (directory with the following files).
+
+    manifest.json - columns and dtypes of numeric datasets, selected
+                    features and Level-of-Detail Generator metadata
+                    (written last, marks dataset payload as saved)
+    index.pkl - index of datasets (shared by all datasets)
+    origin.npy - origin (numeric) dataset values (float64 matrix)
+                 or origin.pkl - origin dataset with its original dtypes
+                 (if values are not represented by float64 exactly)
+    normalized.npy - normalized dataset values (float64 matrix)
+                     or normalized.pkl (see origin.pkl)
+    auxiliary.pkl - auxiliary data (not numeric values)
+    operations.log - operations history (one operation in JSON format
+                     per line, new operations are appended)
+    correlation.npz - cached correlation matrix of the origin dataset
+    """
+
+    storage_format = STORAGE_FORMAT_BINARY
+
+    @property
+    def location(self):
+        return '{}.{}'.format(self._base_name, HISTORY_DIR_EXTENSION)
+
+    def _get_full_file_name(self, file_name):
+        return os.path.join(self.location, file_name)
+
+    @property
+    def _correlation_file_name(self):
+        return self._get_full_file_name(CORRELATION_FILE_NAME)
+
+    def exists(self):
+        return os.path.isfile(self._get_full_file_name(MANIFEST_FILE_NAME))
+
+    def fingerprint(self):
+        return self._get_file_fingerprint(
+            self._get_full_file_name(MANIFEST_FILE_NAME))
+
+    def operations_fingerprint(self):
+        file_name = self._get_full_file_name(OPERATIONS_FILE_NAME)
+        if not os.path.isfile(file_name):
+            # operations history is kept in the manifest (format version 1)
+            return self.fingerprint()
+        return self._get_file_fingerprint(file_name)
+
+    def _write_file(self, file_name, write_func):
+        """
+        Write the file through a temporary one (to replace it atomically).
+
+        :param file_name: File name (inside the storage directory).
+        :type file_name: str
+        :param write_func: Function that writes data into the provided file.
+        :type write_func: callable
+        """
+        full_file_name = self._get_full_file_name(file_name)
+        tmp_file_name = '{}.tmp'.format(full_file_name)
+        with open(tmp_file_name, 'wb') as f:
+            write_func(f)
+        os.replace(tmp_file_name, full_file_name)
+
+    def save(self, data):
+        os.makedirs(self.location, exist_ok=True)
+
+        manifest = {'version': BINARY_FORMAT_VERSION, 'frames': {}}
+        for name in NUMERIC_FRAMES:
+            frame = data[name]
+            values = np.ascontiguousarray(frame.values, dtype=np.float64)
+            if self._is_float64_exact(frame, values):
+                file_name, other_file_name = (
+                    '{}.npy'.format(name), '{}.pkl'.format(name))
+                self._write_file(file_name, lambda f: np.save(f, values))
+            else:
+                file_name, other_file_name = (
+                    '{}.pkl'.format(name), '{}.npy'.format(name))
+                self._write_file(file_name, lambda f: pickle.dump(frame, f))
+            BaseDataHandler._remove_file(
+                file_name=self._get_full_file_name(other_file_name))
+            manifest['frames'][name] = {
+                'file': file_name,
+                'columns': frame.columns.tolist(),
+                'dtypes': [dtype.name for dtype in frame.dtypes]}
+
+        self._write_file(INDEX_FILE_NAME,
+                         lambda f: pickle.dump(data['origin'].index, f))
+        self._write_file(AUXILIARY_FILE_NAME,
+                         lambda f: pickle.dump(data['auxiliary'], f))
+
+        self._write_file(OPERATIONS_FILE_NAME, lambda f: f.write(''.join(
+            '{}\n'.format(json.dumps(item))
+            for item in json.loads(data['op_history'])).encode()))
+
+        manifest.update({'features': data['features'],
+                         'lod': data['lod']})
+        self._write_file(MANIFEST_FILE_NAME,
+                         lambda f: f.write(json.dumps(manifest).encode()))
+
+    @staticmethod
+    def _is_float64_exact(frame, values):
+        """
+        Check that float64 values represent the dataset without losing
+        precision (e.g., int64 values above 2**53 are rounded).
+
+        :param frame: Numeric dataset.
+        :type frame: pandas.DataFrame
+        :param values: Dataset values converted into float64.
+        :type values: numpy.ndarray
+        :return: Flag that original values are restored from float64 ones.
+        :rtype: bool
+        """
+        for i, dtype in enumerate(frame.dtypes):
+            if dtype.kind == 'f':
+                continue
+            if not np.array_equal(values[:, i].astype(dtype),
+                                  frame.iloc[:, i].values):
+                return False
+        return True
+
+    @staticmethod
+    def _is_matrix(description):
+        return description['file'].endswith('.npy')
+
+    def _read_matrix(self, description):
+        """
+        Read numeric matrix as a memory-mapped (read-only) array.
+
+        :param description: Description of the dataset from the manifest.
+        :type description: dict
+        :return: Matrix of dataset values.
+        :rtype: numpy.memmap
+        """
+        return np.load(self._get_full_file_name(description['file']),
+                       mmap_mode='r')
+
+    @staticmethod
+    def _get_numeric_frame(matrix, description, index):
+        """
+        Form numeric dataset over the matrix (no copy if all dtypes are
+        float64, otherwise columns are converted into original dtypes).
+
+        :param matrix: Matrix of dataset values.
+        :type matrix: numpy.ndarray
+        :param description: Description of the dataset from the manifest.
+        :type description: dict
+        :param index: Index of the dataset.
+        :type index: pandas.Index
+        :return: Numeric dataset.
+        :rtype: pandas.DataFrame
+        """
+        output = pd.DataFrame(matrix, index=index,
+                              columns=description['columns'], copy=False)
+
+        dtypes = {c: t for c, t in zip(description['columns'],
+                                       description['dtypes'])
+                  if output[c].dtype.name != t}
+        if dtypes:
+            output = output.astype(dtypes)
+        return output
+
+    def _read_manifest(self):
+        with open(self._get_full_file_name(MANIFEST_FILE_NAME), 'r') as f:
+            return json.loads(f.read())
+
+    def load_payload(self):
+        manifest = self._read_manifest()
+        index = pd.read_pickle(self._get_full_file_name(INDEX_FILE_NAME))
+
+        matrices, output = {}, {}
+        for name in NUMERIC_FRAMES:
+            description = manifest['frames'][name]
+            if self._is_matrix(description):
+                matrices[name] = self._read_matrix(description)
+                output[name] = self._get_numeric_frame(
+                    matrices[name], description, index)
+            else:
+                output[name] = pd.read_pickle(
+                    self._get_full_file_name(description['file']))
+
+        output.update({
+            'matrices': matrices,
+            'auxiliary': pd.read_pickle(
+                self._get_full_file_name(AUXILIARY_FILE_NAME)),
+            'features': manifest['features'],
+            'lod': manifest['lod']})
+        return output
+
+    def load_operations(self):
+        file_name = self._get_full_file_name(OPERATIONS_FILE_NAME)
+        if not os.path.isfile(file_name):
+            # operations history was kept in the manifest (format version 1)
+            return self._read_manifest().get('op_history') or '[]'
+
+        with open(file_name, 'rb') as f:
+            lines = f.read().split(b'\n')
+
+        # the last item is either empty or an incomplete (not saved) record
+        list_of_operations = []
+        for line in lines[:-1]:
+            try:
+                list_of_operations.append(json.loads(line.decode()))
+            except ValueError:
+                logger.warning('[BinaryHistoryStore.load_operations] '
+                               'Incomplete operation record is skipped ({})'.
+                               format(file_name))
+        return json.dumps(list_of_operations)
+
+    def append_operation(self, operation_data):
+        file_name = self._get_full_file_name(OPERATIONS_FILE_NAME)
+        if not os.path.isfile(file_name):
+            super().append_operation(operation_data)
+            return
+
+        record = '{}\n'.format(operation_data).encode()
+
+        fd = os.open(file_name, os.O_WRONLY | os.O_APPEND)
+        try:
+            # separate the previous incomplete record (if any)
+            if os.fstat(fd).st_size:
+                with open(file_name, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        record = b'\n' + record
+
+            # the record is appended as a whole (concurrent records are not
+            # interleaved, since the file is opened in the append mode)
+            view = memoryview(record)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def remove(self):
+        # manifest is removed first, thus partially removed data is not valid
+        for file_name in ([MANIFEST_FILE_NAME, INDEX_FILE_NAME,
+                           AUXILIARY_FILE_NAME, OPERATIONS_FILE_NAME,
+                           CORRELATION_FILE_NAME] +
+                          ['{}.{}'.format(name, extension)
+                           for name in NUMERIC_FRAMES
+                           for extension in ('npy', 'pkl')]):
+            BaseDataHandler._remove_file(
+                file_name=self._get_full_file_name(file_name))
+        try:
+            os.rmdir(self.location)
+        except OSError:
+            pass
+
+
+HISTORY_STORE_BY_FORMAT = {
+    STORAGE_FORMAT_JSON: JSONHistoryStore,
+    STORAGE_FORMAT_BINARY: BinaryHistoryStore
+}
+
+
+def get_history_store(base_name, storage_format=None):
+    """
+    Get history store of the requested format (and migrate history data
+    from the legacy format if it is needed).
+
+    :param base_name: Full file name/path without extension.
+    :type base_name: str
+    :param storage_format: Storage format (default: binary).
+    :type storage_format: str/None
+    :return: History store object.
+    :rtype: BaseHistoryStore
+    """
+    storage_format = storage_format or STORAGE_FORMAT_DEFAULT
+    if storage_format not in HISTORY_STORE_BY_FORMAT:
+        raise ValueError('Unknown history storage format', storage_format)
+
+    output = HISTORY_STORE_BY_FORMAT[storage_format](base_name=base_name)
+
+    if storage_format != STORAGE_FORMAT_JSON and not output.exists():
+        legacy_store = JSONHistoryStore(base_name=base_name)
+        if legacy_store.exists():
+            migrate_history_store(source=legacy_store, target=output)
+
+    return output
+
+
+def migrate_history_store(source, target):
+    """
+    Copy history data from one store into another and remove the source.
+
+    :param source: History store with data.
+    :type source: BaseHistoryStore
+    :param target: History store to write data into.
+    :type target: BaseHistoryStore
+    """
+    try:
+        target.save(source.load())
+    except Exception as e:
+        logger.error('[historystore.migrate_history_store] Failed to migrate '
+                     'history data ({} -> {}): {}'.format(
+                         source.location, target.location, e))
+        target.remove()
+        raise
+    else:
+        source.remove()
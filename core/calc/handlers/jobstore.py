@@ -0,0 +1,362 @@
+"""
+Class JobStore keeps background jobs (e.g., clustering requests) in the
+SQLite table, thus jobs are shared by processes of the service and are not
+lost if the process is restarted (queued jobs are taken by any worker,
+jobs of terminated workers are re-queued, jobs can be cancelled).
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from contextlib import closing
+
+from django.conf import settings
+
+JOB_STATUS_QUEUED = 'queued'
+JOB_STATUS_RUNNING = 'running'
+JOB_STATUS_DONE = 'done'
+JOB_STATUS_FAILED = 'failed'
+JOB_STATUS_CANCELLING = 'cancelling'  # running job that is requested to stop
+JOB_STATUS_CANCELLED = 'cancelled'
+JOB_FINAL_STATUSES = (JOB_STATUS_DONE, JOB_STATUS_FAILED,
+                      JOB_STATUS_CANCELLED)
+
+DB_FILE_NAME_DEFAULT = 'jobs.sqlite3'
+DB_TIMEOUT = 30.  # seconds to wait for the lock of the database
+
+_job_store = None
+_job_store_lock = threading.Lock()
+
+
+def get_worker_id():
+    """
+    Get id of the current worker process (host name and process id).
+
+    :return: Worker id.
+    :rtype: str
+    """
+    return '{}:{}'.format(socket.gethostname(), os.getpid())
+
+
+def is_worker_alive(worker_id):
+    """
+    Check whether the worker process is running (on the current host only,
+    workers of other hosts are considered alive).
+
+    :param worker_id: Worker id (see get_worker_id).
+    :type worker_id: str
+    :return: Flag that the worker is alive.
+    :rtype: bool
+    """
+    host_name, _, pid = (worker_id or '').rpartition(':')
+    if host_name != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (ValueError, OSError):
+        pass
+    return True
+
+
+class JobStore:
+
+    def __init__(self, file_name):
+        """
+        Initialization.
+
+        :param file_name: Full name of the database file.
+        :type file_name: str
+        """
+        self.file_name = file_name
+
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    parameters TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    worker TEXT,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL)""")
+            connection.execute("""
+                CREATE INDEX IF NOT EXISTS jobs_status
+                ON jobs (status, created)""")
+
+    def _connect(self):
+        # connection in the autocommit mode (transactions are explicit)
+        connection = sqlite3.connect(self.file_name, timeout=DB_TIMEOUT,
+                                     isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return closing(connection)
+
+    @staticmethod
+    def _to_dict(row):
+        """
+        Convert the table row into the job description.
+
+        :param row: Table row.
+        :type row: sqlite3.Row
+        :return: Job description.
+        :rtype: dict
+        """
+        output = dict(row)
+        output['parameters'] = json.loads(output['parameters'])
+        if output['result'] is not None:
+            output['result'] = json.loads(output['result'])
+        return output
+
+    def create(self, kind, parameters):
+        """
+        Add a new job into the queue.
+
+        :param kind: Kind of the job (defines the function that runs it).
+        :type kind: str
+        :param parameters: Job parameters (JSON serializable).
+        :type parameters: dict
+        :return: Job id.
+        :rtype: str
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT INTO jobs (id, kind, parameters, status, created, '
+                'updated) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, kind, json.dumps(parameters), JOB_STATUS_QUEUED,
+                 now, now))
+        return job_id
+
+    def get(self, job_id):
+        """
+        Get the job description.
+
+        :param job_id: Job id.
+        :type job_id: str
+        :return: Job description (None if the job is not found).
+        :rtype: dict/None
+        """
+        with self._connect() as connection:
+            row = connection.execute('SELECT * FROM jobs WHERE id = ?',
+                                     (job_id,)).fetchone()
+        return None if row is None else self._to_dict(row)
+
+    def claim(self, worker_id):
+        """
+        Take the oldest queued job (the job is marked as running by the
+        worker within the same transaction).
+
+        :param worker_id: Worker id.
+        :type worker_id: str
+        :return: Job description (None if there are no queued jobs).
+        :rtype: dict/None
+        """
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = connection.execute(
+                    'SELECT * FROM jobs WHERE status = ? '
+                    'ORDER BY created LIMIT 1',
+                    (JOB_STATUS_QUEUED,)).fetchone()
+                if row is not None:
+                    connection.execute(
+                        'UPDATE jobs SET status = ?, worker = ?, '
+                        'updated = ? WHERE id = ?',
+                        (JOB_STATUS_RUNNING, worker_id, time.time(),
+                         row['id']))
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+
+        if row is None:
+            return None
+        output = self._to_dict(row)
+        output.update({'status': JOB_STATUS_RUNNING, 'worker': worker_id})
+        return output
+
+    def set_progress(self, job_id, progress, message=None):
+        """
+        Update progress of the running job.
+
+        :param job_id: Job id.
+        :type job_id: str
+        :param progress: Progress value (between 0 and 1).
+        :type progress: float
+        :param message: Description of the current stage.
+        :type message: str/None
+        """
+        with self._connect() as connection:
+            connection.execute(
+                'UPDATE jobs SET progress = ?, message = ?, updated = ? '
+                'WHERE id = ? AND status = ?',
+                (float(progress), message, time.time(), job_id,
+                 JOB_STATUS_RUNNING))
+
+    def finish(self, job_id, result=None):
+        """
+        Mark the running job as successfully done (job that was requested
+        to stop is marked as cancelled).
+
+        :param job_id: Job id.
+        :type job_id: str
+        :param result: Job result (JSON serializable).
+        :type result: dict/None
+        """
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.execute(
+                    'UPDATE jobs SET status = ?, progress = 1, '
+                    'message = NULL, result = ?, updated = ? '
+                    'WHERE id = ? AND status = ?',
+                    (JOB_STATUS_DONE, json.dumps(result), time.time(),
+                     job_id, JOB_STATUS_RUNNING))
+                connection.execute(
+                    'UPDATE jobs SET status = ?, message = NULL, '
+                    'updated = ? WHERE id = ? AND status = ?',
+                    (JOB_STATUS_CANCELLED, time.time(), job_id,
+                     JOB_STATUS_CANCELLING))
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+
+    def fail(self, job_id, error):
+        """
+        Mark the job as failed.
+
+        :param job_id: Job id.
+        :type job_id: str
+        :param error: Error description.
+        :type error: str
+        """
+        with self._connect() as connection:
+            connection.execute(
+                'UPDATE jobs SET status = ?, error = ?, updated = ? '
+                'WHERE id = ?',
+                (JOB_STATUS_FAILED, error, time.time(), job_id))
+
+    def cancel(self, job_id):
+        """
+        Cancel the job: queued job is cancelled at once, running job is
+        marked to be stopped by its worker.
+
+        :param job_id: Job id.
+        :type job_id: str
+        """
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                for status, new_status in (
+                        (JOB_STATUS_QUEUED, JOB_STATUS_CANCELLED),
+                        (JOB_STATUS_RUNNING, JOB_STATUS_CANCELLING)):
+                    connection.execute(
+                        'UPDATE jobs SET status = ?, updated = ? '
+                        'WHERE id = ? AND status = ?',
+                        (new_status, time.time(), job_id, status))
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+
+    def is_cancelling(self, job_id):
+        """
+        Check whether the running job is requested to stop.
+
+        :param job_id: Job id.
+        :type job_id: str
+        :return: Flag that the job is to be stopped.
+        :rtype: bool
+        """
+        with self._connect() as connection:
+            row = connection.execute('SELECT status FROM jobs WHERE id = ?',
+                                     (job_id,)).fetchone()
+        return row is not None and row['status'] == JOB_STATUS_CANCELLING
+
+    def set_cancelled(self, job_id):
+        """
+        Mark the job as cancelled (after its worker stopped it).
+
+        :param job_id: Job id.
+        :type job_id: str
+        """
+        with self._connect() as connection:
+            connection.execute(
+                'UPDATE jobs SET status = ?, message = NULL, updated = ? '
+                'WHERE id = ?',
+                (JOB_STATUS_CANCELLED, time.time(), job_id))
+
+    def requeue_orphaned(self):
+        """
+        Return running jobs of terminated workers (of the current host)
+        into the queue (jobs that were requested to stop are cancelled).
+
+        :return: Number of re-queued jobs.
+        :rtype: int
+        """
+        output = 0
+        with self._connect() as connection:
+            rows = connection.execute(
+                'SELECT id, status, worker FROM jobs WHERE status IN (?, ?)',
+                (JOB_STATUS_RUNNING, JOB_STATUS_CANCELLING)).fetchall()
+            for row in rows:
+                if is_worker_alive(row['worker']):
+                    continue
+                if row['status'] == JOB_STATUS_RUNNING:
+                    output += 1
+                    new_status = JOB_STATUS_QUEUED
+                else:
+                    new_status = JOB_STATUS_CANCELLED
+                connection.execute(
+                    'UPDATE jobs SET status = ?, progress = 0, '
+                    'message = NULL, worker = NULL, updated = ? '
+                    'WHERE id = ? AND status = ?',
+                    (new_status, time.time(), row['id'], row['status']))
+        return output
+
+    def remove_finished(self, max_age):
+        """
+        Remove finished (done, failed, cancelled) jobs that were not updated
+        recently.
+
+        :param max_age: Age of jobs in seconds.
+        :type max_age: float
+        :return: Number of removed jobs.
+        :rtype: int
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                'DELETE FROM jobs WHERE status IN ({}) AND updated < ?'.format(
+                    ', '.join('?' * len(JOB_FINAL_STATUSES))),
+                JOB_FINAL_STATUSES + (time.time() - max_age,))
+            return cursor.rowcount
+
+
+def get_job_store():
+    """
+    Get job store (location of the database is defined by settings).
+
+    :return: Job store object.
+    :rtype: JobStore
+    """
+    global _job_store
+
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                _job_store = JobStore(
+                    file_name=getattr(settings, 'JOBS_DB_FILE', None) or
+                    os.path.join(settings.MEDIA_ROOT, DB_FILE_NAME_DEFAULT))
+    return _job_store
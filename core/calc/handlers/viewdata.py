@@ -15,10 +15,14 @@ from sklearn.impute import SimpleImputer
 
 from datetime import datetime
 
+from django.conf import settings
+
+from ...providers.profiling import get_features_description
 from ...settings.base import BASE_DIR
 
 from .. import data_converters
-from ..basicstatistics import BasicStatistics, DESCRIPTION as STAT_DESCRIPTION
+from ..basicstatistics import DESCRIPTION as STAT_DESCRIPTION, \
+    get_top_correlations
 
 from ._base import BaseDataHandler
 
@@ -32,6 +36,13 @@ LOD_VALUE_DEFAULT = 50
 
 VIEW_DATA_MODE_DEFAULT = 'datavisualization'
 
+# transport of dataset arrays to the front end: "inline" - nested lists
+# rendered into the page, "binary" - column-oriented payload (typed arrays)
+# requested from the separate endpoint
+DATA_TRANSPORT_INLINE = 'inline'
+DATA_TRANSPORT_BINARY = 'binary'
+DATA_TRANSPORT_DEFAULT = DATA_TRANSPORT_INLINE
+
 CONTEXT_DATA_DEFAULT = {
     'data_uploaded': False,
     'data_is_ready': False,
@@ -61,10 +72,12 @@ CONTEXT_DATA_DEFAULT = {
     'real_dataset': None,
     'norm_dataset': None,
     'aux_dataset': None,
+    'payload_url': None,  # url of the column-oriented payload (if used)
     'dim_names': [],
     'aux_names': [],
     'real_metrics': [],
     'corr_matrix': [],
+    'corr_pairs': [],  # the strongest correlated pairs (for wide datasets)
     'visualparameters': None,
 
     'filename': None,  # selected file from server
@@ -110,6 +123,20 @@ def list_csv_data_files(dir_path=None):
     return output
 
 
+def _to_json_value(value):
+    """
+    Convert the value into JSON serializable one (used with "json.dumps").
+
+    :param value: Value (e.g., numpy scalar).
+    :type value: object
+    :return: JSON serializable value.
+    :rtype: object
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
 class ViewDataHandler(BaseDataHandler):
 
     def __init__(self, dataset_handler=None, mode=None):
@@ -178,88 +205,14 @@ class ViewDataHandler(BaseDataHandler):
         :return: Feature descriptions.
         :rtype: list
         """
-        output = []
-
-        for column in df:
-
-            if not df[column].count():
-                continue
-            # TODO: Re-check that feature with no values should be skipped
-
-            item = {
-                'feature_name': column,
-                'feature_type': df[column].dtype.name,
-                'percentage_missing':
-                    (np.count_nonzero(df[column].isnull()) * 100.) / len(df[column]),
-                'measure_type': 'unknown'}
-            # TODO: Re-check the formula for percentage_missing
-
-            is_category = float(df[column].nunique()) / df[column].count() < .1
-
-            if item['feature_type'] in ['int64', 'float64', 'int32',
-                                        'float32', 'int', 'float']:
-
-                if is_category:
-                    unique_values = df[column].dropna().unique().tolist()
-                    item.update({
-                        'measure_type': 'ordinal',
-                        'unique_values': unique_values,
-                        'unique_number': len(unique_values),
-                        'distribution': {str(k): v for k, v in df[column].
-                                         value_counts().to_dict().items()},
-                        'enabled': 'false'})
-                else:
-                    item.update({
-                        'measure_type': 'continuous',
-                        'min': df[column].min(),
-                        'max': df[column].max(),
-                        'mean': df[column].mean(),
-                        'std': df[column].std(),
-                        'q10': df[column].quantile(.1),
-                        'q25': df[column].quantile(.25),
-                        'q50': df[column].quantile(.5),
-                        'q75': df[column].quantile(.75),
-                        'q90': df[column].quantile(.9),
-                        'enabled': 'true'})
-
-            elif item['feature_type'] == 'object':
-
-                item.update({
-                    'measure_type': 'nominal',
-                    'unique_number': len(df[column].dropna().unique().tolist()),
-                    'distribution': {},
-                    'enabled': 'false'})
-
-                is_datetime_object = False
-                if any(n in column for n in ['time', 'date', 'start', 'end']):
-                    try:
-                        dt_object = pd.to_datetime(df[column].dropna())
-                    except ValueError:
-                        pass
-                    else:
-                        item.update({
-                            'measure_type': 'range',
-                            'unique_values': [dt_object.min().isoformat(),
-                                              dt_object.max().isoformat()]})
-                        is_datetime_object = True
-
-                if not is_datetime_object:
-
-                    unique_values = df[column].dropna().unique().tolist()
-                    if is_category:
-                        item.update({
-                            'unique_values': unique_values,
-                            'distribution':
-                                df[column].value_counts().to_dict()})
-                    else:
-                        item.update({
-                            'measure_type': 'non-categorical',
-                            'unique_values': unique_values[:10]})
-
-            output.append(item)
-        return output
-
-    def set_dataset_description(self, save_stats=None, with_full_set=False):
+        return get_features_description(
+            df,
+            approximate_min_records=getattr(
+                settings, 'PROFILING_APPROXIMATE_MIN_RECORDS', None),
+            error=getattr(settings, 'PROFILING_ERROR', None))
+
+    def set_dataset_description(self, save_stats=None, with_full_set=False,
+                                with_inline_data=True):
         """
         Set corresponding parameters that describe the dataset.
 
@@ -267,6 +220,9 @@ class ViewDataHandler(BaseDataHandler):
         :type save_stats: bool
         :param with_full_set: Flag to get full set of context parameters.
         :type with_full_set: bool
+        :param with_inline_data: Flag to put dataset arrays into the context
+            (otherwise they are requested by the front end separately).
+        :type with_inline_data: bool
         """
         err_msg_subj = '[ViewDataHandler.set_dataset_description]'
 
@@ -275,6 +231,12 @@ class ViewDataHandler(BaseDataHandler):
             logger.error(err_msg)
             raise Exception(err_msg)
 
+        # description of the initial dataset is taken from the stats file
+        if not with_full_set and self._load_dataset_stats():
+            return
+
+        self._dataset_handler.load_initial_dataset()
+
         _origin = self._dataset_handler._origin
         _normalized = self._dataset_handler._normalized
         _auxiliary = self._dataset_handler._auxiliary
@@ -286,50 +248,47 @@ class ViewDataHandler(BaseDataHandler):
         df.dropna(axis=1, how='all', inplace=True)
         df.dropna(axis=0, how='all', inplace=True)
 
-        self._data.update({
-            'dsID': self._did,
-            'index_name': df.index.name,
-            'num_records': len(df.index),
-            'features': self._get_dataset_features_description(df=df),
-            'data_uploaded': True})
-
-        if save_stats:
-            file_name = self._get_full_stats_file_name()
-            self._remove_file(file_name=file_name)
-            with open(file_name, 'w') as f:
-                f.write(json.dumps({
-                    'index_name': self._data['index_name'],
-                    'num_records': self._data['num_records'],
-                    'features': json.loads(
-                        pd.DataFrame.from_records(self._data['features']).T.
-                        to_json())}))
+        self.set_dataset_stats(
+            index_name=df.index.name,
+            num_records=len(df.index),
+            features=self._get_dataset_features_description(df=df),
+            save_stats=save_stats)
 
         if with_full_set:
             try:
+                if with_inline_data:
+                    self._data.update({
+                        # arrays are converted on rendering (by chunks)
+                        'real_dataset':
+                            data_converters.JSListStream(_origin),
+                        'norm_dataset':
+                            data_converters.JSListStream(_normalized),
+                        'aux_dataset':
+                            data_converters.JSListStream(_auxiliary)})
                 self._data.update({
                     'index': [df.index.name or 'id'],
-                    'real_dataset':
-                        data_converters.pandas_to_js_list(_origin),
-                    'norm_dataset':
-                        data_converters.pandas_to_js_list(_normalized),
-                    'aux_dataset':
-                        data_converters.pandas_to_js_list(_auxiliary),
                     'dim_names': _normalized.columns.tolist(),
                     'aux_names': _auxiliary.columns.tolist(),
                     'operation_history':
                         self._dataset_handler.operation_history})
 
-                ds_origin_stats = BasicStatistics().process_data(_origin)
+                ds_origin_stats = self._dataset_handler.get_basic_statistics()
                 ds_stats_values = []
                 for i in range(len(ds_origin_stats)):
                     ds_stats_values.append(ds_origin_stats[i].tolist())
                 self._data['real_metrics'] = [STAT_DESCRIPTION, ds_stats_values]
                 # TODO: Re-work this.
 
-                corr_matrix = _origin.corr()
-                corr_matrix.dropna(axis=0, how='all', inplace=True)
-                corr_matrix.dropna(axis=1, how='all', inplace=True)
-                self._data['corr_matrix'] = corr_matrix.values.tolist()
+                corr_matrix = self._dataset_handler.get_correlation()
+                top_k = getattr(settings, 'CORRELATION_TOP_K', None)
+                num_features = len(corr_matrix.columns)
+                if top_k and num_features * (num_features - 1) / 2 > top_k:
+                    self._data['corr_pairs'] = get_top_correlations(
+                        corr_matrix, k=top_k)
+                else:
+                    corr_matrix.dropna(axis=0, how='all', inplace=True)
+                    corr_matrix.dropna(axis=1, how='all', inplace=True)
+                    self._data['corr_matrix'] = corr_matrix.values.tolist()
 
             except Exception as e:
                 logger.error('{} Failed to prepare basics of the view data: {}'.
@@ -356,23 +315,111 @@ class ViewDataHandler(BaseDataHandler):
                 if feature['feature_name'] in lod_features:
                     feature['lod_enabled'] = 'true'
 
-    def set_clustering_data(self, operation, camera_params):
+    def set_dataset_stats(self, index_name, num_records, features,
+                          save_stats=None):
         """
-        Set parameters related to the clustering process.
+        Set dataset descriptive information (stats).
+
+        :param index_name: Name of the dataset index.
+        :type index_name: str/None
+        :param num_records: Number of objects in the dataset.
+        :type num_records: int
+        :param features: Feature descriptions.
+        :type features: list
+        :param save_stats: Flag to save dataset descriptive information.
+        :type save_stats: bool
+        """
+        self._data.update({
+            'dsID': self._did,
+            'index_name': index_name,
+            'num_records': num_records,
+            'features': features,
+            'data_uploaded': True})
+
+        if save_stats:
+            self._save_dataset_stats()
+
+    def _save_dataset_stats(self):
+        """
+        Save dataset descriptive information (stats) into the stats file
+        (with the fingerprint of the corresponding initial dataset file).
+        """
+        fingerprint = self._dataset_handler.get_initial_dataset_fingerprint()
+        if fingerprint is None:
+            return
+
+        file_name = self._get_full_stats_file_name()
+        self._remove_file(file_name=file_name)
+        with open(file_name, 'w') as f:
+            f.write(json.dumps({
+                'fingerprint': fingerprint,
+                'index_name': self._data['index_name'],
+                'num_records': self._data['num_records'],
+                'features': self._data['features']},
+                default=_to_json_value))
+
+    def _load_dataset_stats(self):
+        """
+        Load dataset descriptive information (stats) from the stats file
+        if it corresponds to the initial dataset file.
+
+        :return: Flag that stats were loaded.
+        :rtype: bool
+        """
+        fingerprint = self._dataset_handler.get_initial_dataset_fingerprint()
+        file_name = self._get_full_stats_file_name()
+        if fingerprint is None or not os.path.isfile(file_name):
+            return False
+
+        try:
+            with open(file_name, 'r') as f:
+                stats = json.loads(f.read())
+        except ValueError as e:
+            logger.error('[ViewDataHandler._load_dataset_stats] Failed to read '
+                         'the stats file ({}): {}'.format(file_name, e))
+            return False
+
+        # stats file of the previous format has no fingerprint
+        if tuple(stats.get('fingerprint') or ()) != fingerprint:
+            return False
+
+        self.set_dataset_stats(index_name=stats['index_name'],
+                               num_records=stats['num_records'],
+                               features=stats['features'])
+        return True
+
+    @staticmethod
+    def get_clustering_data(operation, camera_params):
+        """
+        Get parameters related to the clustering process.
 
         :param operation: Applied operation of clustering (with result labels).
         :type operation: baseoperationclass.BaseOperationClass
         :param camera_params: Camera parameters.
         :type camera_params: dict
+        :return: Clustering parameters and result labels.
+        :rtype: dict
         """
         cluster_labels = operation.save_results()['results']
-        self._data.update({
+        return {
             'algorithm': operation._operation_code_name,
             'parameters': operation.print_parameters(),
             'clusters': cluster_labels,
             'count_of_clusters': len(set(cluster_labels)),
             'cluster_ready': True,
-            'visualparameters': camera_params})
+            'visualparameters': camera_params}
+
+    def set_clustering_data(self, operation, camera_params):
+        """
+        Set parameters related to the clustering process.
+
+        :param operation: Applied operation of clustering (with result labels).
+        :type operation: baseoperationclass.BaseOperationClass
+        :param camera_params: Camera parameters.
+        :type camera_params: dict
+        """
+        self._data.update(self.get_clustering_data(
+            operation=operation, camera_params=camera_params))
 
     def set_preview_url(self, value):
         """
@@ -384,6 +431,33 @@ class ViewDataHandler(BaseDataHandler):
         self._data.update({'PREVIEW_URL': value,
                            'NEXT_GROUP_URL': value})
 
+    def set_payload_url(self, value):
+        """
+        Set url of the column-oriented payload with dataset arrays.
+
+        :param value: Url.
+        :type value: str
+        """
+        self._data['payload_url'] = value
+
+    def get_dataset_payload(self):
+        """
+        Get column-oriented payload with dataset arrays (origin, normalized
+        and auxiliary datasets share the same index).
+
+        :return: Encoded index and datasets.
+        :rtype: dict
+        """
+        _origin = self._dataset_handler._origin
+        return {
+            'index': data_converters.index_to_column_payload(_origin.index),
+            'origin': data_converters.pandas_to_column_payload(_origin),
+            # normalized values are used as coordinates only
+            'normalized': data_converters.pandas_to_column_payload(
+                self._dataset_handler._normalized, lossless=False),
+            'auxiliary': data_converters.pandas_to_column_payload(
+                self._dataset_handler._auxiliary)}
+
     def set_data_readiness(self):
         """
         Set flag that data is ready (preprocessed for further analysis).
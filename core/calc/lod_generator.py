@@ -1,17 +1,85 @@
 
 from math import log1p
 
+import numpy as np
 import pandas as pd
 
 from .clustering import DAALKMeansClustering, KPrototypesClustering, MiniBatchKMeansClustering
+from .groupstatistics import GroupStatistics
 
 MODE_DEFAULT = 'minibatch'
 NUM_GROUPS_DEFAULT = 100
+NUMERIC_DTYPES = ['int64', 'float64', 'int32', 'float32', 'int', 'float']
 CLUSTERING_BY_MODE = {
     'minibatch': MiniBatchKMeansClustering.MiniBatchKMeansClustering,
     'kprototypes': KPrototypesClustering.KPrototypesClustering,
     'daal': DAALKMeansClustering.DAALKMeansClustering
 }
+BINNING_BY_MODE = {
+    'param_num_continuous': 'linear',
+    'param_num_quantile': 'quantile',
+    'param_num_log': 'log'
+}
+
+
+def _join_unique_values(codes, values):
+    """
+    Concatenate unique values per group (in the order of appearance).
+
+    :param codes: Group number per object (-1 if object is not grouped).
+    :type codes: numpy.ndarray
+    :param values: Values per object.
+    :type values: numpy.ndarray
+    :return: Comma-separated unique values per group (ordered by number).
+    :rtype: numpy.ndarray
+    """
+    pairs = pd.DataFrame({'code': codes, 'value': values}).drop_duplicates()
+    pairs = pairs[pairs['code'] >= 0]
+    if pairs.empty:
+        return np.array([], dtype=object)
+
+    order = np.argsort(pairs['code'].values, kind='mergesort')
+    sorted_codes = pairs['code'].values[order]
+    sorted_values = ', ' + pairs['value'].values[order].astype(object)
+
+    starts = np.flatnonzero(np.concatenate(
+        ([True], sorted_codes[1:] != sorted_codes[:-1])))
+    return pd.Series(np.add.reduceat(sorted_values, starts)).str[2:].values
+
+
+def aggregate_groups(dataset, by, exclude=()):
+    """
+    Aggregate groups of objects in a single pass: mean values of numeric
+    columns and comma-separated unique values of other columns.
+
+    :param dataset: Input data sample.
+    :type dataset: pandas.DataFrame
+    :param by: Grouping key (column name, list of names or labels array).
+    :type by: str/list/numpy.ndarray/pandas.Series
+    :param exclude: Columns that are not aggregated (e.g., grouping keys).
+    :type exclude: list/tuple
+    :return: Aggregated values per group (sorted by group key).
+    :rtype: pandas.DataFrame
+    """
+    groups = dataset.groupby(by)
+
+    columns = [c for c in dataset.columns if c not in exclude]
+    numeric_columns = [c for c in columns
+                       if dataset[c].dtype.name in NUMERIC_DTYPES]
+
+    if numeric_columns:
+        output = groups[numeric_columns].mean()
+    else:
+        output = pd.DataFrame(index=groups.size().index)
+
+    if len(numeric_columns) < len(columns):
+        codes = groups.ngroup().values
+        for column in columns:
+            if column not in numeric_columns:
+                output[column] = _join_unique_values(
+                    codes=codes, values=dataset[column].values)
+
+    return output.loc[:, columns]
 
 
 class LoDGenerator:
@@ -38,6 +106,8 @@ class LoDGenerator:
         self.num_initial_elements = self.dataset.shape[0]
         self.grouped_dataset = None
         self.grouping_key = 'group_id'
+        self.group_labels = None
+        self.group_statistics = None
 
         self._init_metadata = {'mode': mode or MODE_DEFAULT,
                                'value': num_groups or NUM_GROUPS_DEFAULT,
@@ -79,78 +149,185 @@ class LoDGenerator:
             self._update_groups_metadata(
                 groups=self.dataset.groupby(self.grouping_key))
 
-        elif mode == 'param_num_continuous':
+        elif mode in BINNING_BY_MODE:
             selected_feature = features[0]
             self.grouping_key = f'{selected_feature}_intervals'
-            self.grouped_dataset = pd.DataFrame()
-
-            groups = []
-            for i in self.get_intervals(self.dataset[selected_feature].max()):
-                group = self.dataset[((self.dataset[selected_feature] >= i[0]) &
-                                      (self.dataset[selected_feature] < i[1]))]
-                name = f'{i[0]}-{i[1]}'
-                group_mean = self.f(group)
-                group_mean[self.grouping_key] = name
-                self.grouped_dataset = self.grouped_dataset.append(
-                    group_mean, ignore_index=True)
 
-                groups.append((name, group))
+            values = self.dataset[selected_feature].values.astype(np.float64)
+            edges = self.get_bin_edges(values=values,
+                                       num_bins=num_groups,
+                                       binning=BINNING_BY_MODE[mode])
+            bin_ids = self.get_bin_ids(values, edges)
+            # objects out of intervals are not grouped (NaN key)
+            self.dataset[self.grouping_key] = np.where(
+                bin_ids >= 0, bin_ids, np.nan)
 
-            self.grouped_dataset.set_index(self.grouping_key, inplace=True)
-            self._update_groups_metadata(groups=groups)
+            # empty intervals are not presented as groups
+            self.grouped_dataset = self._get_groups_mean()
+            names = self.get_bin_names(
+                edges=edges,
+                bin_ids=[int(i) for i in self.grouped_dataset.index],
+                binning=BINNING_BY_MODE[mode])
+            self.grouped_dataset.index = pd.Index(names,
+                                                  name=self.grouping_key)
+            self._update_groups_metadata(
+                groups=self.dataset.groupby(self.grouping_key), names=names)
 
         else:
             raise NotImplementedError
 
-    def get_intervals(self, max_value):
-        dur_ = max_value / self._init_metadata['value']
-        return [(i * dur_, (i + 1) * dur_)
-                for i in range(self._init_metadata['value'])]  # TODO: Re-work
-
-    def f(self, data):
-        columns_dict = {}
-        for i in data.columns:
-            if (data[i].dtype.name in
-                    ['int64', 'float64', 'int32', 'float32', 'int', 'float']):
-                columns_dict[i] = data[i].mean()
+        self._set_group_statistics()
+
+    def _set_group_statistics(self):
+        """
+        Calculate mergeable statistics of numeric features per group
+        (grouping keys that are added to the dataset are not included).
+        """
+        added_keys = ([] if isinstance(self.grouping_key, list)
+                      else [self.grouping_key])
+        columns = [c for c in self.dataset.columns
+                   if (c not in added_keys and
+                       self.dataset[c].dtype.name in NUMERIC_DTYPES)]
+        self.group_statistics = GroupStatistics.from_groups(
+            dataset=self.dataset.loc[:, columns],
+            group_labels=self.group_labels,
+            num_groups=len(self._groups_metadata))
+
+    @staticmethod
+    def get_bin_edges(values, num_bins, binning='linear'):
+        """
+        Get edges of intervals for the numerical continuous parameter.
+
+        :param values: Parameter values.
+        :type values: numpy.ndarray
+        :param num_bins: Number of intervals.
+        :type num_bins: int
+        :param binning: Type of intervals: linear (equal width, starting
+            from 0, negative values are out of range), quantile (equal
+            number of objects), log (equal width at logarithmic scale, for
+            non-negative values).
+        :type binning: str
+        :return: Interval edges (num_bins + 1 non-decreasing values, or less
+            if quantile intervals have equal edges, but not less than
+            2 values).
+        :rtype: numpy.ndarray
+        """
+        values = values[~np.isnan(values)]
+        min_value, max_value = values.min(), values.max()
+
+        if binning == 'linear':
+            if max_value > 0:
+                output = np.linspace(0., max_value, num_bins + 1)
             else:
-                columns_dict[i] = ', '.join(data[i].unique())
-        return pd.Series(dict(columns_dict))
+                output = np.linspace(min_value, max_value, num_bins + 1)
+        elif binning == 'quantile':
+            output = np.unique(np.percentile(
+                values, np.linspace(0., 100., num_bins + 1)))
+        elif binning == 'log':
+            min_value, max_value = max(min_value, 0.), max(max_value, 0.)
+            output = np.expm1(np.linspace(np.log1p(min_value),
+                                          np.log1p(max_value),
+                                          num_bins + 1))
+            # exact range boundaries (inner edges are kept within them)
+            output = np.clip(output, min_value, max_value)
+            output[0], output[-1] = min_value, max_value
+        else:
+            raise NotImplementedError
+
+        if len(output) < 2:
+            output = np.array([min_value, max_value])
+        return output
+
+    @staticmethod
+    def get_bin_names(edges, bin_ids, binning='linear'):
+        """
+        Get names of intervals ("<left edge>-<right edge>"). Edges of log
+        intervals are shortened (6 significant digits, or more if needed to
+        keep different edges distinguishable).
+
+        :param edges: Interval edges.
+        :type edges: numpy.ndarray
+        :param bin_ids: Interval numbers.
+        :type bin_ids: list
+        :param binning: Type of intervals (see get_bin_edges).
+        :type binning: str
+        :return: Interval names.
+        :rtype: list
+        """
+        edge_names = [str(x) for x in edges]
+        if binning == 'log':
+            num_edges = len(np.unique(edges))
+            for num_digits in range(6, 18):
+                edge_names = ['{:.{}g}'.format(x, num_digits) for x in edges]
+                if len(set(edge_names)) == num_edges:
+                    break
+        return [f'{edge_names[i]}-{edge_names[i + 1]}' for i in bin_ids]
+
+    @staticmethod
+    def get_bin_ids(values, edges):
+        """
+        Assign interval number to every value (intervals are closed on the
+        left side, the last one is closed on both sides).
+
+        :param values: Parameter values.
+        :type values: numpy.ndarray
+        :param edges: Interval edges.
+        :type edges: numpy.ndarray
+        :return: Interval number per value (-1 for values out of range).
+        :rtype: numpy.ndarray
+        """
+        output = np.searchsorted(edges, values, side='right') - 1
+        output[values == edges[-1]] = max(len(edges) - 2, 0)
+        output[(output < 0) | (output > len(edges) - 2) | np.isnan(values)] = -1
+        return output
 
     def _get_groups_mean(self):
-        result = self.dataset.groupby(self.grouping_key).apply(self.f)
-        # We cannot drop self.group_features if we group by it,
-        # cause in that case it serves as an index
-        try:
-            result = result.drop(self.grouping_key, axis=1)
-        except KeyError:
-            pass
-        return result
-        # return self.dataset.groupby(self.group_features).mean()
-
-    def _update_groups_metadata(self, groups):
+        # grouping key is not aggregated, since it serves as an index
+        return aggregate_groups(
+            dataset=self.dataset,
+            by=self.grouping_key,
+            exclude=(self.grouping_key if isinstance(self.grouping_key, list)
+                     else [self.grouping_key]))
+
+    def _update_groups_metadata(self, groups, names=None):
         """
         Groups metadata is set in a form of list of dictionaries:
         for each groups:
         - group_name
         - group_number
-        - group_indexes
         - group_length
         - group_koeff
+
+        Group membership is kept as an array of group numbers per object
+        (see GroupedDataHandler.get_group).
+
+        :param groups: Grouped objects of the dataset.
+        :type groups: pandas.core.groupby.GroupBy
+        :param names: Group names (default: group keys).
+        :type names: list/None
         """
         if self.grouped_dataset is not None:
 
             if self._groups_metadata:
                 del self._groups_metadata[:]
 
+            group_sizes = groups.size()
+            if names is None:
+                names = [str(name) for name in group_sizes.index]
+
+            # objects that are not grouped are marked with -1
+            self.group_labels = groups.ngroup().fillna(-1).values.astype(
+                np.int16 if len(group_sizes) < np.iinfo(np.int16).max
+                else np.int32)
+
             # store in groups metadata original groups with its numbers
-            for idx, (name, group) in enumerate(groups):
+            for idx, (name, group_length) in enumerate(
+                    zip(names, group_sizes.values.tolist())):
                 self._groups_metadata.append({
-                    'group_name': str(name),
+                    'group_name': name,
                     'group_number': idx,
-                    'group_indexes': group.index.tolist(),
-                    'group_length': len(group),
-                    'group_koeff': log1p(len(group) * 100 /
+                    'group_length': group_length,
+                    'group_koeff': log1p(group_length * 100 /
                                          self.num_initial_elements)})
 
     def get_full_metadata(self):
@@ -42,37 +42,48 @@ class OperationHistory:
 
         return self.stack[step_number]
 
+    def _get_operation_data(self, number):
+        return {OPERATION_NAME_STRING: self.stack[number][0].operation_name,
+                OPERATION_PARAMETERS_STRING: json.dumps(self.stack[number][0].save_parameters()),
+                OPERATION_RESULTS_STRING: json.dumps(self.stack[number][0].save_results()),
+                OPERATION_CAMERA_STRING: self.get_camera_parameters(number)}
+
     def save_to_json(self):
         list_of_operations = []
 
         for i in range(len(self.stack)):
-            list_of_operations.append({OPERATION_NAME_STRING: self.stack[i][0].operation_name,
-                                       OPERATION_PARAMETERS_STRING: json.dumps(self.stack[i][0].save_parameters()),
-                                       OPERATION_RESULTS_STRING: json.dumps(self.stack[i][0].save_results()),
-                                       OPERATION_CAMERA_STRING: self.get_camera_parameters(i) })
+            list_of_operations.append(self._get_operation_data(i))
 
         return json.dumps(list_of_operations)
 
+    def operation_to_json(self, step_number=None):
+        if step_number is None:
+            step_number = len(self.stack) - 1
+        return json.dumps(self._get_operation_data(step_number))
+
+    def _load_operation(self, operation_data):
+        operation_class = baseoperationclass.get_operation_class(operation_data[OPERATION_NAME_STRING])
+        if (OPERATION_CAMERA_STRING in operation_data):
+            camera = json.loads(operation_data[OPERATION_CAMERA_STRING])
+        else:
+            camera = ''
+        if operation_class is None:
+            print("Operation " + operation_data[OPERATION_NAME_STRING] +
+                  " is not available. Please, check if all the operations were imported correctly")
+        else:
+            operation = operation_class()
+            if operation.load_parameters(json.loads(operation_data[OPERATION_PARAMETERS_STRING])):
+                if operation.load_results(json.loads(operation_data[OPERATION_RESULTS_STRING])):
+                    self.stack.append([operation, None, camera])
+                else:
+                    print("Failed to load parameters", operation_data[OPERATION_RESULTS_STRING])
+            else:
+                print("Failed to load parameters", operation_data[OPERATION_PARAMETERS_STRING])
+
     def load_from_json(self, json_string):
         list_of_operations = json.loads(json_string)
 
         for i in range(len(list_of_operations)):
-            operation_class = baseoperationclass.get_operation_class(list_of_operations[i][OPERATION_NAME_STRING])
-            if (OPERATION_CAMERA_STRING in list_of_operations[i]):
-                camera = json.loads(list_of_operations[i][OPERATION_CAMERA_STRING])
-            else:
-                camera = ''
-            if operation_class is None:
-                print("Operation " + list_of_operations[i][OPERATION_NAME_STRING] +
-                      " is not available. Please, check if all the operations were imported correctly")
-            else:
-                operation = operation_class()
-                if operation.load_parameters(json.loads(list_of_operations[i][OPERATION_PARAMETERS_STRING])):
-                    if operation.load_results(json.loads(list_of_operations[i][OPERATION_RESULTS_STRING])):
-                        self.stack.append([operation, None, camera])
-                    else:
-                        print("Failed to load parameters", list_of_operations[i][OPERATION_RESULTS_STRING])
-                else:
-                    print("Failed to load parameters", list_of_operations[i][OPERATION_PARAMETERS_STRING])
+            self._load_operation(list_of_operations[i])
 
         return True
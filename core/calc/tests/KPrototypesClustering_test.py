@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from calc.clustering.KPrototypesClustering import KPrototypesClustering
+
+
+def get_dataset(num_rows):
+    random_state = np.random.RandomState(0)
+    clusters = random_state.randint(0, 3, num_rows)
+    return pd.DataFrame({'value': clusters * 10. + random_state.rand(num_rows),
+                         'other': clusters * 5. + random_state.rand(num_rows),
+                         'site': ['site{}'.format(i) for i in clusters]})
+
+
+def run():
+    print("Performing test of KPrototypesClustering")
+    dataset = get_dataset(300)
+
+    print("Testing seeded restarts:")
+    outputs = []
+    for _ in range(2):
+        operation = KPrototypesClustering()
+        operation.set_parameters(3, random_state=1)
+        labels = operation.process_data(dataset.copy())
+        outputs.append((labels, operation.model.cost_))
+    assert np.array_equal(outputs[0][0], outputs[1][0])
+    assert outputs[0][1] == outputs[1][1]
+    # clusters are well separated
+    assert len(pd.crosstab(outputs[0][0], dataset['site']).values.nonzero()[0]) == 3
+    print("Passed")
+
+    print("Testing stop of restarts on the cost plateau:")
+    operation = KPrototypesClustering()
+    operation.set_parameters(3, random_state=1)
+    operation.plateau_restarts = 2
+    operation.process_data(dataset.copy())
+    assert operation.num_restarts < operation.n_init
+    operation.plateau_restarts = None
+    operation.get_labels(dataset.copy(), reprocess=True)
+    assert operation.num_restarts == operation.n_init
+    print("Passed")
+
+    return True
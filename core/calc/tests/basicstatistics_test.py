@@ -1,4 +1,7 @@
+import json
+
 from calc import basicstatistics
+import numpy as np
 import pandas as pd
 
 
@@ -6,23 +9,33 @@ def isclose(a, b, rel_tol=1e-04, abs_tol=0.0):
     return abs(a - b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol)
 
 
+# metrics of the expected results (in order of expected values)
+EXPECTED_METRICS = ['Min', '25%', '50%', '75%', 'Max', 'Sum', 'Std']
+
+
+def check_results(result, expected):
+    assert len(result) == len(basicstatistics.DESCRIPTION)
+    for i, name in enumerate(EXPECTED_METRICS):
+        values = result[basicstatistics.DESCRIPTION.index(name)]
+        for j in range(len(values)):
+            if not isclose(values[j], expected[i][j]):
+                assert False
+    median = result[basicstatistics.DESCRIPTION.index('Median')]
+    assert median.equals(result[basicstatistics.DESCRIPTION.index('50%')])
+
+
 def run_test(test):
     calc = basicstatistics.BasicStatistics()
     result = calc.process_data(test[0])
     print("Testing calculations")
-    for i in range(len(result)):
-        for j in range(len(result[i])):
-            if not isclose(result[i][j], test[1][i][j]):
-                assert False
+    check_results(result, test[1])
+    for name, value in (('Count', test[0].count()), ('Mean', test[0].mean()), ('Skew', test[0].skew())):
+        assert np.allclose(result[basicstatistics.DESCRIPTION.index(name)], value, equal_nan=True)
     print("Testing saving results")
-    saved = calc.save_results()
+    saved = json.loads(json.dumps(calc.save_results()))
     calc = basicstatistics.BasicStatistics()
     assert calc.load_results(saved)
-    result = calc.results
-    for i in range(len(result)):
-        for j in range(len(result[i])):
-            if not isclose(result[i][j], test[1][i][j]):
-                assert False
+    check_results(calc.results, test[1])
 
     return True
 
@@ -39,7 +52,22 @@ def run():
                     [5, 9, 8, 10]]),
                    [[1, 1, 0, 2], [4.25, 1.75, 1.5, 2.75], [6.0, 4.0, 2.5, 3.5], [7.0, 7.5, 7.25, 8.25], [9, 9, 8, 10],
                     [43, 37, 30, 41], [2.66927, 3.33542, 3.41216, 3.31393]]]]
+    print("Performing test of correlation")
+    dataset = pd.DataFrame({'a': [1., 2., 3., 4.], 'b': [2., 1., 4., 3.], 'c': [5., 5., 5., 5.], 'd': [4., 3., 2., 1.]})
+    correlation = basicstatistics.get_correlation(dataset)
+    assert np.allclose(correlation, dataset.corr(), equal_nan=True)
+    top_correlations = basicstatistics.get_top_correlations(correlation, k=1)
+    assert top_correlations[0][:2] == ['a', 'd'] and isclose(top_correlations[0][2], -1.)
+    # pairs with constant features are skipped
+    assert len(basicstatistics.get_top_correlations(correlation, k=10)) == 3
+    print("Passed")
     print("Performing test of BasicStatistics")
+    print("Testing on dataset with bool feature:")
+    dataset = pd.DataFrame({'a': [1, 2, 3, 4], 'b': [True, False, True, True], 'c': ['x', 'y', 'x', 'z']})
+    result = basicstatistics.BasicStatistics().process_data(dataset)
+    assert result[0].index.tolist() == dataset._get_numeric_data().columns.tolist() == ['a', 'b']
+    assert np.allclose(result[basicstatistics.DESCRIPTION.index('Mean')], [2.5, 0.75])
+    print("Passed")
     for i in range(len(testset)):
         print(f"Testing on testset number {i}:")
         assert run_test(testset[i])
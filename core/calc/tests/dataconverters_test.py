@@ -0,0 +1,44 @@
+import base64
+
+import numpy as np
+import pandas as pd
+
+from calc import data_converters
+
+
+def decode(column):
+    if column['dtype'] == 'object':
+        return column['values']
+    return np.frombuffer(base64.b64decode(column['values']),
+                         dtype='<f4' if column['dtype'] == 'float32'
+                         else '<f8')
+
+
+def run():
+    print("Performing test of the column-oriented payload")
+    dataset = pd.DataFrame(
+        {'nevents': [100, 250, np.nan],
+         'cpu_eff': [.25, .5, .75],
+         'walltime': [.1, .2, .3],
+         'site': ['CERN', None, 'BNL']},
+        index=pd.Index([4500000001, 4500000002, 4500000003],
+                       name='pandaid'))
+
+    print("Testing numeric columns:")
+    payload = data_converters.pandas_to_column_payload(dataset)
+    assert payload['columns'] == ['nevents', 'cpu_eff', 'walltime', 'site']
+    assert [x['dtype'] for x in payload['data']] == [
+        'float32', 'float32', 'float64', 'object']
+    assert np.array_equal(decode(payload['data'][0])[:2], [100, 250])
+    assert np.isnan(decode(payload['data'][0])[2])
+    assert np.array_equal(decode(payload['data'][2]), dataset['walltime'])
+    payload = data_converters.pandas_to_column_payload(dataset, lossless=False)
+    assert payload['data'][2]['dtype'] == 'float32'
+    print("Passed")
+
+    print("Testing index and object columns:")
+    index = data_converters.index_to_column_payload(dataset.index)
+    assert index['dtype'] == 'float64'
+    assert np.array_equal(decode(index), dataset.index)
+    assert decode(payload['data'][3]) == ['CERN', None, 'BNL']
+    print("Passed")
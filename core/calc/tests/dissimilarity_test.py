@@ -0,0 +1,48 @@
+from calc.util import dissimilarity_python
+import numpy as np
+from scipy.spatial.distance import cdist, squareform
+
+
+def reference_mixed_metric(points, centers, categorical_indices, categorical_weight):
+    categorical = np.zeros(points.shape[1], dtype=bool)
+    categorical[categorical_indices] = True
+    equal = (points[:, None, :] == centers[None, :, :]) & categorical
+    squared = np.where(equal, 0, (points[:, None, :] - centers[None, :, :]) ** 2)
+    return categorical_weight * equal.sum(axis=2) + np.sqrt(squared.sum(axis=2))
+
+
+def run():
+    print("Performing test of dissimilarity kernels")
+    random_state = np.random.RandomState(0)
+    points = random_state.rand(500, 6)
+    points[:, [1, 4]] = random_state.randint(0, 3, (500, 2))
+    centers = points[random_state.choice(500, 7, replace=False)]
+    categorical_indices = np.array([1, 4], dtype=np.int32)
+
+    print("Testing numeric and matching kernels")
+    expected = cdist(points, centers, 'sqeuclidean')
+    assert np.allclose(dissimilarity_python.euclidean_batch(points, centers), expected)
+    for k in range(centers.shape[0]):
+        assert np.allclose(dissimilarity_python.euclidean(points, centers[k]), expected[:, k])
+    expected = cdist(points, centers, 'hamming') * points.shape[1]
+    assert np.allclose(dissimilarity_python.matching_batch(points, centers), expected)
+    for k in range(centers.shape[0]):
+        assert np.allclose(dissimilarity_python.matching(points, centers[k]), expected[:, k])
+
+    print("Testing mixed metric")
+    expected = reference_mixed_metric(points, centers, categorical_indices, .3)
+    result = dissimilarity_python.mixed_metric_batch(points, centers, categorical_indices, .3)
+    assert np.allclose(result, expected)
+    for i in range(0, points.shape[0], 50):
+        for k in range(centers.shape[0]):
+            value = dissimilarity_python.mixed_metric(points[i], centers[k], categorical_indices, .3)
+            assert np.isclose(value, expected[i, k])
+
+    print("Testing pairwise mixed metric")
+    expected = reference_mixed_metric(points, points, categorical_indices, .3)
+    result = dissimilarity_python.mixed_metric_pdist(points, categorical_indices, .3)
+    assert result.shape == (points.shape[0] * (points.shape[0] - 1) // 2,)
+    assert np.allclose(result, squareform(expected, checks=False))
+    print("Passed")
+
+    return True
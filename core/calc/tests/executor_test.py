@@ -0,0 +1,47 @@
+import sys
+import time
+
+from calc import basicstatistics
+from calc.clustering import baseoperationclass
+from calc.executor import (OperationExecutor, OperationCancelledError,
+                           OperationTimeoutError, get_operation_executor)
+import numpy as np
+import pandas as pd
+
+
+class SlowOperation(baseoperationclass.BaseOperationClass):
+
+    def process_data(self, dataset):
+        time.sleep(60)
+
+
+def run():
+    print("Performing test of the operation executor")
+    # the executor is disabled by default
+    assert get_operation_executor() is None
+    executor = OperationExecutor(max_processes=1, executable=sys.executable)
+    dataset = pd.DataFrame({'a': np.random.rand(100),
+                            'b': np.arange(100)})
+
+    print("Testing operation results")
+    operation = basicstatistics.BasicStatistics()
+    output = executor.run(operation, dataset)
+    expected = basicstatistics.BasicStatistics().process_data(dataset)
+    for result, value in zip(output, expected):
+        assert np.allclose(result, value, equal_nan=True)
+    assert operation.results is not None
+
+    print("Testing timeout and cancellation")
+    try:
+        executor.run(SlowOperation(), dataset, timeout=1)
+        assert False
+    except OperationTimeoutError:
+        pass
+    try:
+        executor.run(SlowOperation(), dataset, is_cancelled=lambda: True)
+        assert False
+    except OperationCancelledError:
+        pass
+    print("Passed")
+
+    return True
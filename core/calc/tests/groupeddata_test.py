@@ -0,0 +1,101 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from django.test import override_settings
+
+from calc.handlers.groupeddata import (GroupedDataHandler, STORAGE_MODE_EAGER,
+                                      STORAGE_MODE_LAZY)
+
+
+def run():
+    print("Performing test of GroupedDataHandler")
+    dataset = pd.DataFrame({'value': np.arange(8, dtype='float64')},
+                           index=pd.Index(range(10, 18), name='pandaid'))
+    group_labels = np.array([1, 0, -1, 1, 0, 2, 1, -1], dtype=np.int16)
+
+    print("Testing split of the dataset into groups:")
+    groups = GroupedDataHandler.split_groups(dataset=dataset,
+                                             group_labels=group_labels,
+                                             num_groups=3)
+    assert [g.index.tolist() for g in groups] == [[11, 14],
+                                                   [10, 13, 16],
+                                                   [15]]
+    print("Passed")
+
+    print("Testing empty groups:")
+    groups = GroupedDataHandler.split_groups(dataset=dataset,
+                                             group_labels=group_labels,
+                                             num_groups=4)
+    assert groups[3].empty
+    print("Passed")
+
+    print("Testing groups stored into the file:")
+    groups = GroupedDataHandler.split_groups(dataset=dataset,
+                                             group_labels=group_labels,
+                                             num_groups=3)
+    with tempfile.TemporaryDirectory() as dir_name, \
+            override_settings(MEDIA_ROOT=dir_name):
+        os.makedirs(os.path.join(dir_name, 'test'))
+        GroupedDataHandler(did='test').set_groups(
+            dataset=dataset,
+            groups_metadata=[{}] * 3,
+            group_labels=group_labels,
+            save_to_file=True,
+            storage_mode=STORAGE_MODE_EAGER)
+
+        # groups are read by offsets from the file
+        handler = GroupedDataHandler(did='test')
+        for i in (2, 0, 1):
+            group = handler.get_group(i)
+            assert group.index.tolist() == groups[i].index.tolist()
+            assert np.allclose(group['value'].values,
+                               groups[i]['value'].values)
+    print("Passed")
+
+    print("Testing groups stored in the lazy mode:")
+    with tempfile.TemporaryDirectory() as dir_name, \
+            override_settings(MEDIA_ROOT=dir_name):
+        os.makedirs(os.path.join(dir_name, 'test'))
+        GroupedDataHandler(did='test').set_groups(
+            dataset=dataset,
+            groups_metadata=[{}] * 3,
+            group_labels=group_labels,
+            save_to_file=True,
+            storage_mode=STORAGE_MODE_LAZY)
+
+        handler = GroupedDataHandler(did='test')
+        try:
+            handler.get_group(0)
+            assert False
+        except ValueError:
+            pass
+
+        # groups are sliced from the dataset (it might have objects that
+        # were not grouped, e.g., dropped rows with NaN)
+        parent_dataset = pd.concat([dataset, pd.DataFrame(
+            {'value': [-1.]}, index=pd.Index([100], name='pandaid'))])
+        for i in range(3):
+            assert handler.get_group(i, dataset=dataset).equals(groups[i])
+            assert handler.get_group(
+                i, dataset=parent_dataset.iloc[::-1]).equals(groups[i])
+        try:
+            handler.get_group(0, dataset=dataset.rename(
+                columns={'value': 'other'}))
+            assert False
+        except ValueError:
+            pass
+
+        # objects with the same index value are selected by position
+        dataset.index = pd.Index([10] * len(dataset.index), name='pandaid')
+        GroupedDataHandler(did='test').set_groups(
+            dataset=dataset,
+            groups_metadata=[{}] * 3,
+            group_labels=group_labels,
+            save_to_file=True,
+            storage_mode=STORAGE_MODE_LAZY)
+        assert handler.get_group(1, dataset=dataset)['value'].tolist() == [
+            0., 3., 6.]
+    print("Passed")
@@ -0,0 +1,66 @@
+import os
+import tempfile
+
+from calc import basicstatistics
+from calc.groupstatistics import GroupStatistics
+import numpy as np
+import pandas as pd
+
+
+def check_union(group_statistics, dataset, group_labels, group_ids):
+    subset = dataset[np.isin(group_labels, group_ids)]
+
+    merged = group_statistics.merge(group_ids)
+    assert merged['count'] == len(subset.index)
+    assert np.allclose(merged['mean'], subset.mean())
+    assert np.allclose(merged['min'], subset.min())
+    assert np.allclose(merged['max'], subset.max())
+
+    result = group_statistics.get_basic_statistics(group_ids)
+    expected = basicstatistics.BasicStatistics().process_data(subset)
+    for name in ('Count', 'Min', 'Max', 'Mean', 'Std', 'Sum', 'Skew'):
+        i = basicstatistics.DESCRIPTION.index(name)
+        assert np.allclose(result[i], expected[i], equal_nan=True)
+    # quantiles are estimated by stored percentiles per group
+    # (checked for continuous features only)
+    for name in ('25%', '50%', '75%'):
+        i = basicstatistics.DESCRIPTION.index(name)
+        q = float(name[:-1]) / 100.
+        for column in subset.select_dtypes(include='float').columns:
+            lower, upper = subset[column].quantile([q - .02, q + .02])
+            assert lower <= result[i][column] <= upper
+
+    assert np.allclose(group_statistics.get_correlation(group_ids),
+                       subset.corr(), equal_nan=True)
+
+
+def run():
+    random_state = np.random.RandomState(0)
+    dataset = pd.DataFrame({
+        'a': random_state.normal(size=1000),
+        'b': random_state.exponential(size=1000),
+        'c': random_state.randint(0, 10, size=1000)})
+    dataset['d'] = dataset['a'] * 2. + dataset['b']
+    group_labels = random_state.randint(-1, 5, size=1000)
+
+    print("Testing group statistics")
+    group_statistics = GroupStatistics.from_groups(
+        dataset=dataset, group_labels=group_labels, num_groups=6)
+    assert group_statistics.get_count([5]) == 0
+    for group_ids in ([0], [1, 3], [0, 1, 2, 3, 4, 5]):
+        check_union(group_statistics, dataset, group_labels, group_ids)
+
+    columns = ['d', 'a']
+    assert np.allclose(
+        group_statistics.get_correlation([0, 2], columns=columns),
+        dataset.loc[np.isin(group_labels, [0, 2]), columns].corr())
+
+    print("Testing saving results")
+    with tempfile.TemporaryDirectory() as dir_name:
+        file_name = os.path.join(dir_name, 'groups.stats.npz')
+        group_statistics.save(file_name)
+        group_statistics = GroupStatistics.load(file_name)
+    assert group_statistics.columns == dataset.columns.tolist()
+    check_union(group_statistics, dataset, group_labels, [2, 4])
+
+    return True
@@ -0,0 +1,74 @@
+import logging
+
+import pandas as pd
+
+from calc.handlers import historycache
+
+
+def get_data(num_rows):
+    return {'origin': pd.DataFrame({'value': range(num_rows)},
+                                   dtype='float64'),
+            'op_history': '[]'}
+
+
+class RecordsHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__(level=logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record.getMessage())
+
+
+def run():
+    print("Performing test of HistoryCache")
+    data = get_data(100)
+    size = historycache.get_data_size(data)
+    cache = historycache.HistoryCache(max_bytes=size * 2)
+
+    print("Testing hits and misses:")
+    assert cache.get(('1', ()), (1, 10)) is None
+    cache.put(('1', ()), (1, 10), data)
+    cached_data = cache.get(('1', ()), (1, 10))
+    assert cached_data['origin'].equals(data['origin'])
+    assert cache.get(('1', ()), (2, 10)) is None
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 0)
+    print("Passed")
+
+    print("Testing changes of cached data:")
+    cache.put(('1', ()), (1, 10), data)
+    cached_data = cache.get(('1', ()), (1, 10))
+    assert cached_data['origin'] is not data['origin']
+    cached_data['origin'].drop(index=[0, 1], inplace=True)
+    cached_data['origin']['other'] = 1.
+    data['origin'].drop(columns=['value'], inplace=True)
+    cached_data = cache.get(('1', ()), (1, 10))
+    assert cached_data['origin'].columns.tolist() == ['value']
+    assert len(cached_data['origin'].index) == 100
+    cache.invalidate(('1', ()))
+    print("Passed")
+
+    print("Testing eviction of least recently used data:")
+    handler = RecordsHandler()
+    historycache.logger.addHandler(handler)
+    historycache.logger.setLevel(logging.DEBUG)
+    for did in ('1', '2', '3'):
+        cache.put((did, ()), (1, 10), get_data(100))
+    # cache counters are logged on eviction
+    assert len(handler.records) == 1
+    assert "'evictions': 1" in handler.records[0]
+    assert cache.get(('1', ()), (1, 10)) is None
+    assert cache.get(('3', ()), (1, 10)) is not None
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1 and stats['size'] <= stats['max_size']
+    print("Passed")
+
+    print("Testing data that exceeds the cache size:")
+    cache.put(('4', ()), (1, 10), get_data(1000))
+    assert cache.get(('4', ()), (1, 10)) is None
+    assert 'Data is not cached' in handler.records[-1]
+    historycache.logger.removeHandler(handler)
+    historycache.logger.setLevel(logging.NOTSET)
+    print("Passed")
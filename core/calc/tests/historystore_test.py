@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from calc.handlers import historystore
+
+
+def get_history_data():
+    index = pd.Index([11, 12, 13, 14], name='pandaid')
+    origin = pd.DataFrame({'duration': [10, 20, 30, 40],
+                           'cpu': [.5, 1.5, 2.5, 3.5]}, index=index)
+    return {'origin': origin,
+            'normalized': origin / origin.max() * 100.,
+            'auxiliary': pd.DataFrame({'site': ['A', 'B', 'A', 'C']},
+                                      index=index),
+            'features': ['duration', 'cpu'],
+            'lod': {},
+            'op_history': '[]'}
+
+
+def check_history_data(data, result):
+    for name in ('origin', 'normalized', 'auxiliary'):
+        pd.testing.assert_frame_equal(data[name], result[name])
+    for name in ('features', 'lod', 'op_history'):
+        assert data[name] == result[name]
+
+
+def run_test(storage_format):
+    data = get_history_data()
+    with tempfile.TemporaryDirectory() as dir_name:
+        base_name = os.path.join(dir_name, '1')
+        store = historystore.get_history_store(base_name, storage_format)
+        assert not store.exists()
+        store.save(data)
+        assert store.exists()
+        check_history_data(data, store.load())
+        fingerprint = store.fingerprint()
+        operations_fingerprint = store.operations_fingerprint()
+        store.append_operation(json.dumps({'operationname': 'Test'}))
+        assert json.loads(store.load_operations()) == [{'operationname': 'Test'}]
+        assert store.operations_fingerprint() != operations_fingerprint
+        if storage_format == historystore.STORAGE_FORMAT_BINARY:
+            assert store.fingerprint() == fingerprint
+        correlation = data['origin'].corr()
+        store.save_correlation(correlation, fingerprint=store.fingerprint())
+        pd.testing.assert_frame_equal(
+            store.load_correlation(fingerprint=store.fingerprint()), correlation)
+        assert store.load_correlation(fingerprint=(0, 0)) is None
+        store.remove()
+        assert not store.exists()
+        assert store.load_correlation(fingerprint=fingerprint) is None
+
+
+def run_precision_test():
+    data = get_history_data()
+    # int64 values above 2**53 are not represented by float64 exactly
+    data['origin']['jeditaskid'] = np.array([2 ** 53 + 1, 2 ** 60 + 3, 5, 7],
+                                            dtype=np.int64)
+    with tempfile.TemporaryDirectory() as dir_name:
+        store = historystore.get_history_store(
+            os.path.join(dir_name, '1'), historystore.STORAGE_FORMAT_BINARY)
+        store.save(data)
+        result = store.load()
+        check_history_data(data, result)
+        assert list(result['matrices']) == ['normalized']
+        # float64-safe dataset is stored as a matrix again
+        data['origin'] = data['origin'].drop(columns='jeditaskid')
+        store.save(data)
+        result = store.load()
+        check_history_data(data, result)
+        assert sorted(result['matrices']) == ['normalized', 'origin']
+        store.remove()
+        assert not os.path.exists(store.location)
+
+
+def run_migration_test():
+    data = get_history_data()
+    with tempfile.TemporaryDirectory() as dir_name:
+        base_name = os.path.join(dir_name, '1')
+        legacy_store = historystore.get_history_store(
+            base_name, historystore.STORAGE_FORMAT_JSON)
+        legacy_store.save(data)
+        store = historystore.get_history_store(
+            base_name, historystore.STORAGE_FORMAT_BINARY)
+        assert store.exists()
+        assert not legacy_store.exists()
+        check_history_data(data, store.load())
+
+
+def run():
+    print("Performing test of history stores")
+    for storage_format in historystore.HISTORY_STORE_BY_FORMAT:
+        print(f"Testing {storage_format} format:")
+        run_test(storage_format)
+        print("Passed")
+    print("Testing int64 values that float64 does not represent:")
+    run_precision_test()
+    print("Passed")
+    print("Testing migration from the legacy format:")
+    run_migration_test()
+    print("Passed")
@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+from calc.handlers import jobstore
+
+
+def run():
+    print("Performing test of the job store")
+    with tempfile.TemporaryDirectory() as dir_name:
+        store = jobstore.JobStore(os.path.join(dir_name, 'jobs.sqlite3'))
+        worker_id = jobstore.get_worker_id()
+
+        first_id = store.create('clustering', {'dataset_id': '1'})
+        second_id = store.create('clustering', {'dataset_id': '2'})
+        assert store.get(first_id)['status'] == jobstore.JOB_STATUS_QUEUED
+        assert store.get('unknown') is None
+
+        print("Testing job processing")
+        job = store.claim(worker_id)
+        assert job['id'] == first_id and job['parameters'] == {'dataset_id': '1'}
+        store.set_progress(first_id, .5, 'Clustering')
+        job = store.get(first_id)
+        assert (job['status'], job['progress'], job['message']) == (
+            jobstore.JOB_STATUS_RUNNING, .5, 'Clustering')
+        store.finish(first_id, {'operation_number': 1})
+        job = store.get(first_id)
+        assert job['status'] == jobstore.JOB_STATUS_DONE
+        assert job['progress'] == 1 and job['result'] == {'operation_number': 1}
+
+        assert store.claim(worker_id)['id'] == second_id
+        assert store.claim(worker_id) is None
+        store.fail(second_id, 'No clusters')
+        job = store.get(second_id)
+        assert (job['status'], job['error']) == (jobstore.JOB_STATUS_FAILED, 'No clusters')
+
+        print("Testing re-queue of jobs of terminated workers")
+        job_id = store.create('clustering', {})
+        # process id that is not used (above the maximum pid value)
+        store.claim('{}:{}'.format(worker_id.rpartition(':')[0], 2 ** 22 + 1))
+        assert store.requeue_orphaned() == 1
+        assert store.claim(worker_id)['id'] == job_id
+        assert store.requeue_orphaned() == 0
+
+        print("Testing cancellation")
+        store.cancel(job_id)
+        assert store.is_cancelling(job_id)
+        # job that is requested to stop is not reported as done
+        store.finish(job_id, {'operation_number': 2})
+        assert store.get(job_id)['status'] == jobstore.JOB_STATUS_CANCELLED
+        store.set_cancelled(job_id)
+        job_id = store.create('clustering', {})
+        store.cancel(job_id)
+        assert store.get(job_id)['status'] == jobstore.JOB_STATUS_CANCELLED
+        assert store.claim(worker_id) is None
+
+        assert store.remove_finished(max_age=0) == 4
+        assert store.get(first_id) is None
+    print("Passed")
+
+    return True
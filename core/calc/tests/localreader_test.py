@@ -0,0 +1,36 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from providers.local import LocalReader, STORED_FILE_FORMAT
+
+
+def run():
+    print("Performing test of LocalReader")
+    dataset = pd.DataFrame(
+        {'value': np.arange(12, dtype='float64'),
+         'mixed': [1, 2, 3, None, 5, 6, 7, 'a', 'b', 9, 'c', 'd']},
+        index=pd.Index(range(12), name='pandaid'))
+
+    print("Testing stored dataset with types changed between chunks:")
+    with tempfile.TemporaryDirectory() as dir_name:
+        csv_file_name = os.path.join(dir_name, 'dataset.csv')
+        file_name = os.path.join(dir_name, 'dataset.chunks')
+        dataset.to_csv(csv_file_name)
+
+        reader = LocalReader()
+        reader.ingest_csv(csv_file_name, file_name, chunksize=5)
+        result = reader.read_df(file_name, file_format=STORED_FILE_FORMAT)
+        expected = reader.read_df(csv_file_name, file_format='csv',
+                                  index_col=0, header=0)
+        assert result['value'].dtype.name == 'float64'
+        assert result['mixed'].dtype.name == 'object'
+        assert result['mixed'].tolist()[:3] == ['1', '2', '3']
+        assert result.fillna('').equals(expected.fillna(''))
+        # values of the same type are sorted
+        assert np.unique(result['mixed'].dropna().values).size == 11
+    print("Passed")
+
+    return True
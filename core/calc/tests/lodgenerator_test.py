@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from calc.lod_generator import LoDGenerator
+
+
+def run():
+    print("Performing test of LoDGenerator binning")
+
+    print("Testing linear intervals")
+    values = np.array([-1., 1., 2., 2.5, 7., 8.])
+    edges = LoDGenerator.get_bin_edges(values, num_bins=4, binning='linear')
+    assert np.allclose(edges, [0., 2., 4., 6., 8.])
+    assert LoDGenerator.get_bin_ids(values, edges).tolist() == [-1, 0, 1, 1, 3, 3]
+
+    # empty intervals are not presented as groups, objects out of range
+    # are not grouped, groups are numbered consecutively
+    lod = LoDGenerator(pd.DataFrame({'value': values}),
+                       mode='param_num_continuous', num_groups=4,
+                       features=['value'])
+    assert lod.grouped_dataset.index.tolist() == ['0.0-2.0', '2.0-4.0',
+                                                  '6.0-8.0']
+    assert [g['group_length'] for g in lod.get_groups_metadata()] == [1, 2, 2]
+    assert lod.group_labels.tolist() == [-1, 0, 1, 1, 2, 2]
+    print("Passed")
+
+    print("Testing log intervals of a narrow range")
+    values = 1e6 + np.array([.1, .2, .3, .4, .5])
+    edges = LoDGenerator.get_bin_edges(values, num_bins=4, binning='log')
+    assert edges[0] == values[0] and edges[-1] == values[-1]
+    assert np.all(np.diff(edges) >= 0)
+    bin_ids = LoDGenerator.get_bin_ids(values, edges)
+    assert bin_ids.min() == 0 and bin_ids.max() == 3
+    assert np.all(np.diff(bin_ids) >= 0)
+    names = LoDGenerator.get_bin_names(edges, range(4), binning='log')
+    assert len(set(names)) == 4
+    assert names[0].startswith('1000000.1-')
+    print("Passed")
+
+    return True
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from providers.profiling import (DatasetProfiler, FeatureAccumulator,
+                                 get_datetime_format)
+
+
+def get_dataset(num_rows):
+    return pd.DataFrame(
+        {'value': np.arange(num_rows, dtype='float64'),
+         'site': ['site{}'.format(i % 3) for i in range(num_rows)],
+         'starttime': ['2019-01-{:02d} 10:00:00'.format(i % 28 + 1)
+                       for i in range(num_rows)]},
+        index=pd.Index(range(num_rows), name='pandaid'))
+
+
+def run():
+    print("Performing test of DatasetProfiler")
+    dataset = get_dataset(100)
+    dataset.iloc[::10, 0] = np.nan
+
+    profiler = DatasetProfiler()
+    for i in range(0, len(dataset.index), 30):
+        profiler.update(dataset.iloc[i:i + 30])
+    stats = profiler.get_stats()
+    features = {x['feature_name']: x for x in stats['features']}
+
+    print("Testing dataset description:")
+    assert stats['index_name'] == 'pandaid'
+    assert stats['num_records'] == 100
+    print("Passed")
+
+    print("Testing continuous feature:")
+    values = dataset['value']
+    assert features['value']['measure_type'] == 'continuous'
+    assert features['value']['percentage_missing'] == 10.
+    assert np.isclose(features['value']['mean'], values.mean())
+    assert np.isclose(features['value']['std'], values.std())
+    assert np.isclose(features['value']['q25'], values.quantile(.25))
+    print("Passed")
+
+    print("Testing nominal and datetime features:")
+    assert features['site']['unique_number'] == 3
+    assert features['site']['distribution'] == {'site0': 34,
+                                                'site1': 33,
+                                                'site2': 33}
+    assert features['starttime']['measure_type'] == 'range'
+    assert features['starttime']['unique_values'] == ['2019-01-01T10:00:00',
+                                                      '2019-01-28T10:00:00']
+    assert get_datetime_format(dataset['starttime']) == (
+        True, '%Y-%m-%d %H:%M:%S')
+    assert get_datetime_format(dataset['site']) == (False, None)
+    print("Passed")
+
+    print("Testing approximate profiling:")
+    dataset = get_dataset(20000)
+    profiler = DatasetProfiler(approximate_min_records=5000, error=.05)
+    for i in range(0, len(dataset.index), 2000):
+        profiler.update(dataset.iloc[i:i + 2000])
+    features = {x['feature_name']: x
+                for x in profiler.get_features_description()}
+    values = dataset['value']
+    assert features['value']['measure_type'] == 'continuous'
+    assert 'q50' in features['value']['approximate']
+    assert abs((values <= features['value']['q50']).mean() - .5) < .05
+    assert features['site']['unique_number'] == 3
+    assert 'approximate' not in features['site']
+    print("Passed")
+
+    print("Testing limits of exact profiling:")
+    accumulators = [FeatureAccumulator(name=name, max_exact_values=1000,
+                                       max_exact_unique_values=500,
+                                       error=.05)
+                    for name in ('value', 'site')]
+    for i in range(0, len(dataset.index), 2000):
+        for accumulator in accumulators:
+            accumulator.update(dataset[accumulator.name].iloc[i:i + 2000])
+    value_feature, site_feature = [x.get_description(len(dataset.index))
+                                   for x in accumulators]
+    # values are not kept once limits are exceeded
+    assert accumulators[0].approximate and not accumulators[0]._values
+    assert accumulators[0]._value_counts is None
+    assert 'q50' in value_feature['approximate']
+    assert abs((values <= value_feature['q50']).mean() - .5) < .05
+    assert value_feature['measure_type'] == 'continuous'
+    assert not accumulators[1].approximate
+    assert site_feature['unique_number'] == 3
+    print("Passed")
@@ -4,9 +4,34 @@ from calc.tests import basicstatistics_test
 from calc.tests import operationexample_test
 from calc.tests import operationhistory_test
 from calc.tests import KMeansClustering_test
+from calc.tests import historystore_test
+from calc.tests import historycache_test
+from calc.tests import groupeddata_test
+from calc.tests import profiling_test
+from calc.tests import dataconverters_test
+from calc.tests import groupstatistics_test
+from calc.tests import jobstore_test
+from calc.tests import executor_test
+from calc.tests import dissimilarity_test
+from calc.tests import lodgenerator_test
+from calc.tests import KPrototypesClustering_test
+from calc.tests import localreader_test
 
-# importcsv_test.run()
-basicstatistics_test.run()
-operationexample_test.run()
-operationhistory_test.run()
-KMeansClustering_test.run()
+if __name__ == '__main__':
+    # importcsv_test.run()
+    basicstatistics_test.run()
+    operationexample_test.run()
+    operationhistory_test.run()
+    KMeansClustering_test.run()
+    historystore_test.run()
+    historycache_test.run()
+    groupeddata_test.run()
+    profiling_test.run()
+    dataconverters_test.run()
+    groupstatistics_test.run()
+    jobstore_test.run()
+    executor_test.run()
+    dissimilarity_test.run()
+    lodgenerator_test.run()
+    KPrototypesClustering_test.run()
+    localreader_test.run()
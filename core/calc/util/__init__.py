@@ -1,10 +1,6 @@
 import numpy as np
 from sklearn.preprocessing import maxabs_scale
 
-import pyximport
-pyximport.install(inplace=True, setup_args={"include_dirs": [np.get_include()],
-                                            "directives": {'language_level': 3}})
-
 
 def get_categorical_indices(dataset):
     categorical_indices = []
@@ -1,3 +1,21 @@
+"""
+Compiled (numba) dissimilarity kernels.
+
+Single kernels compare a set of points (or one point) with one point, batch
+kernels compare a set of points with a set of centers and return the full
+distance matrix, pdist kernels return pairwise distances of points in the
+condensed form (as scipy.spatial.distance.pdist). Batch and pdist kernels
+process points in parallel across cores.
+
+Semantics of the kernels (reference for all of them):
+    euclidean - squared euclidean distance;
+    matching - number of mismatching values;
+    mixed_metric - square root of the squared euclidean distance of values
+        that are not equal categorical ones, plus categorical_weight for
+        every equal categorical value (categorical_indices are positions of
+        categorical values).
+"""
+
 import numpy as np
 import numba
 
@@ -14,14 +32,84 @@ def euclidean(array_2d, array_1d):
 
 
 @numba.jit(nopython=True)
-def mixed_metric(array_2d, array_1d, categorical_indices, categorical_weight):
-    result, cat_result = 0, 0
-    categorical = np.zeros(array_2d.shape[0], dtype=np.int32)
+def matching(array_2d, array_1d):
+    result = np.zeros(array_2d.shape[0])
+    for i in range(array_2d.shape[0]):
+        for j in range(array_2d.shape[1]):
+            if array_2d[i][j] != array_1d[j]:
+                result[i] += 1
+    return result
+
+
+@numba.jit(nopython=True)
+def _categorical_mask(size, categorical_indices):
+    categorical = np.zeros(size, dtype=np.int32)
     for i in categorical_indices:
         categorical[i] = 1
-    for i in range(array_2d.shape[0]):
-        if categorical[i] and array_2d[i] == array_1d[i]:
+    return categorical
+
+
+@numba.jit(nopython=True)
+def _mixed_metric(array_1d, center, categorical, categorical_weight):
+    result, cat_result = 0., 0.
+    for i in range(array_1d.shape[0]):
+        if categorical[i] and array_1d[i] == center[i]:
             cat_result += categorical_weight
         else:
-            result += (array_2d[i] - array_1d[i]) * (array_2d[i] - array_1d[i])
+            result += (array_1d[i] - center[i]) * (array_1d[i] - center[i])
     return cat_result + sqrt(result)
+
+
+@numba.jit(nopython=True)
+def mixed_metric(array_2d, array_1d, categorical_indices, categorical_weight):
+    # both arguments are points (signature of metrics of scipy.spatial.distance.pdist)
+    categorical = _categorical_mask(array_2d.shape[0], categorical_indices)
+    return _mixed_metric(array_2d, array_1d, categorical, categorical_weight)
+
+
+@numba.jit(nopython=True, parallel=True)
+def euclidean_batch(points, centers):
+    result = np.zeros((points.shape[0], centers.shape[0]))
+    for i in numba.prange(points.shape[0]):
+        for k in range(centers.shape[0]):
+            distance = 0.
+            for j in range(points.shape[1]):
+                distance += (points[i, j] - centers[k, j]) * (points[i, j] - centers[k, j])
+            result[i, k] = distance
+    return result
+
+
+@numba.jit(nopython=True, parallel=True)
+def matching_batch(points, centers):
+    result = np.zeros((points.shape[0], centers.shape[0]))
+    for i in numba.prange(points.shape[0]):
+        for k in range(centers.shape[0]):
+            distance = 0.
+            for j in range(points.shape[1]):
+                if points[i, j] != centers[k, j]:
+                    distance += 1
+            result[i, k] = distance
+    return result
+
+
+@numba.jit(nopython=True, parallel=True)
+def mixed_metric_batch(points, centers, categorical_indices, categorical_weight):
+    categorical = _categorical_mask(points.shape[1], categorical_indices)
+    result = np.zeros((points.shape[0], centers.shape[0]))
+    for i in numba.prange(points.shape[0]):
+        for k in range(centers.shape[0]):
+            result[i, k] = _mixed_metric(points[i], centers[k], categorical, categorical_weight)
+    return result
+
+
+@numba.jit(nopython=True, parallel=True)
+def mixed_metric_pdist(points, categorical_indices, categorical_weight):
+    categorical = _categorical_mask(points.shape[1], categorical_indices)
+    num_points = points.shape[0]
+    result = np.zeros(num_points * (num_points - 1) // 2)
+    for i in numba.prange(num_points):
+        # position of the pair (i, i + 1) in the condensed form
+        offset = i * num_points - i * (i + 1) // 2
+        for j in range(i + 1, num_points):
+            result[offset + j - i - 1] = _mixed_metric(points[i], points[j], categorical, categorical_weight)
+    return result
@@ -16,10 +16,16 @@ from django.conf import settings
 
 from .settings.base import BASE_DIR
 from .calc import clustering
+from .calc.executor import get_operation_executor
+
+from . import jobs
 
 from .calc.handlers import DatasetHandler, ViewDataHandler
-from .calc.handlers.viewdata import list_csv_data_files, DATASET_FILES_PATH
+from .calc.handlers.viewdata import (list_csv_data_files, DATASET_FILES_PATH,
+                                     DATA_TRANSPORT_BINARY,
+                                     DATA_TRANSPORT_DEFAULT)
 from .providers import LocalReader
+from .providers.local import STORED_FILE_FORMAT
 
 SITE_SITE_DATASET_FILES_PATH = BASE_DIR + '/site_site_datasets/'
 
@@ -51,10 +57,13 @@ def _process_input_data(source_type, source_data, **kwargs):
     """
     Get and process data to prepare data sample (i.e., store at the server).
 
-    :param source_type: Type of the source: file, dataframe, json.
+    Data is stored as the stored dataset (read and written by chunks) and
+    dataset descriptive information (stats) is collected at the same pass.
+
+    :param source_type: Type of the source: file, csv, dataframe, json.
     :type source_type: str
-    :param source_data: Source data.
-    :type source_data: dict/pandas.DataFrame/json
+    :param source_data: Source data (csv-file full name for "csv" type).
+    :type source_data: dict/str/pandas.DataFrame/json
 
     :keyword index_name: Column name that would be used as an index.
 
@@ -64,21 +73,43 @@ def _process_input_data(source_type, source_data, **kwargs):
     err_msg_subj = '[form_reactions._process_input_data]'
 
     output = str(datetime.now().timestamp())
-    dataset_path = os.path.join(create_dataset_storage(output),
-                                '{}.csv'.format(output))
+    dataset_dir = create_dataset_storage(output)
+    dataset_path = os.path.join(dataset_dir, '{}.csv'.format(output))
+    stored_dataset_path = os.path.join(
+        dataset_dir, '{}.{}'.format(output, STORED_FILE_FORMAT))
     try:
+        profiler = None
+
         if source_type == 'file':
             with open(dataset_path, 'wb+') as f:
                 for chunk in source_data.chunks():
                     f.write(chunk)
+            profiler = local_reader.ingest_csv(
+                file_path=dataset_path,
+                target_file_path=stored_dataset_path)
+            # uploaded file is kept only until it is ingested
+            os.remove(dataset_path)
+
+        elif source_type == 'csv':
+            profiler = local_reader.ingest_csv(
+                file_path=source_data,
+                target_file_path=stored_dataset_path)
 
         elif source_type == 'dataframe':
-            source_data.to_csv(dataset_path)
+            profiler = local_reader.store_chunks(
+                chunks=[source_data],
+                file_path=stored_dataset_path)
 
         elif source_type == 'json' and 'index_name' in kwargs:
             df = pd.read_json(json.dumps(source_data))
             df.set_index(kwargs['index_name'], inplace=True)
-            df.to_csv(dataset_path)
+            profiler = local_reader.store_chunks(
+                chunks=[df],
+                file_path=stored_dataset_path)
+
+        if profiler is not None:
+            ViewDataHandler(dataset_handler=DatasetHandler(did=output)).\
+                set_dataset_stats(save_stats=True, **profiler.get_stats())
     except Exception as e:
         logger.error('{} Failed to prepare dataset sample: {}'.
                      format(err_msg_subj, e))
@@ -105,12 +136,8 @@ def set_csv_file_from_server(request):
                 full_file_name = os.path.join(DATASET_FILES_PATH, f['filename'])
                 if os.path.isfile(full_file_name):
                     output = _process_input_data(
-                        source_type='dataframe',
-                        source_data=local_reader.read_df(
-                            file_path=full_file_name,
-                            file_format='csv',
-                            **{'index_col': 0,
-                               'header': 0}))
+                        source_type='csv',
+                        source_data=full_file_name)
                 else:
                     logger.error('{} Failed to read data from server ({})'.
                                  format(err_msg_subj, full_file_name))
@@ -229,14 +256,95 @@ def get_initial_view_data(dataset_id, group_ids=None, **kwargs):
     :return: Key-value pairs for UI representation.
     :rtype: dict
     """
+    # initial dataset is loaded only if there are no valid stats for it
     viewdata_hdlr = ViewDataHandler(dataset_handler=DatasetHandler(
-        did=dataset_id, group_ids=group_ids, load_initial_dataset=True))
-    viewdata_hdlr.set_dataset_description(with_full_set=False)
+        did=dataset_id, group_ids=group_ids))
+    viewdata_hdlr.set_dataset_description(save_stats=True,
+                                          with_full_set=False)
     if 'preview_url' in kwargs:
         viewdata_hdlr.set_preview_url(kwargs['preview_url'])
     return viewdata_hdlr.context_data
 
 
+def _set_stored_dataset_description(viewdata_hdlr, **kwargs):
+    """
+    Set the description of the dataset that is stored in the history store
+    (dataset arrays are requested by the front end separately if the binary
+    transport is set and the payload url is provided).
+
+    :param viewdata_hdlr: ViewDataHandler object.
+    :type viewdata_hdlr: handlers.viewdata.ViewDataHandler
+    """
+    data_transport = getattr(settings, 'VIEW_DATA_TRANSPORT',
+                             None) or DATA_TRANSPORT_DEFAULT
+    with_inline_data = (data_transport != DATA_TRANSPORT_BINARY or
+                        'payload_url' not in kwargs)
+
+    viewdata_hdlr.set_dataset_description(with_full_set=True,
+                                          with_inline_data=with_inline_data)
+    if not with_inline_data:
+        viewdata_hdlr.set_payload_url(kwargs['payload_url'])
+
+
+def get_dataset_payload(dataset_id, group_ids=None):
+    """
+    Get column-oriented payload with dataset arrays (of the stored data).
+
+    :param dataset_id: Dataset sample id.
+    :type dataset_id: int/str
+    :param group_ids: Group ids (if dataset groups were created).
+    :type group_ids: list/None
+    :return: Encoded index and datasets.
+    :rtype: dict
+    """
+    return ViewDataHandler(dataset_handler=DatasetHandler(
+        did=dataset_id, group_ids=group_ids,
+        load_history_data=True)).get_dataset_payload()
+
+
+def get_history_fingerprint(dataset_id, group_ids=None,
+                            with_operations=False):
+    """
+    Get fingerprint of the stored data (used for HTTP caching).
+
+    :param dataset_id: Dataset sample id.
+    :type dataset_id: int/str
+    :param group_ids: Group ids (if dataset groups were created).
+    :type group_ids: list/None
+    :param with_operations: Flag to include operations history.
+    :type with_operations: bool
+    :return: Fingerprint of the stored data (None if there is no data).
+    :rtype: tuple/None
+    """
+    return DatasetHandler(did=dataset_id, group_ids=group_ids).\
+        get_history_fingerprint(with_operations=with_operations)
+
+
+def get_operation_results(dataset_id, group_ids, op_number):
+    """
+    Get results of the applied operation (without dataset arrays).
+
+    :param dataset_id: Dataset sample id.
+    :type dataset_id: int/str
+    :param group_ids: Group ids (if dataset groups were created).
+    :type group_ids: list/None
+    :param op_number: Operation number.
+    :type op_number: int
+    :return: Clustering parameters and result labels.
+    :rtype: dict
+    """
+    dataset_hdlr = DatasetHandler(did=dataset_id, group_ids=group_ids)
+    dataset_hdlr.load_operation_history()
+
+    op_history = dataset_hdlr.operation_history
+    if op_number >= op_history.length():
+        op_number = op_history.length() - 1
+
+    operation, _, camera_params = op_history.get_step(op_number)
+    return ViewDataHandler.get_clustering_data(operation=operation,
+                                               camera_params=camera_params)
+
+
 def _get_dataset_handler_by_request_data(request, dataset_id, group_ids=None):
     """
     Create DatasetHandler by input parameters from the request.
@@ -308,7 +416,7 @@ def set_processed_view_data(request, dataset_id, group_ids=None, **kwargs):
     dataset_hdlr.save()
 
     viewdata_hdlr = ViewDataHandler(dataset_handler=dataset_hdlr)
-    viewdata_hdlr.set_dataset_description(with_full_set=True)
+    _set_stored_dataset_description(viewdata_hdlr, **kwargs)
     if 'preview_url' in kwargs:
         viewdata_hdlr.set_preview_url(kwargs['preview_url'])
     viewdata_hdlr.set_data_readiness()
@@ -342,7 +450,7 @@ def get_operational_view_data(dataset_id, group_ids, op_number, **kwargs):
                      format(operation._type_of_operation))
 
     viewdata_hdlr = ViewDataHandler(dataset_handler=dataset_hdlr)
-    viewdata_hdlr.set_dataset_description(with_full_set=True)
+    _set_stored_dataset_description(viewdata_hdlr, **kwargs)
     viewdata_hdlr.set_clustering_data(operation=operation,
                                       camera_params=camera_params)
     if 'preview_url' in kwargs:
@@ -351,126 +459,173 @@ def get_operational_view_data(dataset_id, group_ids, op_number, **kwargs):
     return viewdata_hdlr.context_data
 
 
-def clusterize(request, dataset_id, group_ids=None):
+def get_clustering_operation(parameters):
     """
-    Clustering of data objects/records from the provided dataset sample.
+    Get clustering operation according to the requested algorithm.
 
-    :param request: HTTP [user] request.
-    :type request: django.http.HttpRequest
-    :param dataset_id: Dataset sample id.
-    :type dataset_id: int/str
-    :param group_ids: Group ids (if dataset groups were created).
-    :type group_ids: list/None
-    :return: Number/id of the current operation.
-    :rtype: int
+    :param parameters: Request parameters (e.g., request.POST).
+    :type parameters: dict
+    :return: Clustering operation (None if the request is incorrect)
+        and the dataset mode (numeric, all).
+    :rtype: tuple
     """
-    err_msg_subj = '[form_reactions.clusterize]'
+    err_msg_subj = '[form_reactions.get_clustering_operation]'
 
     operation = None
     mode = None
-    if 'algorithm' in request.POST:
-        clusters_list = [] if request.POST['clustering_list_json'] == '' \
-                else json.loads(request.POST['clustering_list_json'])
+    if 'algorithm' in parameters:
+        clusters_list = [] if parameters['clustering_list_json'] == '' \
+                else json.loads(parameters['clustering_list_json'])
 
-        if (request.POST['algorithm'] == 'KMeans' and
-                'numberofcl_KMeans' in request.POST):
+        if (parameters['algorithm'] == 'KMeans' and
+                'numberofcl_KMeans' in parameters):
 
             operation = clustering.KMeansClustering.KMeansClustering()
-            operation.set_parameters(int(request.POST['numberofcl_KMeans']),
+            operation.set_parameters(int(parameters['numberofcl_KMeans']),
                                      clusters_list)
             mode = 'numeric'
 
-        elif (request.POST['algorithm'] == 'MiniBatchKMeans' and
-                'numclusters_MiniBatchKMeans' in request.POST and
-                'batchsize_MiniBatchKMeans' in request.POST):
+        elif (parameters['algorithm'] == 'MiniBatchKMeans' and
+                'numclusters_MiniBatchKMeans' in parameters and
+                'batchsize_MiniBatchKMeans' in parameters):
 
             operation = clustering.MiniBatchKMeansClustering.\
                 MiniBatchKMeansClustering()
-            operation.set_parameters(num_clusters=int(request.POST['numclusters_MiniBatchKMeans']),
+            operation.set_parameters(num_clusters=int(parameters['numclusters_MiniBatchKMeans']),
                                      features=clusters_list,
-                                     batch_size=int(request.POST['batchsize_MiniBatchKMeans']))
+                                     batch_size=int(parameters['batchsize_MiniBatchKMeans']))
             mode = 'numeric'
 
-        elif (request.POST['algorithm'] == 'DAALKMeans' and
-                'numclusters_DAALKMeans' in request.POST):
+        elif (parameters['algorithm'] == 'DAALKMeans' and
+                'numclusters_DAALKMeans' in parameters):
 
             operation = clustering.DAALKMeansClustering.DAALKMeansClustering()
-            operation.set_parameters(int(request.POST['numclusters_DAALKMeans']),
+            operation.set_parameters(int(parameters['numclusters_DAALKMeans']),
                                      clusters_list)
             mode = 'numeric'
 
-        elif (request.POST['algorithm'] == 'KPrototypes' and
-                'cluster_number_KPrototypes' in request.POST and
-                'categorical_data_weight_KPrototypes' in request.POST):
+        elif (parameters['algorithm'] == 'KPrototypes' and
+                'cluster_number_KPrototypes' in parameters and
+                'categorical_data_weight_KPrototypes' in parameters):
 
             operation = clustering.KPrototypesClustering.KPrototypesClustering()
-            operation.set_parameters(int(request.POST['cluster_number_KPrototypes']),
-                                     int(request.POST['categorical_data_weight_KPrototypes']),
+            operation.set_parameters(int(parameters['cluster_number_KPrototypes']),
+                                     int(parameters['categorical_data_weight_KPrototypes']),
                                      clusters_list)
             mode = 'all'
 
-        elif (request.POST['algorithm'] == 'Hierarchical' and
-                'cluster_number_Hierarchical' in request.POST and
-                'categorical_data_weight_Hierarchical' in request.POST):
+        elif (parameters['algorithm'] == 'Hierarchical' and
+                'cluster_number_Hierarchical' in parameters and
+                'categorical_data_weight_Hierarchical' in parameters):
 
             operation = clustering.HierarchicalClustering.HierarchicalClustering()
-            operation.set_parameters(int(request.POST['cluster_number_Hierarchical']),
-                                     int(request.POST['categorical_data_weight_Hierarchical']),
+            operation.set_parameters(int(parameters['cluster_number_Hierarchical']),
+                                     int(parameters['categorical_data_weight_Hierarchical']),
                                      clusters_list)
             mode = 'all'
 
-        elif (request.POST['algorithm'] == 'DBSCAN' and
-                'min_samples_DBSCAN' in request.POST and 'eps_DBSCAN' in request.POST):
+        elif (parameters['algorithm'] == 'DBSCAN' and
+                'min_samples_DBSCAN' in parameters and 'eps_DBSCAN' in parameters):
 
             operation = clustering.DBScanClustering.DBScanClustering()
-            operation.set_parameters(int(request.POST['min_samples_DBSCAN']),
-                                     float(request.POST['eps_DBSCAN']),
+            operation.set_parameters(int(parameters['min_samples_DBSCAN']),
+                                     float(parameters['eps_DBSCAN']),
                                      clusters_list)
 
             mode = 'numeric'
 
-        elif (request.POST['algorithm'] == 'GroupData' and
-                'feature_name_GroupData' in request.POST):
+        elif (parameters['algorithm'] == 'GroupData' and
+                'feature_name_GroupData' in parameters):
 
             operation = clustering.GroupData.GroupData()
-            operation.set_parameters(request.POST['feature_name_GroupData'])
+            operation.set_parameters(parameters['feature_name_GroupData'])
 
             mode = 'all'
 
         else:
             logger.error('{} Requested algorithm is not found: {}'.
-                         format(err_msg_subj, json.dumps(request.POST)))
+                         format(err_msg_subj, json.dumps(parameters)))
     else:
         logger.error('{} Request is incorrect: {}'.
-                     format(err_msg_subj, json.dumps(request.POST)))
+                     format(err_msg_subj, json.dumps(parameters)))
+
+    return operation, mode
+
+
+def _get_clustering_parameters(request):
+    """
+    Get clustering parameters from the request (single value per key).
+
+    :param request: HTTP [user] request.
+    :type request: django.http.HttpRequest
+    :return: Clustering parameters.
+    :rtype: dict
+    """
+    return {key: request.POST[key] for key in request.POST
+            if key != 'csrfmiddlewaretoken'}
+
+
+def perform_clustering(dataset_id, group_ids, parameters, progress=None,
+                       is_cancelled=None):
+    """
+    Cluster data objects and save the operation into the operations history.
+
+    :param dataset_id: Dataset sample id.
+    :type dataset_id: int/str
+    :param group_ids: Group ids (if dataset groups were created).
+    :type group_ids: list/None
+    :param parameters: Clustering parameters (see get_clustering_operation).
+    :type parameters: dict
+    :param progress: Function to report progress (value, message).
+    :type progress: callable/None
+    :param is_cancelled: Function that checks whether clustering is
+        cancelled (CPU-bound operations run by the executor are stopped).
+    :type is_cancelled: callable/None
+    :return: Number/id of the created operation (None if it failed).
+    :rtype: int/None
+    """
+    err_msg_subj = '[form_reactions.perform_clustering]'
+
+    def report(value, message):
+        if progress is not None:
+            progress(value, message)
 
+    operation, mode = get_clustering_operation(parameters)
+
+    report(.05, 'Loading data')
     dataset_hdlr = DatasetHandler(did=dataset_id,
                                   group_ids=group_ids,
                                   load_history_data=True,
-                                  use_normalized_dataset='use_normalized_dataset' in request.POST and
-                                                         request.POST['use_normalized_dataset'] == "on")
+                                  use_normalized_dataset='use_normalized_dataset' in parameters and
+                                                         parameters['use_normalized_dataset'] == "on")
 
     dataset_hdlr._mode = mode
     clustering_dataset = dataset_hdlr.clustering_dataset
 
     output_op_number = None
     if operation is not None:
+        report(.2, 'Clustering')
+        executor = get_operation_executor()
         try:
-            clusters = operation.process_data(clustering_dataset)
+            if executor is not None and operation._is_cpu_bound:
+                clusters = executor.run(operation=operation,
+                                        dataset=clustering_dataset,
+                                        is_cancelled=is_cancelled)
+            else:
+                clusters = operation.process_data(clustering_dataset)
         except Exception as e:
             logger.error('{} Failed to perform data clustering: {} - {}'.
-                         format(err_msg_subj, json.dumps(request.POST), e))
+                         format(err_msg_subj, json.dumps(parameters), e))
             raise
         else:
             if clusters is not None:
-                op_history = dataset_hdlr.operation_history
-                op_history.append(clustering_dataset,
-                                  operation,
-                                  request.POST['visualparameters'])
-                dataset_hdlr.operation_history = op_history
-                dataset_hdlr.save()
-
-                output_op_number = op_history.length() - 1
+                report(.9, 'Saving results')
+                dataset_hdlr.append_operation(
+                    operation=operation,
+                    dataset=clustering_dataset,
+                    camera=parameters['visualparameters'])
+
+                output_op_number = dataset_hdlr.operation_history.length() - 1
             else:
                 logger.error('{} No clusters were created: {}'.format(
                     err_msg_subj, json.dumps(operation.save_parameters())))
@@ -478,6 +633,95 @@ def clusterize(request, dataset_id, group_ids=None):
     return output_op_number
 
 
+def clusterize(request, dataset_id, group_ids=None):
+    """
+    Clustering of data objects/records from the provided dataset sample.
+
+    :param request: HTTP [user] request.
+    :type request: django.http.HttpRequest
+    :param dataset_id: Dataset sample id.
+    :type dataset_id: int/str
+    :param group_ids: Group ids (if dataset groups were created).
+    :type group_ids: list/None
+    :return: Number/id of the current operation.
+    :rtype: int
+    """
+    return perform_clustering(dataset_id=dataset_id,
+                              group_ids=group_ids,
+                              parameters=_get_clustering_parameters(request))
+
+
+def submit_clustering(request, dataset_id, group_ids=None):
+    """
+    Submit clustering of data objects as a background job.
+
+    :param request: HTTP [user] request.
+    :type request: django.http.HttpRequest
+    :param dataset_id: Dataset sample id.
+    :type dataset_id: int/str
+    :param group_ids: Group ids (if dataset groups were created).
+    :type group_ids: list/None
+    :return: Job id.
+    :rtype: str
+    """
+    return jobs.submit_job(
+        kind=jobs.JOB_KIND_CLUSTERING,
+        parameters={'dataset_id': dataset_id,
+                    'group_ids': group_ids,
+                    'parameters': _get_clustering_parameters(request)})
+
+
+def run_clustering_job(parameters, progress=None, is_cancelled=None):
+    """
+    Run clustering job (see submit_clustering).
+
+    :param parameters: Job parameters (dataset_id, group_ids, parameters).
+    :type parameters: dict
+    :param progress: Function to report progress (value, message).
+    :type progress: callable/None
+    :param is_cancelled: Function that checks whether the job is cancelled.
+    :type is_cancelled: callable/None
+    :return: Job result with the number/id of the created operation.
+    :rtype: dict
+    """
+    op_number = perform_clustering(dataset_id=parameters['dataset_id'],
+                                   group_ids=parameters['group_ids'],
+                                   parameters=parameters['parameters'],
+                                   progress=progress,
+                                   is_cancelled=is_cancelled)
+    if op_number is None:
+        raise ValueError('Clustering operation was not created')
+    return {'operation_number': op_number}
+
+
+jobs.register_task(jobs.JOB_KIND_CLUSTERING, run_clustering_job)
+
+
+def get_job_status(job_id):
+    """
+    Get status of the background job.
+
+    :param job_id: Job id.
+    :type job_id: str
+    :return: Job description (None if the job is not found).
+    :rtype: dict/None
+    """
+    return jobs.get_job_status(job_id)
+
+
+def cancel_job(job_id):
+    """
+    Cancel the background job (queued job is not run, running operation
+    is stopped).
+
+    :param job_id: Job id.
+    :type job_id: str
+    :return: Job description (None if the job is not found).
+    :rtype: dict/None
+    """
+    return jobs.cancel_job(job_id)
+
+
 # TODO: Re-check/re-work this method (!), it might work incorrectly.
 def predict_cluster(request, dataset_id=None, group_ids=None, op_number=None):
     """
@@ -0,0 +1,193 @@
+"""
+Background jobs: requests (e.g., clustering) are put into the persistent
+queue (see calc.handlers.jobstore) and are run by local worker threads,
+thus HTTP requests return the job id immediately and the job status is
+polled by the client.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+
+from .calc.executor import OperationCancelledError
+from .calc.handlers.jobstore import (get_job_store, get_worker_id,
+                                     JOB_FINAL_STATUSES)
+
+JOB_KIND_CLUSTERING = 'clustering'
+
+NUM_WORKERS_DEFAULT = 1
+POLL_INTERVAL = 2.  # seconds between checks of the queue
+FINISHED_JOBS_MAX_AGE = 7 * 24 * 3600.  # seconds to keep finished jobs
+
+logger = logging.getLogger(__name__)
+
+_tasks = {}
+_workers = []
+_workers_lock = threading.Lock()
+_wakeup = threading.Event()  # set when a new job is submitted
+
+
+def register_task(kind, func):
+    """
+    Register the function that runs jobs of the provided kind.
+
+    :param kind: Kind of jobs.
+    :type kind: str
+    :param func: Function with arguments "parameters" (job parameters),
+        "progress" (function to report progress) and "is_cancelled"
+        (function to check whether the job is cancelled), returns job result.
+    :type func: callable
+    """
+    _tasks[kind] = func
+
+
+class JobWorker(threading.Thread):
+
+    def __init__(self, wakeup):
+        """
+        Initialization.
+
+        :param wakeup: Event that is set when a new job is submitted.
+        :type wakeup: threading.Event
+        """
+        super().__init__(daemon=True)
+        self._wakeup = wakeup
+
+    def run(self):
+        job_store = get_job_store()
+        worker_id = get_worker_id()
+        while True:
+            try:
+                job = job_store.claim(worker_id=worker_id)
+            except Exception as e:
+                logger.error('[JobWorker.run] Failed to get a job: {}'.
+                             format(e))
+                job = None
+
+            if job is None:
+                self._wakeup.wait(POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+
+            try:
+                self.run_job(job_store=job_store, job=job)
+            except Exception as e:
+                logger.error('[JobWorker.run] Failed to process the job '
+                             '({}): {}'.format(job['id'], e))
+
+    @staticmethod
+    def run_job(job_store, job):
+        """
+        Run the job and save its result (or error) into the job store.
+
+        :param job_store: Job store object.
+        :type job_store: calc.handlers.jobstore.JobStore
+        :param job: Job description.
+        :type job: dict
+        """
+        def progress(value, message=None):
+            job_store.set_progress(job_id=job['id'], progress=value,
+                                   message=message)
+
+        def is_cancelled():
+            return job_store.is_cancelling(job_id=job['id'])
+
+        try:
+            result = _tasks[job['kind']](parameters=job['parameters'],
+                                         progress=progress,
+                                         is_cancelled=is_cancelled)
+        except OperationCancelledError:
+            job_store.set_cancelled(job_id=job['id'])
+        except Exception as e:
+            logger.error('[JobWorker.run_job] Job failed ({}, {}): {}'.
+                         format(job['id'], job['kind'], e))
+            job_store.fail(job_id=job['id'], error=str(e) or repr(e))
+        else:
+            job_store.finish(job_id=job['id'], result=result)
+
+
+def start_workers():
+    """
+    Start local workers of the current process (if they were not started),
+    running jobs of terminated workers are returned into the queue.
+    """
+    with _workers_lock:
+        if _workers:
+            return
+
+        job_store = get_job_store()
+        try:
+            job_store.requeue_orphaned()
+            job_store.remove_finished(max_age=FINISHED_JOBS_MAX_AGE)
+        except Exception as e:
+            logger.error('[jobs.start_workers] Failed to clean up the job '
+                         'store: {}'.format(e))
+
+        num_workers = getattr(settings, 'JOBS_NUM_WORKERS',
+                              None) or NUM_WORKERS_DEFAULT
+        for _ in range(num_workers):
+            worker = JobWorker(wakeup=_wakeup)
+            worker.start()
+            _workers.append(worker)
+
+
+def submit_job(kind, parameters):
+    """
+    Put a new job into the queue.
+
+    :param kind: Kind of the job (see register_task).
+    :type kind: str
+    :param parameters: Job parameters (JSON serializable).
+    :type parameters: dict
+    :return: Job id.
+    :rtype: str
+    """
+    if kind not in _tasks:
+        raise ValueError('Unknown kind of job', kind)
+
+    start_workers()
+    job_id = get_job_store().create(kind=kind, parameters=parameters)
+    _wakeup.set()
+    return job_id
+
+
+def cancel_job(job_id):
+    """
+    Cancel the job.
+
+    :param job_id: Job id.
+    :type job_id: str
+    :return: Job status (None if the job is not found).
+    :rtype: dict/None
+    """
+    get_job_store().cancel(job_id)
+    return get_job_status(job_id)
+
+
+def get_job_status(job_id):
+    """
+    Get status of the job.
+
+    :param job_id: Job id.
+    :type job_id: str
+    :return: Job status, progress, message, result and error
+        (None if the job is not found).
+    :rtype: dict/None
+    """
+    job = get_job_store().get(job_id)
+    if job is None:
+        return None
+
+    if job['status'] not in JOB_FINAL_STATUSES:
+        # queued jobs of other (e.g., restarted) processes are taken as well
+        start_workers()
+
+    return {'id': job['id'],
+            'kind': job['kind'],
+            'status': job['status'],
+            'progress': job['progress'],
+            'message': job['message'],
+            'result': job['result'],
+            'error': job['error'],
+            'parameters': job['parameters']}
@@ -4,15 +4,23 @@ Module with class to work with local data sources.
 
 import json
 import os
+import pickle
 
 import pandas as pd
 
+from django.conf import settings
+
 from ._basereader import BaseReader
+from .profiling import DatasetProfiler
+
+CHUNK_SIZE_DEFAULT = 100000  # number of rows per chunk
+# format of the stored dataset (sequence of pickled DataFrame chunks)
+STORED_FILE_FORMAT = 'chunks'
 
 
 class LocalReader(BaseReader):
 
-    SOURCE_FILE_FORMATS = ['csv', 'json']
+    SOURCE_FILE_FORMATS = ['csv', 'json', STORED_FILE_FORMAT]
 
     def read_df(self, file_path, file_format=None, **kwargs):
         """
@@ -30,6 +38,8 @@ class LocalReader(BaseReader):
 
         :keyword orient: Indication of expected JSON string format.
 
+        :keyword usecols: Requested columns of the stored dataset.
+
         :return: Data for analysis.
         :rtype: DataFrame
         """
@@ -48,6 +58,8 @@ class LocalReader(BaseReader):
             data = self._from_csv(file_path=file_path, **kwargs)
         elif file_format == 'json':
             data = self._from_json(file_path=file_path, **kwargs)
+        elif file_format == STORED_FILE_FORMAT:
+            data = self._from_chunks(file_path=file_path, **kwargs)
 
         # check the consistency of data
         # self._check_data_format(data=data)
@@ -74,6 +86,134 @@ class LocalReader(BaseReader):
         """
         return pd.read_csv(file_path, **kwargs)
 
+    def _from_chunks(self, file_path, **kwargs):
+        """
+        Read data of DataFrame format from the stored dataset file.
+
+        :param file_path: Full file path.
+        :type file_path: str
+        :param kwargs: Additional parameters.
+        :type kwargs: dict
+
+        :keyword usecols: Requested columns (default: all columns).
+
+        :return: Data for analysis.
+        :rtype: DataFrame
+        """
+        usecols = kwargs.get('usecols')
+
+        chunks = []
+        with open(file_path, 'rb') as f:
+            while True:
+                try:
+                    chunk = pickle.load(f)
+                except EOFError:
+                    break
+
+                if usecols and not chunks:
+                    # keep the order of columns (as it is for csv-file)
+                    _set = set(usecols)
+                    usecols = [x for x in chunk.columns if x in _set]
+                    if len(usecols) != len(_set):
+                        raise ValueError('Requested columns are missing: {}'.
+                                         format(_set.difference(usecols)))
+                chunks.append(chunk.loc[:, usecols] if usecols else chunk)
+
+        return pd.concat(chunks) if chunks else pd.DataFrame()
+
+    def read_csv_chunks(self, file_path, chunksize=None, **kwargs):
+        """
+        Read data of DataFrame format from csv-file by chunks.
+
+        :param file_path: Full file path.
+        :type file_path: str
+        :param chunksize: Number of rows per chunk.
+        :type chunksize: int/None
+        :param kwargs: Additional parameters (see "_from_csv").
+        :type kwargs: dict
+
+        :return: Iterator over chunks of data.
+        :rtype: pandas.io.parsers.TextFileReader
+        """
+        if not os.path.isfile(file_path):
+            raise Exception('Provided file does not exist.')
+
+        return pd.read_csv(file_path,
+                           chunksize=chunksize or CHUNK_SIZE_DEFAULT,
+                           **kwargs)
+
+    @staticmethod
+    def store_chunks(chunks, file_path):
+        """
+        Store data chunks into the file (of the stored dataset format) and
+        collect dataset descriptive information (stats) at the same pass
+        (large datasets are profiled approximately with bounded memory).
+
+        :param chunks: Chunks of data.
+        :type chunks: iterable
+        :param file_path: Full file path.
+        :type file_path: str
+
+        :return: Dataset profiler (with collected statistics).
+        :rtype: profiling.DatasetProfiler
+        """
+        profiler = DatasetProfiler(
+            approximate_min_records=getattr(
+                settings, 'PROFILING_APPROXIMATE_MIN_RECORDS', None),
+            error=getattr(settings, 'PROFILING_ERROR', None))
+
+        tmp_file_path = '{}.tmp'.format(file_path)
+        try:
+            with open(tmp_file_path, 'wb') as f:
+                for chunk in chunks:
+                    profiler.update(chunk)
+                    pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file_path, file_path)
+        except Exception:
+            if os.path.isfile(tmp_file_path):
+                os.remove(tmp_file_path)
+            raise
+
+        return profiler
+
+    def ingest_csv(self, file_path, target_file_path, chunksize=None):
+        """
+        Read data from csv-file by chunks (the 1st column is used as index,
+        the 1st row is used as names) and store it as the stored dataset.
+
+        :param file_path: Full file path of the csv-file.
+        :type file_path: str
+        :param target_file_path: Full file path of the stored dataset.
+        :type target_file_path: str
+        :param chunksize: Number of rows per chunk.
+        :type chunksize: int/None
+
+        :return: Dataset profiler (with collected statistics).
+        :rtype: profiling.DatasetProfiler
+        """
+        profiler = self.store_chunks(
+            chunks=self.read_csv_chunks(file_path=file_path,
+                                        chunksize=chunksize,
+                                        **{'index_col': 0,
+                                           'header': 0}),
+            file_path=target_file_path)
+
+        # data types are inferred per chunk, thus features that are numeric
+        # in some chunks only are read again as strings (as if the whole
+        # csv-file was read at once)
+        mixed_type_features = profiler.get_mixed_type_features()
+        if mixed_type_features:
+            profiler = self.store_chunks(
+                chunks=self.read_csv_chunks(
+                    file_path=file_path,
+                    chunksize=chunksize,
+                    **{'index_col': 0,
+                       'header': 0,
+                       'dtype': {x: str for x in mixed_type_features}}),
+                file_path=target_file_path)
+
+        return profiler
+
     def _from_json(self, file_path, **kwargs):
         """
         Read data of DataFrame format from json-file.
@@ -0,0 +1,799 @@
+"""
+Module with methods to get descriptive statistics of dataset features
+(for the whole dataset or incrementally, e.g., while the dataset is read
+by chunks).
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from .sketches import ERROR_DEFAULT, HyperLogLog, KLLSketch, ReservoirSample
+
+NUMERIC_TYPES = ['int64', 'float64', 'int32', 'float32', 'int', 'float']
+QUANTILES = [.1, .25, .5, .75, .9]
+QUANTILE_NAMES = ['q10', 'q25', 'q50', 'q75', 'q90']
+# feature is considered as categorical if the ratio of unique values is less
+CATEGORY_RATIO_MAX = .1
+# name parts of object features that might contain datetime values
+DATETIME_NAME_PARTS = ['time', 'date', 'start', 'end']
+# explicit formats to probe datetime values with (e.g., PanDA timestamps)
+DATETIME_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S',
+                    '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S.%f',
+                    '%Y-%m-%d %H:%M', '%Y-%m-%d']
+DATETIME_SAMPLE_SIZE = 100  # number of values to detect datetime format
+
+# detected datetime formats per feature name (None - format is inferred)
+_datetime_formats = {}
+NUM_NON_CATEGORICAL_VALUES = 10
+# limits of values kept per feature for exact profiling, the feature is
+# profiled approximately once they are exceeded (if approximate profiling
+# is enabled)
+EXACT_MAX_VALUES = 100000  # numeric values (for exact quantiles)
+EXACT_MAX_UNIQUE_VALUES = 10000  # unique values with counts
+
+
+def merge_dtypes(dtype, other):
+    """
+    Get the common data type of two parts of the feature (as it would be
+    inferred for the whole feature).
+
+    :param dtype: Data type of the first part.
+    :type dtype: numpy.dtype
+    :param other: Data type of the second part.
+    :type other: numpy.dtype
+    :return: Common data type.
+    :rtype: numpy.dtype
+    """
+    if dtype == other:
+        return dtype
+    if dtype.kind in 'iuf' and other.kind in 'iuf':
+        return np.promote_types(dtype, other)
+    return np.dtype(object)
+
+
+def get_sample_size(error=None):
+    """
+    Get size of the sample that gives the required error of frequencies
+    (the standard error of a frequency is less than 1/sqrt(size)).
+
+    :param error: Required error.
+    :type error: float/None
+    :return: Sample size.
+    :rtype: int
+    """
+    return int(math.ceil(1. / (error or ERROR_DEFAULT) ** 2))
+
+
+def is_category(num_unique, count):
+    """
+    Check whether the feature is categorical (by the ratio of unique values).
+
+    :param num_unique: Number of unique values.
+    :type num_unique: int
+    :param count: Number of values (without missing values).
+    :type count: int
+    :return: Flag that the feature is categorical.
+    :rtype: bool
+    """
+    return float(num_unique) / count < CATEGORY_RATIO_MAX
+
+
+def get_distribution(unique_values, unique_counts):
+    """
+    Get number of objects per unique value (ordered by the number).
+
+    :param unique_values: Unique values (in order of the first appearance).
+    :type unique_values: pandas.Index
+    :param unique_counts: Number of objects per unique value.
+    :type unique_counts: numpy.ndarray
+    :return: Unique values and the corresponding numbers of objects.
+    :rtype: list
+    """
+    order = np.argsort(-unique_counts, kind='mergesort')
+    return list(zip(unique_values[order].tolist(),
+                    unique_counts[order].tolist()))
+
+
+def get_numeric_stats(data, sample=None):
+    """
+    Get statistical metrics of numeric features (all features are
+    processed by vectorized operations).
+
+    :param data: Numeric features.
+    :type data: pandas.DataFrame
+    :param sample: Sample of numeric features (to estimate quantiles).
+    :type sample: pandas.DataFrame/None
+    :return: Statistical metrics per feature.
+    :rtype: dict
+    """
+    stats = pd.DataFrame({'min': data.min(),
+                          'max': data.max(),
+                          'mean': data.mean(),
+                          'std': data.std()})
+    quantiles = (data if sample is None else sample).quantile(QUANTILES)
+
+    output = {}
+    for idx, column in enumerate(data.columns):
+        dtype = data.iloc[:, idx].dtype
+        item = {
+            # min/max keep the data type of the feature
+            'min': dtype.type(stats['min'].iat[idx]),
+            'max': dtype.type(stats['max'].iat[idx]),
+            'mean': stats['mean'].iat[idx],
+            'std': stats['std'].iat[idx]}
+        item.update(zip(QUANTILE_NAMES, quantiles.iloc[:, idx].tolist()))
+        output[column] = item
+    return output
+
+
+def get_feature_description(name, dtype, num_records, count, unique_values,
+                            unique_counts, numeric_stats=None,
+                            datetime_range=None, unique_number=None,
+                            approximate=None):
+    """
+    Get the description of the feature with descriptive and statistical
+    metrics.
+
+    :param name: Feature name.
+    :type name: str
+    :param dtype: Data type of the feature.
+    :type dtype: numpy.dtype
+    :param num_records: Number of objects in the dataset.
+    :type num_records: int
+    :param count: Number of values (without missing values).
+    :type count: int
+    :param unique_values: Unique values (in order of the first appearance).
+    :type unique_values: pandas.Index
+    :param unique_counts: Number of objects per unique value.
+    :type unique_counts: numpy.ndarray
+    :param numeric_stats: Statistical metrics of the continuous feature.
+    :type numeric_stats: dict/None
+    :param datetime_range: Min and max values of the datetime feature.
+    :type datetime_range: tuple/None
+    :param unique_number: Number of unique values (if not all unique values
+        are provided).
+    :type unique_number: int/None
+    :param approximate: Names of metrics with approximate values.
+    :type approximate: list/None
+    :return: Feature description.
+    :rtype: dict
+    """
+    output = {
+        'feature_name': name,
+        'feature_type': dtype.name,
+        'percentage_missing': ((num_records - count) * 100.) / num_records,
+        'measure_type': 'unknown'}
+
+    if unique_number is None:
+        unique_number = len(unique_values)
+
+    if output['feature_type'] in NUMERIC_TYPES:
+
+        if is_category(unique_number, count):
+            output.update({
+                'measure_type': 'ordinal',
+                'unique_values': unique_values.tolist(),
+                'unique_number': unique_number,
+                'distribution': {str(k): v for k, v in get_distribution(
+                    unique_values, unique_counts)},
+                'enabled': 'false'})
+        else:
+            output.update({'measure_type': 'continuous'})
+            output.update(numeric_stats)
+            output.update({'enabled': 'true'})
+
+    elif output['feature_type'] == 'object':
+
+        output.update({
+            'measure_type': 'nominal',
+            'unique_number': unique_number,
+            'distribution': {},
+            'enabled': 'false'})
+
+        if datetime_range is not None:
+            output.update({
+                'measure_type': 'range',
+                'unique_values': [datetime_range[0].isoformat(),
+                                  datetime_range[1].isoformat()]})
+
+        elif is_category(unique_number, count):
+            output.update({
+                'unique_values': unique_values.tolist(),
+                'distribution': dict(get_distribution(unique_values,
+                                                      unique_counts))})
+        else:
+            output.update({
+                'measure_type': 'non-categorical',
+                'unique_values': unique_values[
+                    :NUM_NON_CATEGORICAL_VALUES].tolist()})
+
+    if approximate:
+        output['approximate'] = [x for x in approximate if x in output]
+
+    return output
+
+
+def is_datetime_candidate(name, dtype):
+    """
+    Check whether the feature might contain datetime values.
+
+    :param name: Feature name.
+    :type name: str
+    :param dtype: Data type of the feature.
+    :type dtype: numpy.dtype
+    :return: Flag that the feature should be checked for datetime values.
+    :rtype: bool
+    """
+    return (dtype.name == 'object' and
+            any(n in name for n in DATETIME_NAME_PARTS))
+
+
+def get_datetime_format(values, name=None):
+    """
+    Detect the datetime format by the sample of values (the format that was
+    detected for the feature with the same name is probed first).
+
+    :param values: Feature values (without missing values).
+    :type values: pandas.Series
+    :param name: Feature name (to cache the detected format).
+    :type name: str/None
+    :return: Flag that values are datetime and the detected format
+        (None if the format can be inferred only).
+    :rtype: tuple
+    """
+    step = max(len(values.index) // DATETIME_SAMPLE_SIZE, 1)
+    sample = values.iloc[::step]
+
+    formats = list(DATETIME_FORMATS)
+    if _datetime_formats.get(name) is not None:
+        formats.insert(0, _datetime_formats[name])
+
+    for dt_format in formats:
+        try:
+            pd.to_datetime(sample, format=dt_format)
+        except (ValueError, TypeError):
+            continue
+        else:
+            if name is not None:
+                _datetime_formats[name] = dt_format
+            return True, dt_format
+
+    try:
+        pd.to_datetime(sample)
+    except (ValueError, TypeError, OverflowError):
+        return False, None
+    if name is not None:
+        _datetime_formats[name] = None
+    return True, None
+
+
+def to_datetime(values, dt_format=None):
+    """
+    Convert values into datetime values (all values at once).
+
+    :param values: Feature values (without missing values).
+    :type values: pandas.Series
+    :param dt_format: Datetime format (None - format is inferred).
+    :type dt_format: str/None
+    :return: Datetime values (None if values can not be converted).
+    :rtype: pandas.Series/None
+    """
+    try:
+        return pd.to_datetime(values, format=dt_format, cache=True)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def get_datetime_range(values, name=None):
+    """
+    Get the range of datetime values (values are probed by the sample,
+    then converted with the detected format).
+
+    :param values: Feature values (without missing values).
+    :type values: pandas.Series
+    :param name: Feature name (to cache the detected format).
+    :type name: str/None
+    :return: Min and max values (None if values are not datetime).
+    :rtype: tuple/None
+    """
+    is_datetime, dt_format = get_datetime_format(values, name=name)
+    if not is_datetime:
+        return None
+
+    dt_object = to_datetime(values, dt_format=dt_format)
+    if dt_object is None and dt_format is not None:
+        # values of other formats are not in the sample
+        dt_object = to_datetime(values)
+    if dt_object is None:
+        return None
+    return dt_object.min(), dt_object.max()
+
+
+def get_features_description(df, approximate_min_records=None, error=None):
+    """
+    Get list of features with descriptive and statistical metrics
+    (unique values are counted by one pass per feature, numeric metrics
+    are calculated for all continuous features at once).
+
+    Approximate profiling: quantiles of continuous features are taken from
+    the random sample of objects (unique values are counted exactly, since
+    the dataset is already loaded, and hash-based counting is not slower
+    than the distinct count sketch).
+
+    :param df: Dataset for features analysis.
+    :type df: pandas.DataFrame
+    :param approximate_min_records: Minimum number of objects to use
+        approximate profiling (None - exact profiling only).
+    :type approximate_min_records: int/None
+    :param error: Error of approximate metrics.
+    :type error: float/None
+    :return: Feature descriptions.
+    :rtype: list
+    """
+    num_records = len(df.index)
+    counts = df.count()
+
+    features = []
+    for idx, column in enumerate(df.columns):
+        count = int(counts.iat[idx])
+        if not count:
+            continue
+
+        codes, unique_values = pd.factorize(df.iloc[:, idx])
+        unique_counts = np.bincount(codes[codes >= 0],
+                                    minlength=len(unique_values))
+        features.append((idx, count, pd.Index(unique_values), unique_counts))
+
+    continuous = [idx for idx, count, unique_values, _ in features
+                  if (df.iloc[:, idx].dtype.name in NUMERIC_TYPES and
+                      not is_category(len(unique_values), count))]
+
+    sample = None
+    if (continuous and approximate_min_records is not None and
+            num_records >= approximate_min_records):
+        sample = df.iloc[:, continuous].sample(
+            n=min(num_records, get_sample_size(error)), random_state=0)
+
+    numeric_stats = dict(zip(continuous, get_numeric_stats(
+        df.iloc[:, continuous], sample=sample).values())) \
+        if continuous else {}
+
+    output = []
+    for idx, count, unique_values, unique_counts in features:
+        column, values = df.columns[idx], df.iloc[:, idx]
+
+        datetime_range = None
+        if is_datetime_candidate(column, values.dtype):
+            datetime_range = get_datetime_range(values.dropna(),
+                                                name=column)
+
+        output.append(get_feature_description(
+            name=column,
+            dtype=values.dtype,
+            num_records=num_records,
+            count=count,
+            unique_values=unique_values,
+            unique_counts=unique_counts,
+            numeric_stats=numeric_stats.get(idx),
+            datetime_range=datetime_range,
+            approximate=(QUANTILE_NAMES if sample is not None and
+                         idx in numeric_stats else None)))
+    return output
+
+
+class FeatureAccumulator(object):
+
+    def __init__(self, name, max_exact_values=None,
+                 max_exact_unique_values=None, error=None):
+        """
+        Initialization.
+
+        :param name: Feature name.
+        :type name: str
+        :param max_exact_values: Maximum number of numeric values kept for
+            exact quantiles (None - no limit).
+        :type max_exact_values: int/None
+        :param max_exact_unique_values: Maximum number of unique values
+            counted exactly (None - no limit).
+        :type max_exact_unique_values: int/None
+        :param error: Error of approximate metrics (if limits are exceeded).
+        :type error: float/None
+        """
+        self.name = name
+        self.is_mixed_type = False  # numeric in some parts only
+        self.max_exact_values = max_exact_values
+        self.max_exact_unique_values = max_exact_unique_values
+        self.dtype = None
+        self.count = 0
+
+        # moments of numeric values
+        self._num_values = 0
+        self._mean = 0.
+        self._m2 = 0.
+        self._min = None
+        self._max = None
+        self._values = []  # numeric values (for exact quantiles)
+
+        # in order of the first appearance (None - too many unique values)
+        self._value_counts = {}
+        self._first_values = []
+
+        self._check_datetime = any(n in name for n in DATETIME_NAME_PARTS)
+        self._datetime_range = None
+        self._datetime_format = None
+
+        # approximate profiling
+        self.approximate = False
+        self._error = error
+        self._quantiles = None
+        self._distinct = None
+        self._sample = None
+
+    def set_approximate(self, error=None):
+        """
+        Switch to approximate profiling (numeric values are moved into the
+        quantiles sketch, values are sampled, and unique values are counted
+        by the distinct count sketch if there are too many of them).
+
+        :param error: Error of approximate metrics.
+        :type error: float/None
+        """
+        if self.approximate:
+            return
+
+        self.approximate = True
+        self._error = error or self._error or ERROR_DEFAULT
+
+        self._quantiles = KLLSketch(error=self._error, random_state=0)
+        for values in self._values:
+            self._quantiles.update(values)
+        del self._values[:]
+
+        self._sample = ReservoirSample(size=get_sample_size(self._error),
+                                       random_state=0)
+        if self._value_counts:
+            # sample of all seen values (the order of values is not needed)
+            self._sample.update(np.repeat(
+                self._get_values_index().values,
+                list(self._value_counts.values())))
+            if len(self._value_counts) > self._sample.size:
+                self._set_distinct_count()
+
+    def _set_distinct_count(self):
+        """
+        Replace value counts by the distinct count sketch (if there are
+        too many unique values for approximate profiling).
+        """
+        self._distinct = HyperLogLog(error=self._error)
+        self._distinct.update(self._get_values_index().values)
+        self._first_values = list(self._value_counts)[
+            :NUM_NON_CATEGORICAL_VALUES]
+        self._value_counts = None
+
+    def update(self, values):
+        """
+        Update statistics with the next part of feature values.
+
+        :param values: Feature values.
+        :type values: pandas.Series
+        """
+        if self.dtype is None:
+            self.dtype = values.dtype
+        else:
+            dtype = merge_dtypes(self.dtype, values.dtype)
+            if dtype.kind == 'O' and (self.dtype.kind != 'O' or
+                                      values.dtype.kind != 'O'):
+                self.is_mixed_type = True
+            self.dtype = dtype
+
+        values = values.dropna()
+        if values.empty:
+            return
+        self.count += values.size
+
+        if values.dtype.name in NUMERIC_TYPES:
+            self._update_moments(values.values)
+
+        if self._value_counts is not None:
+            codes, unique_values = pd.factorize(values)
+            if (self.approximate and len(self._value_counts) +
+                    len(unique_values) > self._sample.size):
+                # there are too many unique values to count them
+                self._set_distinct_count()
+
+        if self._value_counts is not None:
+            unique_counts = np.bincount(codes, minlength=len(unique_values))
+            for value, count in zip(unique_values.tolist(),
+                                    unique_counts.tolist()):
+                self._value_counts[value] = (
+                    self._value_counts.get(value, 0) + count)
+        else:
+            self._distinct.update(values.values)
+
+        if self.approximate:
+            self._sample.update(values.values)
+
+        if self._check_datetime:
+            self._update_datetime_range(values)
+
+        if not self.approximate and self._is_exact_limit_exceeded():
+            self.set_approximate()
+
+    def _is_exact_limit_exceeded(self):
+        """
+        Check whether there are too many values kept for exact profiling.
+
+        :return: Flag that limits are exceeded.
+        :rtype: bool
+        """
+        return ((self.max_exact_values is not None and
+                 self._num_values > self.max_exact_values) or
+                (self.max_exact_unique_values is not None and
+                 len(self._value_counts) > self.max_exact_unique_values))
+
+    def _update_moments(self, values):
+        """
+        Merge moments of numeric values (parallel algorithm by Chan et al.).
+
+        :param values: Numeric values (without NaN).
+        :type values: numpy.ndarray
+        """
+        num_values = values.size
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+
+        total = self._num_values + num_values
+        delta = mean - self._mean
+        self._mean += delta * num_values / total
+        self._m2 += m2 + delta ** 2 * self._num_values * num_values / total
+        self._num_values = total
+
+        min_value, max_value = values.min(), values.max()
+        self._min = min_value if self._min is None else min(self._min,
+                                                            min_value)
+        self._max = max_value if self._max is None else max(self._max,
+                                                            max_value)
+        if self.approximate:
+            self._quantiles.update(values)
+        else:
+            self._values.append(values)
+
+    def _update_datetime_range(self, values):
+        """
+        Update the range of datetime values (datetime check is stopped
+        if values can not be converted; the datetime format is detected
+        by the first part of values).
+
+        :param values: Feature values (without NaN).
+        :type values: pandas.Series
+        """
+        if values.dtype.name != 'object':
+            self._check_datetime = False
+            return
+
+        if self._datetime_range is None:
+            self._check_datetime, self._datetime_format = \
+                get_datetime_format(values, name=self.name)
+            if not self._check_datetime:
+                return
+
+        dt_object = to_datetime(values, dt_format=self._datetime_format)
+        if dt_object is None and self._datetime_format is not None:
+            # values of other formats are in this part
+            self._datetime_format = None
+            dt_object = to_datetime(values)
+
+        if dt_object is None:
+            self._check_datetime = False
+        else:
+            dt_min, dt_max = dt_object.min(), dt_object.max()
+            if self._datetime_range is not None:
+                dt_min = min(dt_min, self._datetime_range[0])
+                dt_max = max(dt_max, self._datetime_range[1])
+            self._datetime_range = (dt_min, dt_max)
+
+    def _get_values_index(self, values=None):
+        """
+        Get unique values of the feature (in order of the first appearance).
+
+        :param values: Unique values (default: values with counts).
+        :type values: list/None
+        :return: Unique values with the common data type.
+        :rtype: pandas.Index
+        """
+        output = pd.Index(list(self._value_counts if values is None
+                               else values), dtype=object)
+        if self.dtype.name in NUMERIC_TYPES:
+            output = output.astype(self.dtype)
+        return output
+
+    def _get_numeric_stats(self):
+        """
+        Get statistical metrics of numeric values.
+
+        :return: Statistical metrics.
+        :rtype: dict
+        """
+        output = {
+            'min': self._min,
+            'max': self._max,
+            'mean': self._mean,
+            'std': (np.sqrt(self._m2 / (self._num_values - 1))
+                    if self._num_values > 1 else np.nan)}
+        if self.approximate:
+            quantiles = self._quantiles.quantile(QUANTILES)
+        else:
+            quantiles = np.percentile(np.concatenate(self._values),
+                                      [q * 100 for q in QUANTILES])
+        output.update(zip(QUANTILE_NAMES, quantiles))
+        return output
+
+    def _get_sampled_values(self):
+        """
+        Get unique values of the sample and estimated numbers of objects.
+
+        :return: Unique values and the corresponding numbers of objects.
+        :rtype: tuple
+        """
+        sample = self._sample.values
+        codes, unique_values = pd.factorize(sample)
+        unique_counts = np.round(
+            np.bincount(codes, minlength=len(unique_values)) *
+            float(self.count) / len(sample)).astype(np.int64)
+        return self._get_values_index(unique_values), unique_counts
+
+    def get_description(self, num_records):
+        """
+        Get the description of the feature with descriptive and statistical
+        metrics.
+
+        :param num_records: Number of objects in the dataset.
+        :type num_records: int
+        :return: Feature description (None if feature has no values).
+        :rtype: dict/None
+        """
+        if not self.count:
+            return None
+
+        approximate = []
+        unique_number = None
+        if self._value_counts is not None:
+            unique_values = self._get_values_index()
+            unique_counts = np.fromiter(self._value_counts.values(),
+                                        dtype=np.int64,
+                                        count=len(self._value_counts))
+        else:
+            unique_number = self._distinct.count()
+            approximate.append('unique_number')
+            if is_category(unique_number, self.count):
+                unique_values, unique_counts = self._get_sampled_values()
+                approximate.extend(['unique_values', 'distribution'])
+            else:
+                unique_values = self._get_values_index(self._first_values)
+                unique_counts = np.ones(len(unique_values), dtype=np.int64)
+
+        numeric_stats = None
+        if (self.dtype.name in NUMERIC_TYPES and not is_category(
+                len(unique_values) if unique_number is None
+                else unique_number, self.count)):
+            numeric_stats = self._get_numeric_stats()
+            if self.approximate:
+                approximate.extend(QUANTILE_NAMES)
+
+        return get_feature_description(
+            name=self.name,
+            dtype=self.dtype,
+            num_records=num_records,
+            count=self.count,
+            unique_values=unique_values,
+            unique_counts=unique_counts,
+            numeric_stats=numeric_stats,
+            datetime_range=(self._datetime_range if self._check_datetime
+                            else None),
+            unique_number=unique_number,
+            approximate=approximate)
+
+
+class DatasetProfiler(object):
+
+    def __init__(self, approximate_min_records=None, error=None):
+        """
+        Initialization.
+
+        :param approximate_min_records: Number of objects after which
+            approximate profiling is used (None - exact profiling only),
+            features with too many values are profiled approximately
+            earlier (see EXACT_MAX_VALUES, EXACT_MAX_UNIQUE_VALUES).
+        :type approximate_min_records: int/None
+        :param error: Error of approximate metrics.
+        :type error: float/None
+        """
+        self.index_name = None
+        self.num_records = 0
+        self.approximate_min_records = approximate_min_records
+        self.error = error
+        self._features = {}
+
+    @property
+    def approximate(self):
+        return (self.approximate_min_records is not None and
+                self.num_records >= self.approximate_min_records)
+
+    def _get_feature_accumulator(self, name):
+        """
+        Create accumulator of feature statistics (values kept for exact
+        profiling are limited if approximate profiling is enabled).
+
+        :param name: Feature name.
+        :type name: str
+        :return: Feature accumulator.
+        :rtype: FeatureAccumulator
+        """
+        if self.approximate_min_records is None:
+            return FeatureAccumulator(name=name)
+        return FeatureAccumulator(
+            name=name,
+            max_exact_values=EXACT_MAX_VALUES,
+            max_exact_unique_values=EXACT_MAX_UNIQUE_VALUES,
+            error=self.error)
+
+    def update(self, data):
+        """
+        Update statistics with the next part of the dataset (rows with
+        no values are not taken into account).
+
+        :param data: Part of the dataset.
+        :type data: pandas.DataFrame
+        """
+        if not self.num_records:
+            self.index_name = data.index.name
+
+        data = data.dropna(axis=0, how='all')
+        self.num_records += len(data.index)
+
+        approximate = self.approximate
+        for column in data:
+            if column not in self._features:
+                self._features[column] = self._get_feature_accumulator(
+                    name=column)
+            if approximate:
+                self._features[column].set_approximate(error=self.error)
+            self._features[column].update(data[column])
+
+    def get_mixed_type_features(self):
+        """
+        Get features that are not numeric, but have numeric parts (since
+        data types are inferred per part of the dataset).
+
+        :return: Feature names.
+        :rtype: list
+        """
+        return [name for name, feature in self._features.items()
+                if feature.is_mixed_type]
+
+    def get_features_description(self):
+        """
+        Get list of features with descriptive and statistical metrics.
+
+        :return: Feature descriptions.
+        :rtype: list
+        """
+        output = []
+        for feature in self._features.values():
+            item = feature.get_description(num_records=self.num_records)
+            if item is not None:
+                output.append(item)
+        return output
+
+    def get_stats(self):
+        """
+        Get dataset descriptive information (stats).
+
+        :return: Index name, number of objects and feature descriptions.
+        :rtype: dict
+        """
+        return {'index_name': self.index_name,
+                'num_records': self.num_records,
+                'features': self.get_features_description()}
@@ -0,0 +1,223 @@
+"""
+Module with streaming sketches to estimate statistics of large datasets
+with bounded memory (reservoir sample, distinct count, quantiles).
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+ERROR_DEFAULT = .01  # relative error (or normalized rank error)
+
+
+class ReservoirSample(object):
+
+    def __init__(self, size, random_state=None):
+        """
+        Initialization.
+
+        :param size: Maximum number of sampled values.
+        :type size: int
+        :param random_state: Seed or random state.
+        :type random_state: int/numpy.random.RandomState/None
+        """
+        self.size = size
+        self.num_seen = 0
+        self._values = None
+        self._random_state = (
+            random_state if isinstance(random_state, np.random.RandomState)
+            else np.random.RandomState(random_state))
+
+    @property
+    def values(self):
+        if self._values is None:
+            return np.array([])
+        return self._values[:min(self.num_seen, self.size)]
+
+    def update(self, values):
+        """
+        Update sample with the next part of values (each seen value is
+        kept with the same probability).
+
+        :param values: Values.
+        :type values: numpy.ndarray
+        """
+        num_values = len(values)
+        if not num_values:
+            return
+
+        if self._values is None:
+            self._values = np.empty(self.size, dtype=values.dtype)
+        elif self._values.dtype != values.dtype:
+            self._values = self._values.astype(
+                np.promote_types(self._values.dtype, values.dtype)
+                if values.dtype.kind in 'iuf' and self._values.dtype.kind
+                in 'iuf' else object)
+
+        num_free = max(0, min(self.size - self.num_seen, num_values))
+        if num_free:
+            self._values[self.num_seen:self.num_seen + num_free] = \
+                values[:num_free]
+
+        if num_free < num_values:
+            # i-th value replaces a random item with probability size/i
+            positions = np.arange(self.num_seen + num_free + 1,
+                                  self.num_seen + num_values + 1)
+            slots = (self._random_state.random_sample(len(positions)) *
+                     positions).astype(np.int64)
+            is_selected = slots < self.size
+            self._values[slots[is_selected]] = \
+                values[num_free:][is_selected]
+
+        self.num_seen += num_values
+
+
+class HyperLogLog(object):
+
+    def __init__(self, error=None):
+        """
+        Initialization.
+
+        :param error: Relative standard error of the distinct count.
+        :type error: float/None
+        """
+        error = error or ERROR_DEFAULT
+        # standard error is 1.04/sqrt(m), where m - number of registers
+        self.precision = min(max(int(math.ceil(
+            math.log2((1.04 / error) ** 2))), 4), 18)
+        self.num_registers = 1 << self.precision
+        self._registers = np.zeros(self.num_registers, dtype=np.uint8)
+
+    def update(self, values):
+        """
+        Update registers with the next part of values.
+
+        :param values: Values.
+        :type values: numpy.ndarray
+        """
+        if not len(values):
+            return
+
+        hashes = pd.util.hash_array(np.asarray(values), categorize=False)
+        register_ids = (hashes >> np.uint64(64 - self.precision)).astype(
+            np.int64)
+        # rank - position of the leftmost 1-bit in the lower 32 bits
+        tails = (hashes & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        ranks = np.full(len(tails), 33, dtype=np.uint8)
+        is_nonzero = tails > 0
+        ranks[is_nonzero] = 32 - np.floor(
+            np.log2(tails[is_nonzero])).astype(np.uint8)
+        # max rank per register: ranks are assigned in ascending order,
+        # thus the last (max) one is kept (faster than ufunc.at)
+        order = np.argsort(ranks, kind='mergesort')
+        registers = np.zeros(self.num_registers, dtype=np.uint8)
+        registers[register_ids[order]] = ranks[order]
+        np.maximum(self._registers, registers, out=self._registers)
+
+    def merge(self, other):
+        """
+        Merge with another sketch (of the same precision).
+
+        :param other: Another sketch.
+        :type other: HyperLogLog
+        """
+        np.maximum(self._registers, other._registers, out=self._registers)
+
+    def count(self):
+        """
+        Get the estimated number of distinct values.
+
+        :return: Number of distinct values.
+        :rtype: int
+        """
+        m = self.num_registers
+        alpha = {16: .673, 32: .697, 64: .709}.get(m, .7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / np.power(
+            2., -self._registers.astype(np.float64)).sum()
+
+        num_zeros = int((self._registers == 0).sum())
+        if estimate <= 2.5 * m and num_zeros:
+            # small range correction (linear counting)
+            estimate = m * math.log(float(m) / num_zeros)
+        return int(round(estimate))
+
+
+class KLLSketch(object):
+
+    def __init__(self, error=None, random_state=None):
+        """
+        Initialization.
+
+        :param error: Normalized rank error of quantiles (approximately).
+        :type error: float/None
+        :param random_state: Seed or random state.
+        :type random_state: int/numpy.random.RandomState/None
+        """
+        error = error or ERROR_DEFAULT
+        # normalized rank error is about 1.7/k
+        self.k = max(int(math.ceil(1.7 / error)), 8)
+        self.count = 0
+        self._compactors = [np.array([], dtype=np.float64)]
+        self._random_state = (
+            random_state if isinstance(random_state, np.random.RandomState)
+            else np.random.RandomState(random_state))
+
+    def _get_capacity(self, level):
+        depth = len(self._compactors) - level - 1
+        return max(int(math.ceil(self.k * (2. / 3.) ** depth)), 2)
+
+    def update(self, values):
+        """
+        Update sketch with the next part of values.
+
+        :param values: Numeric values (without NaN).
+        :type values: numpy.ndarray
+        """
+        if not len(values):
+            return
+
+        self.count += len(values)
+        self._compactors[0] = np.concatenate(
+            [self._compactors[0], np.asarray(values, dtype=np.float64)])
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self._compactors):
+            items = self._compactors[level]
+            if len(items) >= self._get_capacity(level):
+                if level + 1 == len(self._compactors):
+                    self._compactors.append(np.array([], dtype=np.float64))
+
+                items = np.sort(items)
+                # odd item (if any) stays at the current level
+                num_kept = len(items) % 2
+                offset = self._random_state.randint(2)
+                promoted = items[num_kept:][offset::2]
+                self._compactors[level] = items[:num_kept]
+                self._compactors[level + 1] = np.concatenate(
+                    [self._compactors[level + 1], promoted])
+            level += 1
+
+    def quantile(self, q):
+        """
+        Get estimated quantiles.
+
+        :param q: Quantiles (values between 0 and 1).
+        :type q: list
+        :return: Quantile values.
+        :rtype: numpy.ndarray
+        """
+        values = np.concatenate(self._compactors)
+        weights = np.concatenate([np.full(len(items), 2. ** level)
+                                  for level, items
+                                  in enumerate(self._compactors)])
+        if not len(values):
+            return np.full(len(q), np.nan)
+
+        order = np.argsort(values, kind='mergesort')
+        values, cum_weights = values[order], np.cumsum(weights[order])
+        ranks = np.asarray(q, dtype=np.float64) * cum_weights[-1]
+        idx = np.searchsorted(cum_weights, ranks, side='left')
+        return values[np.minimum(idx, len(values) - 1)]
@@ -137,3 +137,57 @@ mimetypes.add_type("text/javascript", ".js", True)
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = 157286400
 FILE_UPLOAD_MAX_MEMORY_SIZE = 157286400
+
+# Format of stored history data (values: binary, json)
+# (history files of the legacy "json" format are migrated into "binary")
+HISTORY_STORAGE_FORMAT = 'binary'
+
+# Maximum size of loaded history data cached per process (in bytes, 0 - off)
+HISTORY_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Storage mode of Level-of-Detail groups (values: eager, lazy)
+# ("lazy" - only group labels are stored, groups are formed on drill-down)
+GROUPS_STORAGE_MODE = 'lazy'
+
+# Number of objects after which dataset features are profiled approximately
+# (quantiles by sketches/samples; None - exact profiling only)
+PROFILING_APPROXIMATE_MIN_RECORDS = 1000000
+# Error of approximate profiling (relative/normalized rank error)
+PROFILING_ERROR = .01
+
+# Transport of dataset arrays to the front end (values: inline, binary)
+# ("binary" - column-oriented typed arrays requested from the data endpoint)
+VIEW_DATA_TRANSPORT = 'binary'
+
+# Flag to send visualization pages by streaming responses (dataset arrays
+# are emitted by chunks and compressed by gzip on the fly)
+VIEW_STREAMING_RESPONSE = True
+
+# Number of the strongest correlated pairs of features that are sent instead
+# of the full correlation matrix if it has more pairs (None - full matrix)
+# (5000 pairs - about 100 numeric features)
+CORRELATION_TOP_K = 5000
+
+# Flag to run clustering requests (sent by the page scripts) as background
+# jobs, the page polls the job status and opens results when they are ready
+CLUSTERING_ASYNC = True
+# Number of local worker threads per process that run background jobs
+JOBS_NUM_WORKERS = 1
+# Database file of background jobs (None - "jobs.sqlite3" in MEDIA_ROOT)
+JOBS_DB_FILE = None
+
+# Maximum number of processes per service process that run CPU-bound
+# operations (e.g., clustering; None/0 - operations are run in threads).
+# Processes are started with the "spawn" method by default (safe with
+# threads and OpenMP runtimes): every process starts a new interpreter and
+# imports the service modules, and under an embedded WSGI server (e.g.,
+# mod_wsgi) sys.executable is not a Python interpreter, thus
+# OPERATIONS_PYTHON_EXECUTABLE should be set (or the "fork"/"forkserver"
+# start method should be used, if it is safe for the deployment)
+OPERATIONS_MAX_PROCESSES = None
+# Start method of operation processes (None - "spawn")
+OPERATIONS_START_METHOD = None
+# Python interpreter of operation processes (None - sys.executable)
+OPERATIONS_PYTHON_EXECUTABLE = None
+# Time limit of an operation run in a separate process (seconds, None - off)
+OPERATIONS_TIMEOUT = 3600
@@ -31,3 +31,42 @@ function MatrixPlotly(options) {
     });
 
 }
+
+/**
+ * Form options of the correlation matrix from the strongest pairs
+ * of features (only features of these pairs are shown).
+ *
+ * @param options - container and pairs [feature, feature, coefficient]
+ * @returns options for MatrixPlotly
+ */
+function pairsToMatrix(options) {
+
+    var labels = [];
+    var positions = {};
+    options.pairs.forEach(function (pair) {
+        [pair[0], pair[1]].forEach(function (name) {
+            if (!(name in positions)) {
+                positions[name] = labels.length;
+                labels.push(name);
+            }
+        });
+    });
+
+    var data = labels.map(function (_, i) {
+        return labels.map(function (_, j) {
+            return (i === j) ? 1 : null;
+        });
+    });
+    options.pairs.forEach(function (pair) {
+        var i = positions[pair[0]], j = positions[pair[1]];
+        data[i][j] = pair[2];
+        data[j][i] = pair[2];
+    });
+
+    return {
+        container : options.container,
+        data      : data,
+        labels    : labels
+    };
+
+}
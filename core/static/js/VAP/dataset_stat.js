@@ -61,6 +61,22 @@ class DatasetStats {
                 'set the number of groups',
                 'number_of_groups': 'user_defined'
             },
+            {
+                'idx': 5,
+                'mode': 'param_num_quantile',
+                'title': 'Group by numerical continuous parameter (quantile intervals)',
+                'message': 'Select single numerical continuous parameter for grouping using "group" selector and ' +
+                'set the number of groups (groups have about the same number of objects)',
+                'number_of_groups': 'user_defined'
+            },
+            {
+                'idx': 6,
+                'mode': 'param_num_log',
+                'title': 'Group by numerical continuous parameter (logarithmic scale intervals)',
+                'message': 'Select single numerical continuous parameter for grouping using "group" selector and ' +
+                'set the number of groups (for heavy-tailed non-negative parameters)',
+                'number_of_groups': 'user_defined'
+            },
 
         ];
     }
@@ -410,6 +426,7 @@ class DatasetStats {
                 tr.appendChild(this.print_lod_selector(i, type));
                 tr.appendChild(this.print_selector(i, type));
                 this.type_switch(type, this.features[i], tr, columns);
+                this.mark_approximate(this.features[i], tr, columns);
                 tbody.appendChild(tr);
             }
         }
@@ -501,6 +518,20 @@ class DatasetStats {
         }
     }
 
+    mark_approximate(feature, tr, columns) {
+        // metrics estimated by approximate profiling (large datasets)
+        var approximate = feature['approximate'] || [];
+        for (var j=0;j<columns.length;j++) {
+            if (!approximate.includes(columns[j]))
+                continue;
+            // first cells are +/-, LoD and group selectors
+            var td = tr.cells[3 + j];
+            td.title = 'Approximate value';
+            if (!td.children.length && td.textContent)
+                td.textContent = '\u2248 ' + td.textContent;
+        }
+    }
+
     available_measures() {
         var measures = [];
         for (var i=0;i<this.features.length;i++)
@@ -852,4 +852,123 @@ function fix_array(data) {
         new_array[i] = [data[i][0].toString(), values];
     }
     return new_array;
-}
\ No newline at end of file
+}
+
+function decode_column(column) {
+    /*
+    Decoding of the column from the column-oriented payload
+    (numeric values are base64 of little-endian Float32/Float64 arrays)
+     */
+    if (column['dtype'] !== 'float32' && column['dtype'] !== 'float64')
+        return column['values'];
+
+    var binary = atob(column['values']);
+    var bytes = new Uint8Array(binary.length);
+    for (var i = 0; i < binary.length; i++)
+        bytes[i] = binary.charCodeAt(i);
+    if (column['dtype'] === 'float32')
+        return new Float32Array(bytes.buffer);
+    return new Float64Array(bytes.buffer);
+}
+
+function decode_dataset(index, dataset) {
+    /*
+    Decoding of the dataset into the array of [index, values] pairs
+    (the same structure as it is returned by "fix_array")
+     */
+    var columns = dataset['data'].map(decode_column);
+    var new_array = new Array(index.length);
+    for (var i = 0; i < index.length; i++) {
+        var values = new Array(columns.length);
+        for (var j = 0; j < columns.length; j++) {
+            values[j] = columns[j][i];
+        }
+        new_array[i] = [index[i].toString(), values];
+    }
+    return new_array;
+}
+
+function load_dataset_payload(url, callback) {
+    /*
+    Loading of the column-oriented payload with dataset arrays
+    (origin, normalized and auxiliary datasets with the shared index)
+     */
+    $.getJSON(url, function(payload) {
+        var index = decode_column(payload['index']);
+        callback({
+            'origin': decode_dataset(index, payload['origin']),
+            'normalized': decode_dataset(index, payload['normalized']),
+            'auxiliary': decode_dataset(index, payload['auxiliary'])
+        });
+    });
+}
+
+var JOB_POLL_INTERVAL = 1000;  // ms between requests of the job status
+
+function submit_clustering_job(form) {
+    /*
+    Submitting of the clustering form as a background job
+    (job status is polled, results are opened when they are ready)
+     */
+    var button = document.getElementById('clusterize_button');
+    var button_value = button.value;
+    button.disabled = true;
+
+    var cancel_button = document.createElement('input');
+    cancel_button.type = 'button';
+    cancel_button.className = 'button small secondary';
+    cancel_button.value = 'Cancel';
+    cancel_button.style.display = 'none';
+    button.parentNode.insertBefore(cancel_button, button.nextSibling);
+
+    function restore(message) {
+        button.disabled = false;
+        button.value = button_value;
+        cancel_button.remove();
+        if (message) {
+            alert(message);
+        }
+    }
+
+    function poll(status_url) {
+        $.getJSON(status_url, function(job) {
+            if (job['status'] === 'done') {
+                window.location.href = job['result_url'];
+            } else if (job['status'] === 'failed') {
+                restore('Clustering failed: ' + job['error']);
+            } else if (job['status'] === 'cancelled') {
+                restore();
+            } else {
+                button.value = (job['message'] || 'Queued') + ' (' +
+                    Math.round(100 * job['progress']) + '%)';
+                setTimeout(function() { poll(status_url); }, JOB_POLL_INTERVAL);
+            }
+        }).fail(function() {
+            restore('Failed to get the status of clustering');
+        });
+    }
+
+    $.ajax({
+        url: form.action || window.location.href,
+        type: 'POST',
+        data: $(form).serialize(),
+        dataType: 'json'
+    }).done(function(response, text_status, xhr) {
+        if (xhr.status === 202) {
+            cancel_button.onclick = function() {
+                cancel_button.disabled = true;
+                $.post(response['cancel_url'], {
+                    csrfmiddlewaretoken: form.elements['csrfmiddlewaretoken'].value
+                });
+            };
+            cancel_button.style.display = '';
+            poll(response['status_url']);
+        } else {
+            // clustering was performed within the request
+            window.location.href = response['result_url'];
+        }
+    }).fail(function() {
+        restore('Failed to perform clustering');
+    });
+    return false;
+}
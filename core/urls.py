@@ -26,6 +26,10 @@ urlpatterns = [
     re_path('^v/(?P<maindatasetuid>[0-9]+.?[0-9]*)/(?P<groups>(g/[0-9]+/)*)(o/(?P<operationnumber>[0-9]+)/)?$', core_views.visualization_data, name='regular_visualization_data'),
     re_path('^v/(?P<maindatasetuid>[0-9]+.?[0-9]*)/(?P<groups>(g/[0-9]+/)*)o/(?P<operationnumber>[0-9]+)/$', core_views.visualization_data, name='regular_visualization_data_operation'),
     re_path('^v/(?P<maindatasetuid>[0-9]+.?[0-9]*)/(?P<groups>(g/[0-9]+/)*)g/NEWGROUPID/$', core_views.visualization_data, name='regular_visualization_data_new_group'),
+    re_path('^v/(?P<maindatasetuid>[0-9]+.?[0-9]*)/(?P<groups>(g/[0-9]+/)*)data/$', core_views.visualization_payload, name='regular_visualization_payload'),
+    re_path('^v/(?P<maindatasetuid>[0-9]+.?[0-9]*)/(?P<groups>(g/[0-9]+/)*)o/(?P<operationnumber>[0-9]+)/results/$', core_views.operation_results, name='regular_visualization_operation_results'),
+    re_path('^jobs/(?P<job_id>[0-9a-f]+)/$', core_views.job_status, name='job_status'),
+    re_path('^jobs/(?P<job_id>[0-9a-f]+)/cancel/$', core_views.job_cancel, name='job_cancel'),
     path('site2site', core_views.site_to_site, name='site_to_site'),
     path('test', core_views.performance_test, name='performance_test'),
     path('testframe', core_views.performance_test_frame, name='performance_test_frame'),
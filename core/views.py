@@ -5,17 +5,26 @@ Core Django views for InVEx.
 import json
 import logging
 import re
+import uuid
 
 from datetime import datetime
 from urllib.parse import urlencode, urlparse, parse_qs
 
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, reverse, render_to_response, redirect
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from django.views.decorators.http import condition
 
-from core import form_reactions
+from core import form_reactions, jobs
+from core.calc.data_converters import JSListStream
 
 logger = logging.getLogger(__name__)
 
+re_accepts_gzip = re.compile(r'\bgzip\b')
+
 
 # TODO: Re-check the following method.
 def request_init(request):
@@ -63,6 +72,54 @@ def request_init(request):
     return output
 
 
+def render_streaming(request, template_name, context,
+                     content_type='text/html'):
+    """
+    Render the template into the streaming response (dataset arrays are
+    emitted by chunks, and the content is compressed on the fly if the
+    client accepts gzip).
+
+    :param request: HTTP [user] request.
+    :type request: django.http.HttpRequest
+    :param template_name: Template name.
+    :type template_name: str
+    :param context: Context data (dataset arrays as JSListStream objects).
+    :type context: dict
+    :param content_type: Content type of the response.
+    :type content_type: str
+    :return: HTTP response.
+    :rtype: django.http.StreamingHttpResponse
+    """
+    # arrays are replaced by placeholders to render the rest of the page
+    streams, context = {}, dict(context)
+    for key, value in context.items():
+        if isinstance(value, JSListStream) and value:
+            placeholder = '__stream_{}__'.format(uuid.uuid4().hex)
+            streams[placeholder] = value
+            context[key] = placeholder
+    content = render_to_string(template_name=template_name,
+                               context=context, request=request)
+
+    def stream_content():
+        if not streams:
+            yield content
+            return
+        for part in re.split('({})'.format('|'.join(streams)), content):
+            if part in streams:
+                yield from streams[part]
+            else:
+                yield part
+
+    response = StreamingHttpResponse(stream_content(),
+                                     content_type=content_type)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if re_accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+        response.streaming_content = compress_sequence(
+            response.streaming_content)
+        response['Content-Encoding'] = 'gzip'
+    return response
+
+
 def main(request):
     is_valid, response = request_init(request)
     if not is_valid:
@@ -137,6 +194,10 @@ def visualization_data(request, maindatasetuid, groups=None,
           'group_ids': parsed_groups}
     kw_extra = {'preview_url': reverse(
                     viewname='regular_visualization_data_new_group',
+                    kwargs={'maindatasetuid': maindatasetuid,
+                            'groups': groups}),
+                'payload_url': reverse(
+                    viewname='regular_visualization_payload',
                     kwargs={'maindatasetuid': maindatasetuid,
                             'groups': groups})}
 
@@ -156,6 +217,36 @@ def visualization_data(request, maindatasetuid, groups=None,
             except Exception as e:
                 logger.error('{} Failed to prepare and save processed data: {}'.
                              format(err_msg_subj, e))
+        elif (request.POST['formt'] == 'cluster' and request.is_ajax()):
+            # clustering is submitted by the page script
+            if not getattr(settings, 'CLUSTERING_ASYNC', False):
+                try:
+                    op_number = form_reactions.clusterize(
+                        request=request, **kw)
+                except Exception as e:
+                    logger.error('{} Failed to perform data clustering: {}'.
+                                 format(err_msg_subj, e))
+                    return JsonResponse({}, status=500)
+                return JsonResponse({'result_url': reverse(
+                    viewname='regular_visualization_data_operation',
+                    kwargs={'maindatasetuid': maindatasetuid,
+                            'groups': groups,
+                            'operationnumber': str(op_number)})})
+
+            try:
+                job_id = form_reactions.submit_clustering(
+                    request=request, **kw)
+            except Exception as e:
+                logger.error('{} Failed to submit data clustering: {}'.
+                             format(err_msg_subj, e))
+                return JsonResponse({}, status=500)
+            return JsonResponse(
+                {'job_id': job_id,
+                 'status_url': reverse(viewname='job_status',
+                                       kwargs={'job_id': job_id}),
+                 'cancel_url': reverse(viewname='job_cancel',
+                                       kwargs={'job_id': job_id})},
+                status=202)
         elif request.POST['formt'] == 'cluster':
             try:
                 return redirect(to=reverse(
@@ -190,12 +281,161 @@ def visualization_data(request, maindatasetuid, groups=None,
             context = form_reactions.get_operational_view_data(
                 op_number=op_number, **kw, **kw_extra)
 
+    if getattr(settings, 'VIEW_STREAMING_RESPONSE', False):
+        return render_streaming(request=request,
+                                template_name='main.html',
+                                context=context)
+
     return render(request=request,
                   template_name='main.html',
                   context=context,
                   content_type='text/html')
 
 
+def _get_history_fingerprint(maindatasetuid, groups=None,
+                             operationnumber=None):
+    try:
+        return form_reactions.get_history_fingerprint(
+            dataset_id=maindatasetuid,
+            group_ids=parse_groups_url_parameter(groups),
+            with_operations=operationnumber is not None)
+    except Exception as e:
+        logger.error('[views._get_history_fingerprint] '
+                     'Failed to get fingerprint of stored data: {}'.format(e))
+
+
+def history_etag(request, maindatasetuid, groups=None, operationnumber=None):
+    """
+    Get ETag of the data derived from the history data (stored data
+    fingerprint and the operation number).
+    """
+    fingerprint = _get_history_fingerprint(maindatasetuid, groups,
+                                           operationnumber)
+    if fingerprint is None:
+        return None
+    if operationnumber is not None:
+        fingerprint += (operationnumber,)
+    return '-'.join(str(x) for x in fingerprint)
+
+
+def history_last_modified(request, maindatasetuid, groups=None,
+                          operationnumber=None):
+    """
+    Get the last modification time of the history data.
+    """
+    fingerprint = _get_history_fingerprint(maindatasetuid, groups,
+                                           operationnumber)
+    if fingerprint is None:
+        return None
+    # fingerprint contains pairs of modification time (ns) and size
+    return datetime.utcfromtimestamp(max(fingerprint[::2]) / 1e9)
+
+
+@condition(etag_func=history_etag, last_modified_func=history_last_modified)
+def visualization_payload(request, maindatasetuid, groups=None):
+    """
+    Get column-oriented payload with dataset arrays (origin, normalized and
+    auxiliary datasets) of the stored dataset sample.
+    """
+    err_msg_subj = '[views.visualization_payload]'
+
+    try:
+        output = form_reactions.get_dataset_payload(
+            dataset_id=maindatasetuid,
+            group_ids=parse_groups_url_parameter(groups))
+    except Exception as e:
+        logger.error('{} Failed to prepare dataset payload: {}'.
+                     format(err_msg_subj, e))
+        return JsonResponse({}, status=404)
+
+    response = JsonResponse(output)
+    # cached data is used after the validation (by ETag/Last-Modified)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@condition(etag_func=history_etag, last_modified_func=history_last_modified)
+def operation_results(request, maindatasetuid, operationnumber, groups=None):
+    """
+    Get results of the applied operation (e.g., cluster labels) without
+    dataset arrays.
+    """
+    err_msg_subj = '[views.operation_results]'
+
+    try:
+        output = form_reactions.get_operation_results(
+            dataset_id=maindatasetuid,
+            group_ids=parse_groups_url_parameter(groups),
+            op_number=int(operationnumber))
+    except Exception as e:
+        logger.error('{} Failed to get operation results: {}'.
+                     format(err_msg_subj, e))
+        return JsonResponse({}, status=404)
+
+    response = JsonResponse(output)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def job_status(request, job_id):
+    """
+    Get status of the background job (e.g., clustering) with the url
+    of its results when the job is done.
+    """
+    err_msg_subj = '[views.job_status]'
+
+    try:
+        status = form_reactions.get_job_status(job_id)
+    except Exception as e:
+        logger.error('{} Failed to get job status: {}'.format(err_msg_subj, e))
+        return JsonResponse({}, status=500)
+
+    return _job_status_response(status)
+
+
+def job_cancel(request, job_id):
+    """
+    Cancel the background job.
+    """
+    err_msg_subj = '[views.job_cancel]'
+
+    if request.method != 'POST':
+        return JsonResponse({}, status=405)
+
+    try:
+        status = form_reactions.cancel_job(job_id)
+    except Exception as e:
+        logger.error('{} Failed to cancel job: {}'.format(err_msg_subj, e))
+        return JsonResponse({}, status=500)
+
+    return _job_status_response(status)
+
+
+def _job_status_response(status):
+    """
+    Form the response with the job status (and the url of its results).
+    """
+    if status is None:
+        return JsonResponse({}, status=404)
+
+    output = {k: status[k] for k in ('id', 'status', 'progress', 'message',
+                                     'error')}
+    if (status['kind'] == jobs.JOB_KIND_CLUSTERING and
+            status['result']):
+        output['result_url'] = reverse(
+            viewname='regular_visualization_data_operation',
+            kwargs={'maindatasetuid': status['parameters']['dataset_id'],
+                    'groups': ''.join(
+                        'g/{}/'.format(i)
+                        for i in status['parameters']['group_ids'] or []),
+                    'operationnumber': str(
+                        status['result']['operation_number'])})
+
+    response = JsonResponse(output)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
 def site_to_site(request):
     is_valid, response = request_init(request)
     if not is_valid: